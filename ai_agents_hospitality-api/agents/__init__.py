@@ -4,7 +4,7 @@ Agents module for AI Hospitality API.
 This module contains implementations of various AI agents for the hospitality domain.
 """
 
-from .hotel_simple_agent import answer_hotel_question, load_hotel_data
+from .hotel_simple_agent import answer_hotel_question, get_hotel_context, load_hotel_data
 
-__all__ = ["answer_hotel_question", "load_hotel_data"]
+__all__ = ["answer_hotel_question", "get_hotel_context", "load_hotel_data"]
 
@@ -0,0 +1,202 @@
+"""
+Answer Cache Module
+
+This module implements the response cache that sits in front of the LLM
+chain. Answers are keyed on a normalized form of the question, the
+fingerprint of the loaded hotel data and the agent configuration, kept in a
+bounded LRU with TTL expiry and optionally persisted to disk.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from agents.hotel_retrieval import normalize_text
+from util.logger_config import logger
+
+# Courtesy words that don't change the meaning of a question
+FILLER_WORDS = frozenset({"please", "kindly", "tell", "me", "could", "can", "you", "the", "a", "an"})
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share a cache entry.
+
+    Lowercases, strips accents and punctuation, collapses whitespace and
+    drops courtesy words ("please tell me the ...").
+
+    Args:
+        question: User's question
+
+    Returns:
+        str: Normalized question
+    """
+    words = normalize_text(question).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def make_cache_key(question: str, data_fingerprint: str, config_signature: str) -> str:
+    """
+    Build the cache key of a question.
+
+    Args:
+        question: User's question
+        data_fingerprint: Fingerprint of the loaded hotel data
+        config_signature: Signature of the agent configuration (model, temperature...)
+
+    Returns:
+        str: Hex digest identifying the answer
+    """
+    material = "\x1f".join((normalize_question(question), data_fingerprint, config_signature))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU cache of agent answers with TTL expiry.
+
+    Entries store their creation time as wall-clock time so the TTL keeps
+    working for entries reloaded from disk after a restart.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 ttl_seconds: float = 3600,
+                 persist_path: Optional[Path] = None):
+        """
+        Create the cache, loading persisted entries if a path is given.
+
+        Args:
+            max_entries: Maximum number of answers kept (least recently used are evicted)
+            ttl_seconds: Time to live of an answer; 0 disables expiry
+            persist_path: Optional JSON file used to persist the cache
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.persist_path is not None:
+            self.load()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached answer, counting the hit or miss.
+
+        Args:
+            key: Cache key from `make_cache_key`
+
+        Returns:
+            Optional[str]: Cached answer, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            # Expired entries are kept (until evicted) for `get_stale`
+            if entry is None or self._is_expired(entry[0], time.time()):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, key: str) -> Optional[str]:
+        """
+        Get a cached answer even if expired, without counting a hit or miss.
+
+        Used as a fallback while the LLM provider is unavailable.
+
+        Args:
+            key: Cache key from `make_cache_key`
+
+        Returns:
+            Optional[str]: Cached answer, or None if missing
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[1]
+
+    def put(self, key: str, answer: str) -> None:
+        """
+        Store an answer, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key from `make_cache_key`
+            answer: Answer to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.time(), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached answers (e.g. after a hotel data reload)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, size and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def load(self) -> None:
+        """Load persisted entries, skipping the ones already expired."""
+        if self.persist_path is None or not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load answer cache from {self.persist_path}: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, created_at, answer in stored.get("entries", []):
+                if not self._is_expired(created_at, now):
+                    self._entries[key] = (created_at, answer)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"Loaded {len(self._entries)} cached answers from {self.persist_path}")
+
+    def save(self) -> None:
+        """Persist the cache to disk atomically (write to a temp file, then rename)."""
+        if self.persist_path is None:
+            return
+        with self._lock:
+            entries = [[key, created_at, answer]
+                       for key, (created_at, answer) in self._entries.items()]
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+            logger.info(f"Saved {len(entries)} cached answers to {self.persist_path}")
+        except OSError as e:
+            logger.warning(f"Could not save answer cache to {self.persist_path}: {e}")
@@ -0,0 +1,375 @@
+"""
+Booking Cube Module
+
+This module implements the lookup service over the occupancy/revenue cube
+written by the synthetic booking generator (booking_cube.json). The cube
+holds nights sold, bookings and revenue per hotel, room type, room
+category, meal plan and month, plus the available room-nights per hotel,
+room type, category and month.
+
+Every roll-up (any combination of dimensions left open) is precomputed when
+the cube is loaded, so a lookup is a single dictionary access. Occupancy and
+revenue questions matching the cube are answered without the LLM.
+
+Rooms are not reserved per meal plan, so the occupancy of a meal plan is
+measured against the capacity of the hotels offering it (those with sales
+of the plan in the cube).
+"""
+
+import calendar
+import json
+import re
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from agents.hotel_context import SourceStamp, get_source_stamps
+from agents.hotel_retrieval import HotelIndex, normalize_text
+from agents.pricing_engine import MEAL_PLAN_TERMS
+
+# Lookup dimensions, in the order of the cube cells
+DIMENSIONS = ("hotel", "room_type", "room_category", "meal_plan", "month")
+# Dimensions of the capacity (available room-nights do not depend on the meal plan)
+CAPACITY_DIMENSIONS = ("hotel", "room_type", "room_category", "month")
+
+DIMENSION_LABELS = {
+    "hotel": "Hotel",
+    "room_type": "Room Type",
+    "room_category": "Room Category",
+    "meal_plan": "Meal Plan",
+    "month": "Month",
+}
+
+OCCUPANCY_TERMS = ("occupancy", "nights sold", "room nights")
+# "sales", "income" or "earnings" also appear in other questions ("sales on rooms")
+REVENUE_TERMS = ("revenue", "revenues")
+# Questions about data the cube does not hold go to the LLM
+UNSUPPORTED_TERMS = ("guest", "guests", "cancel", "cancellation", "promotion", "average",
+                     "compare", "country of", "city of", "year over year")
+# Rankings are only answered when a grouping lists every candidate
+RANKING_TERMS = ("which", "highest", "lowest", "top", "best", "worst", "most", "least", "rank", "ranking")
+
+# Periods the cube cannot resolve (it has no notion of "now")
+_RELATIVE_PERIOD = re.compile(
+    r" (?:(?:last|this|next|past|previous|current|coming) (?:week|weekend|month|quarter|year)s?"
+    r"|yesterday|today|tonight|tomorrow) "
+)
+_YEAR = re.compile(r"\b(?:19|20)\d\d\b")
+
+_GROUP_BY = re.compile(
+    r" (?:per|by|each|every|for each|for every|for all|all|across) "
+    r"(hotel|month|meal plan|room type|room category|category|type)s?(?= )"
+)
+_GROUP_BY_DIMENSIONS = {
+    "hotel": "hotel",
+    "month": "month",
+    "meal plan": "meal_plan",
+    "room type": "room_type",
+    "type": "room_type",
+    "room category": "room_category",
+    "category": "room_category",
+}
+_MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+
+Key = Tuple[Optional[str], ...]
+# Meal plans offered by a hotel
+OfferedPlans = FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class CubeValue:
+    """Measures of a cube lookup."""
+
+    nights_sold: int = 0
+    bookings: int = 0
+    revenue: float = 0.0
+    available_room_nights: int = 0
+
+    @property
+    def occupancy_rate(self) -> Optional[float]:
+        """Nights sold over available room-nights (None without capacity)."""
+        if not self.available_room_nights:
+            return None
+        return self.nights_sold / self.available_room_nights
+
+
+def _rollup_keys(key: tuple) -> Iterable[Key]:
+    """All the keys of the roll-ups a cell contributes to (None = any value)."""
+    for mask in product((False, True), repeat=len(key)):
+        yield tuple(None if open_dimension else value for value, open_dimension in zip(key, mask))
+
+
+class BookingCube:
+    """
+    In-memory occupancy/revenue cube with precomputed roll-ups.
+
+    The cube has at most a few thousand cells, so all 2^5 roll-ups of the
+    measures and 2^4 roll-ups of the capacity fit comfortably in memory. The
+    capacity roll-ups are also kept per set of offered meal plans, so the
+    capacity of a meal plan slice is a sum over a handful of those sets.
+    """
+
+    def __init__(self, cube_data: dict, source_stamps: Tuple[SourceStamp, ...] = ()):
+        """
+        Build the roll-ups of a loaded cube.
+
+        Args:
+            cube_data: Parsed content of booking_cube.json
+            source_stamps: Stamps of the file the cube was loaded from
+        """
+        self.source_stamps = source_stamps
+        self._measures: Dict[Key, List[float]] = {}
+        self._capacity: Dict[Key, int] = {}
+        self._plan_capacity: Dict[Tuple[Key, OfferedPlans], int] = {}
+        values = {dimension: set() for dimension in DIMENSIONS}
+        hotel_plans: Dict[str, set] = {}
+
+        for *key, nights, bookings, revenue in cube_data.get("Cells", []):
+            for dimension, value in zip(DIMENSIONS, key):
+                values[dimension].add(value)
+            hotel_plans.setdefault(key[0], set()).add(key[3])
+            for rollup in _rollup_keys(tuple(key)):
+                measures = self._measures.setdefault(rollup, [0, 0, 0.0])
+                measures[0] += nights
+                measures[1] += bookings
+                measures[2] += revenue
+
+        for *key, available in cube_data.get("Capacity", []):
+            for dimension, value in zip(CAPACITY_DIMENSIONS, key):
+                values[dimension].add(value)
+            offered = frozenset(hotel_plans.get(key[0], ()))
+            for rollup in _rollup_keys(tuple(key)):
+                self._capacity[rollup] = self._capacity.get(rollup, 0) + available
+                plan_key = (rollup, offered)
+                self._plan_capacity[plan_key] = self._plan_capacity.get(plan_key, 0) + available
+
+        self._offered_plans = {offered for _, offered in self._plan_capacity}
+        self.values = {dimension: sorted(dimension_values)
+                       for dimension, dimension_values in values.items()}
+
+    def is_stale(self) -> bool:
+        """Check whether the cube file changed since the cube was loaded."""
+        return bool(self.source_stamps) and \
+            get_source_stamps(path for path, _, _ in self.source_stamps) != self.source_stamps
+
+    def _available(self, keys: Iterable[Key], meal_plans: Optional[Sequence[str]]) -> int:
+        """
+        Sum the available room-nights of capacity keys.
+
+        Args:
+            keys: Capacity keys (hotel, room type, category, month)
+            meal_plans: Meal plans of the slice; None counts every hotel
+
+        Returns:
+            int: Available room-nights, only of the hotels offering one of
+                the meal plans when they are given
+        """
+        if not meal_plans:
+            return sum(self._capacity.get(key, 0) for key in keys)
+        offered_sets = [offered for offered in self._offered_plans if offered.intersection(meal_plans)]
+        return sum(self._plan_capacity.get((key, offered), 0) for key in keys for offered in offered_sets)
+
+    def lookup(self,
+               hotel: Optional[str] = None,
+               room_type: Optional[str] = None,
+               room_category: Optional[str] = None,
+               meal_plan: Optional[str] = None,
+               month: Optional[str] = None) -> CubeValue:
+        """
+        Get the measures of one slice of the cube (None leaves a dimension open).
+
+        Args:
+            hotel: Hotel name
+            room_type: Room type (Single, Double, Triple)
+            room_category: Room category (Standard, Premium)
+            meal_plan: Meal plan name
+            month: Month as YYYY-MM
+
+        Returns:
+            CubeValue: Nights sold, bookings, revenue and available room-nights
+        """
+        nights, bookings, revenue = self._measures.get(
+            (hotel, room_type, room_category, meal_plan, month), (0, 0, 0.0)
+        )
+        available = self._available([(hotel, room_type, room_category, month)],
+                                    [meal_plan] if meal_plan else None)
+        return CubeValue(int(nights), int(bookings), round(revenue, 2), available)
+
+    def total(self, filters: Dict[str, Optional[Sequence[str]]]) -> CubeValue:
+        """
+        Sum the measures over several values per dimension.
+
+        Args:
+            filters: Values per dimension name; missing or None leaves it open
+
+        Returns:
+            CubeValue: Summed measures (capacity is counted once, over the
+                hotels offering one of the meal plans when they are filtered)
+        """
+        choices = [filters.get(dimension) or (None,) for dimension in DIMENSIONS]
+        nights = bookings = 0
+        revenue = 0.0
+        for key in product(*choices):
+            measures = self._measures.get(key)
+            if measures:
+                nights += measures[0]
+                bookings += measures[1]
+                revenue += measures[2]
+        capacity_choices = [filters.get(dimension) or (None,) for dimension in CAPACITY_DIMENSIONS]
+        available = self._available(product(*capacity_choices), filters.get("meal_plan"))
+        return CubeValue(int(nights), int(bookings), round(revenue, 2), available)
+
+    def breakdown(self,
+                  by: Sequence[str],
+                  filters: Optional[Dict[str, Optional[Sequence[str]]]] = None
+                  ) -> List[Tuple[Tuple[str, ...], CubeValue]]:
+        """
+        Break the measures down by one or more dimensions.
+
+        Args:
+            by: Dimensions to group by
+            filters: Values per dimension restricting the result
+
+        Returns:
+            list: (group values, measures) for every non-empty group
+        """
+        filters = filters or {}
+        groups = [filters.get(dimension) or self.values[dimension] for dimension in by]
+        rows = []
+        for group in product(*groups):
+            value = self.total({**filters, **{dimension: (item,) for dimension, item in zip(by, group)}})
+            if value.bookings or value.nights_sold or value.available_room_nights:
+                rows.append((group, value))
+        return rows
+
+
+def load_booking_cube(cube_file: Path) -> BookingCube:
+    """
+    Load booking_cube.json.
+
+    Args:
+        cube_file: Path to the cube file
+
+    Returns:
+        BookingCube: Cube with precomputed roll-ups
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    # Stamp the file before reading it so a concurrent write is detected later
+    source_stamps = get_source_stamps([cube_file])
+    with open(cube_file, "r", encoding="utf-8") as f:
+        return BookingCube(json.load(f), source_stamps)
+
+
+def _format_month(month: str) -> str:
+    year, number = month.split("-")
+    return f"{calendar.month_name[int(number)]} {year}"
+
+
+def _format_group_value(dimension: str, value: str) -> str:
+    return _format_month(value) if dimension == "month" else value
+
+
+def _format_measures(value: CubeValue, occupancy: bool, revenue: bool) -> List[str]:
+    cells = []
+    if occupancy:
+        rate = value.occupancy_rate
+        cells += [f"{rate:.1%}" if rate is not None else "n/a",
+                  f"{value.nights_sold:,}", f"{value.available_room_nights:,}"]
+    if revenue:
+        cells += [f"{value.revenue:,.2f} €", f"{value.bookings:,}"]
+    return cells
+
+
+def answer_analytics_question(question: str, index: HotelIndex, cube: BookingCube) -> Optional[str]:
+    """
+    Answer occupancy and revenue questions from the cube.
+
+    Only questions asking for a measure together with a period (month or
+    year) or a grouping, and whose filters (hotels, cities, countries, room
+    types, categories, meal plans) are all covered by the cube, are
+    answered; anything else (a bare keyword, relative periods such as "last
+    week", rankings without a grouping, years outside the cube) returns None
+    and goes to the LLM.
+
+    Args:
+        question: User's question
+        index: Hotel index used to resolve hotels, locations and room filters
+        cube: Occupancy/revenue cube
+
+    Returns:
+        Optional[str]: Markdown answer, or None if the cube cannot answer
+    """
+    normalized = normalize_text(question)
+    occupancy = any(f" {term} " in normalized for term in OCCUPANCY_TERMS)
+    revenue = any(f" {term} " in normalized for term in REVENUE_TERMS)
+    if not (occupancy or revenue) or any(f" {term} " in normalized for term in UNSUPPORTED_TERMS):
+        return None
+    if _RELATIVE_PERIOD.search(normalized):
+        return None
+
+    match = index.match(question)
+    if match.ambiguous:
+        return None
+    filters: Dict[str, Optional[Sequence[str]]] = {
+        "hotel": match.hotels or None,
+        "room_type": sorted(match.room_types) or None,
+        "room_category": sorted(match.room_categories) or None,
+        "meal_plan": [name for name, terms in MEAL_PLAN_TERMS
+                      if any(f" {term} " in normalized for term in terms)] or None,
+    }
+    month_numbers = {number for name, number in _MONTH_NUMBERS.items() if f" {name} " in normalized}
+    years = set(_YEAR.findall(normalized))
+    if month_numbers or years:
+        filters["month"] = [month for month in cube.values["month"]
+                            if (not years or month.split("-")[0] in years)
+                            and (not month_numbers or int(month.split("-")[1]) in month_numbers)]
+        # A month or year the cube does not hold must not fall back to other periods
+        covered_years = {month.split("-")[0] for month in filters["month"]}
+        if not filters["month"] or not years <= covered_years:
+            return None
+
+    by = []
+    if " monthly " in normalized:
+        by.append("month")
+    for term in _GROUP_BY.findall(normalized):
+        dimension = _GROUP_BY_DIMENSIONS[term]
+        if dimension not in by:
+            by.append(dimension)
+    by.sort(key=DIMENSIONS.index)
+    if not by and not filters.get("month"):
+        return None
+    if not by and any(f" {term} " in normalized for term in RANKING_TERMS):
+        return None
+
+    headers = [DIMENSION_LABELS[dimension] for dimension in by]
+    if occupancy:
+        headers += ["Occupancy", "Nights Sold", "Available Room-Nights"]
+    if revenue:
+        headers += ["Revenue", "Bookings"]
+
+    if by:
+        rows = [
+            [_format_group_value(dimension, value) for dimension, value in zip(by, group)]
+            + _format_measures(value, occupancy, revenue)
+            for group, value in cube.breakdown(by, filters)
+        ]
+    else:
+        rows = [_format_measures(cube.total(filters), occupancy, revenue)]
+    if not rows:
+        return None
+
+    scope = [", ".join(values) for dimension, values in filters.items()
+             if values and dimension != "month"]
+    if filters.get("month"):
+        scope.append(", ".join(_format_month(month) for month in filters["month"]))
+    title = " and ".join(name for name, asked in (("Occupancy", occupancy), ("Revenue", revenue)) if asked)
+    lines = [f"**{title}**" + (f" ({'; '.join(scope)})" if scope else "") + "\n",
+             "| " + " | ".join(headers) + " |",
+             "|" + "|".join("---" for _ in headers) + "|"]
+    lines += ["| " + " | ".join(row) + " |" for row in rows]
+    lines.append("\n_Occupancy counts every night in the month it is spent; revenue and "
+                 "bookings are attributed to the check-in month._")
+    return "\n".join(lines)
@@ -0,0 +1,431 @@
+"""
+Bookings Analytics Module
+
+This module implements an embedded analytics engine over the generated
+booking file (all_bookings.parquet). The bookings are loaded into an
+in-process SQL database exposing the same `bookings` table as
+bookings-db/src/db/init.sql, so analytics queries are answered in
+milliseconds without the PostgreSQL container.
+
+DuckDB is used when installed (columnar, PostgreSQL-like dialect); otherwise
+the standard library sqlite3 module is used, with the file read by pyarrow.
+When a new booking file is generated, a new store is built and swapped in
+while queries keep running against the previous one.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+from agents.hotel_context import SourceStamp, get_source_stamps
+from config.agent_config import ConfigChange, subscribe_config_changes, _load_config_file
+from util.configuration import PROJECT_ROOT
+from util.logger_config import logger
+
+try:
+    import duckdb
+except ImportError:
+    # duckdb is optional; fall back to sqlite3
+    duckdb = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Path to the booking files (same lookup order as the hotel data)
+BOOKINGS_DATA_PATH_LOCAL = PROJECT_ROOT / "data" / "bookings"
+BOOKINGS_DATA_PATH_EXTERNAL = PROJECT_ROOT.parent / "bookings-db" / "output_files" / "bookings"
+BOOKINGS_FILE_NAME = "all_bookings.parquet"
+
+# Booking file column -> bookings table column (as in bookings-db/src/db/load_data.py)
+BOOKING_COLUMNS = {
+    "Hotel Name": "hotel_name",
+    "Room ID": "room_id",
+    "Room Type": "room_type",
+    "Room Category": "room_category",
+    "Check-in Date": "check_in_date",
+    "Check-out Date": "check_out_date",
+    "Guest First Name": "guest_first_name",
+    "Guest Last Name": "guest_last_name",
+    "Guest Email": "guest_email",
+    "Guest Phone": "guest_phone",
+    "Guest Country": "guest_country",
+    "Guest City": "guest_city",
+    "Guest Address": "guest_address",
+    "Guest Zip Code": "guest_zip_code",
+    "Meal Plan": "meal_plan",
+    "Total Price": "total_price",
+}
+
+# bookings table of bookings-db/src/db/init.sql (id is filled by the loader)
+BOOKINGS_DDL = """
+CREATE TABLE bookings (
+    id INTEGER PRIMARY KEY,
+    hotel_name VARCHAR(255),
+    room_id VARCHAR(50),
+    room_type VARCHAR(100),
+    room_category VARCHAR(100),
+    check_in_date DATE,
+    check_out_date DATE,
+    total_nights INTEGER,
+    guest_first_name VARCHAR(100),
+    guest_last_name VARCHAR(100),
+    guest_email VARCHAR(255),
+    guest_phone VARCHAR(50),
+    guest_country VARCHAR(100),
+    guest_city VARCHAR(100),
+    guest_address TEXT,
+    guest_zip_code VARCHAR(20),
+    meal_plan VARCHAR(50),
+    total_price DECIMAL(10, 2)
+)
+"""
+
+BOOKINGS_INDEXES = (
+    "CREATE INDEX idx_bookings_hotel_check_in ON bookings (hotel_name, check_in_date)",
+    "CREATE INDEX idx_bookings_stay_dates ON bookings (check_in_date, check_out_date)",
+)
+
+TABLE_COLUMNS = (
+    "id", "hotel_name", "room_id", "room_type", "room_category", "check_in_date",
+    "check_out_date", "total_nights", "guest_first_name", "guest_last_name",
+    "guest_email", "guest_phone", "guest_country", "guest_city", "guest_address",
+    "guest_zip_code", "meal_plan", "total_price",
+)
+
+_READ_ONLY_STATEMENT = re.compile(r"^\s*(select|with|explain)\b", re.IGNORECASE)
+
+# Actions a query may perform on the sqlite store (no ATTACH, PRAGMA or writes)
+_SQLITE_ALLOWED_ACTIONS = frozenset({
+    sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE,
+})
+
+
+@dataclass(frozen=True)
+class AnalyticsResult:
+    """Result of an analytics query."""
+
+    columns: Tuple[str, ...]
+    rows: List[tuple]
+    elapsed_ms: float
+    version: int
+
+
+@dataclass(frozen=True)
+class _BookingsStore:
+    """One loaded version of the booking file."""
+
+    connection: Any
+    engine: str
+    source_stamps: Tuple[SourceStamp, ...]
+    row_count: int
+    version: int
+    # sqlite3 connections are shared between threads and must be serialized
+    lock: Optional[Any] = None
+
+
+def _check_read_only(sql: str) -> None:
+    """
+    Reject anything that is not a single read-only query.
+
+    This only gives a clear error early: the stores themselves are locked
+    down (no file access, no configuration changes) once they are loaded.
+
+    Raises:
+        ValueError: If the statement could modify the store
+    """
+    statement = sql.strip().rstrip(";")
+    if not _READ_ONLY_STATEMENT.match(statement) or ";" in statement:
+        raise ValueError("Only single SELECT / WITH / EXPLAIN statements are allowed")
+
+
+def _load_duckdb(source_file: Path):
+    """Load the booking file into an in-memory DuckDB database."""
+    connection = duckdb.connect(":memory:")
+    connection.execute(BOOKINGS_DDL)
+    file_columns = ", ".join(f'"{column}"' for column in BOOKING_COLUMNS)
+    connection.execute(f"""
+        INSERT INTO bookings ({", ".join(TABLE_COLUMNS)})
+        SELECT
+            row_number() OVER () AS id,
+            "Hotel Name", "Room ID", "Room Type", "Room Category",
+            "Check-in Date", "Check-out Date",
+            date_diff('day', "Check-in Date", "Check-out Date") AS total_nights,
+            "Guest First Name", "Guest Last Name", "Guest Email", "Guest Phone",
+            "Guest Country", "Guest City", "Guest Address", "Guest Zip Code",
+            "Meal Plan", "Total Price"
+        FROM (SELECT {file_columns} FROM read_parquet(?))
+    """, [str(source_file)])
+    for index_sql in BOOKINGS_INDEXES:
+        connection.execute(index_sql)
+    # Queries must not read or write local files (read_text, read_csv, COPY ... TO)
+    connection.execute("SET enable_external_access = false")
+    connection.execute("SET lock_configuration = true")
+    return connection
+
+
+def _load_sqlite(source_file: Path):
+    """Load the booking file into an in-memory SQLite database."""
+    if pq is None:
+        raise RuntimeError("pyarrow is required to read the booking file without duckdb")
+
+    table = pq.read_table(source_file, columns=list(BOOKING_COLUMNS), memory_map=True)
+    columns = {name: table.column(name).to_pylist() for name in BOOKING_COLUMNS}
+    check_in = columns["Check-in Date"]
+    check_out = columns["Check-out Date"]
+    rows = zip(
+        range(1, table.num_rows + 1),
+        columns["Hotel Name"], columns["Room ID"], columns["Room Type"], columns["Room Category"],
+        [day.isoformat() for day in check_in],
+        [day.isoformat() for day in check_out],
+        [(end - start).days for start, end in zip(check_in, check_out)],
+        columns["Guest First Name"], columns["Guest Last Name"], columns["Guest Email"],
+        columns["Guest Phone"], columns["Guest Country"], columns["Guest City"],
+        columns["Guest Address"], columns["Guest Zip Code"], columns["Meal Plan"],
+        [float(price) for price in columns["Total Price"]],
+    )
+
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute(BOOKINGS_DDL)
+    placeholders = ", ".join("?" for _ in TABLE_COLUMNS)
+    connection.executemany(
+        f"INSERT INTO bookings ({', '.join(TABLE_COLUMNS)}) VALUES ({placeholders})", rows
+    )
+    for index_sql in BOOKINGS_INDEXES:
+        connection.execute(index_sql)
+    connection.commit()
+    connection.execute("PRAGMA query_only = ON")
+    connection.set_authorizer(_sqlite_authorizer)
+    return connection
+
+
+def _sqlite_authorizer(action: int, *_) -> int:
+    """Only let queries read the store (denies ATTACH, PRAGMA and any write)."""
+    return sqlite3.SQLITE_OK if action in _SQLITE_ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class BookingsAnalytics:
+    """
+    Embedded SQL store over the generated booking file.
+
+    The store is rebuilt in a background thread when the file changes
+    (checked at most every `check_interval` seconds, from the file metadata
+    only). Queries keep using the current store during the rebuild; the new
+    store replaces it atomically and queries already running finish on the
+    version they started with.
+    """
+
+    def __init__(self, source_file: Path, engine: str = "auto", check_interval: float = 1.0):
+        """
+        Create the analytics store and load the booking file.
+
+        Args:
+            source_file: Path to all_bookings.parquet
+            engine: "duckdb", "sqlite" or "auto" (duckdb when installed)
+            check_interval: Minimum number of seconds between file change checks
+
+        Raises:
+            ValueError: If the engine is unknown or not installed
+        """
+        if engine == "auto":
+            engine = "duckdb" if duckdb is not None else "sqlite"
+        if engine not in ("duckdb", "sqlite"):
+            raise ValueError(f"Unknown analytics engine: {engine}")
+        if engine == "duckdb" and duckdb is None:
+            raise ValueError("The duckdb analytics engine is not installed")
+
+        self.source_file = Path(source_file)
+        self.engine = engine
+        self.check_interval = check_interval
+        self._store: Optional[_BookingsStore] = None
+        # Serializes the builds; queries never wait for it
+        self._build_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._last_check = 0.0
+        self.refresh(force=True)
+
+    @property
+    def version(self) -> int:
+        """Version of the loaded store (incremented on every reload)."""
+        return self._store.version if self._store else 0
+
+    @property
+    def row_count(self) -> int:
+        """Number of bookings in the loaded store."""
+        return self._store.row_count if self._store else 0
+
+    def _build_store(self, version: int) -> _BookingsStore:
+        # Stamp the file before reading it so a concurrent write is detected later
+        source_stamps = get_source_stamps([self.source_file])
+        start = time.perf_counter()
+        if self.engine == "duckdb":
+            connection = _load_duckdb(self.source_file)
+            lock = None
+        else:
+            connection = _load_sqlite(self.source_file)
+            lock = threading.Lock()
+        row_count = connection.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+        logger.info(
+            f"Loaded {row_count} bookings into the {self.engine} analytics store "
+            f"(version {version}) in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return _BookingsStore(connection, self.engine, source_stamps, row_count, version, lock)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the booking file if it changed since the store was built.
+
+        A failed reload keeps the current store.
+
+        Args:
+            force: Reload even if the file did not change
+
+        Returns:
+            bool: True if a new store was swapped in
+        """
+        with self._build_lock:
+            self._last_check = time.monotonic()
+            store = self._store
+            if not force and store is not None and \
+                    get_source_stamps([self.source_file]) == store.source_stamps:
+                return False
+            try:
+                new_store = self._build_store(self.version + 1)
+            except Exception as e:
+                if store is None:
+                    raise
+                logger.error(f"Error reloading {self.source_file}, keeping version {store.version}: {e}")
+                return False
+            with self._lock:
+                self._store = new_store
+            return True
+
+    def _refresh_in_background(self) -> None:
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self.refresh, name="bookings-analytics-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _current_store(self) -> _BookingsStore:
+        store = self._store
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if get_source_stamps([self.source_file]) != store.source_stamps:
+                self._refresh_in_background()
+        return store
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> AnalyticsResult:
+        """
+        Run a read-only SQL query against the `bookings` table.
+
+        Args:
+            sql: SELECT statement (same table and columns as init.sql)
+            params: Positional parameters ("?" placeholders)
+
+        Returns:
+            AnalyticsResult: Column names, rows, elapsed time and store version
+
+        Raises:
+            ValueError: If the statement is not a single read-only query
+        """
+        _check_read_only(sql)
+        store = self._current_store()
+        start = time.perf_counter()
+        with store.lock or nullcontext():
+            # DuckDB cursors are independent connections to the same database
+            cursor = store.connection.cursor()
+            try:
+                cursor.execute(sql, list(params))
+                rows = cursor.fetchall()
+                columns = tuple(description[0] for description in cursor.description or ())
+            finally:
+                cursor.close()
+        return AnalyticsResult(
+            columns=columns,
+            rows=rows,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            version=store.version
+        )
+
+
+def get_bookings_data_file(file_name: str, use_local: bool = True) -> Path:
+    """
+    Determine the path of a generated booking file.
+    Tries the local data directory first (for Docker), then bookings-db.
+
+    Args:
+        file_name: Name of the file (e.g. all_bookings.parquet)
+        use_local: Whether data/bookings is considered first
+
+    Returns:
+        Path: Path to the file (the local one if neither exists)
+    """
+    local_file = BOOKINGS_DATA_PATH_LOCAL / file_name
+    external_file = BOOKINGS_DATA_PATH_EXTERNAL / file_name
+    if use_local and local_file.exists():
+        return local_file
+    if external_file.exists():
+        return external_file
+    return local_file
+
+
+# Global analytics store (created on first use)
+_bookings_analytics: Optional[BookingsAnalytics] = None
+_bookings_analytics_lock = threading.Lock()
+
+
+def get_bookings_analytics() -> Optional[BookingsAnalytics]:
+    """
+    Get the shared analytics store, loading the booking file on first use.
+
+    Returns:
+        Optional[BookingsAnalytics]: The store, or None if analytics are
+            disabled or no booking file is available
+    """
+    global _bookings_analytics
+
+    if _bookings_analytics is not None:
+        return _bookings_analytics
+
+    config = _load_config_file().get("analytics", {})
+    if not config.get("enabled", True):
+        return None
+
+    with _bookings_analytics_lock:
+        if _bookings_analytics is None:
+            source_file = get_bookings_data_file(BOOKINGS_FILE_NAME, config.get("local", True))
+            if not source_file.exists():
+                logger.warning(f"No booking file found for analytics at {source_file}")
+                return None
+            try:
+                _bookings_analytics = BookingsAnalytics(
+                    source_file,
+                    engine=config.get("engine", "auto"),
+                    check_interval=float(config.get("check_interval_seconds", 1.0))
+                )
+            except Exception as e:
+                logger.error(f"Error loading the bookings analytics store: {e}")
+                return None
+    return _bookings_analytics
+
+
+def _on_analytics_config_change(change: ConfigChange) -> None:
+    """Recreate the store with the new analytics settings on next use."""
+    global _bookings_analytics
+    with _bookings_analytics_lock:
+        _bookings_analytics = None
+
+
+subscribe_config_changes(_on_analytics_config_change, sections=("analytics",))
@@ -0,0 +1,133 @@
+"""
+Hotel Context Builder
+
+This module builds the hotel context that is injected into the agent prompt.
+The context is serialized once per version of the source files and kept in
+memory as an immutable string together with its token count, so answering a
+question never re-serializes the hotel data.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # tiktoken is optional; fall back to a character based estimate
+    _ENCODING = None
+
+# Average number of characters per token used when tiktoken is not available
+CHARS_PER_TOKEN = 4
+
+# (path, mtime in ns, size in bytes) for each source file; None if missing
+SourceStamp = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class HotelContext:
+    """Immutable, pre-serialized hotel context for the agent prompt."""
+
+    text: str
+    token_count: int
+    fingerprint: str
+    source_stamps: Tuple[SourceStamp, ...]
+    # Size of the text in bytes (UTF-8)
+    size_bytes: int = 0
+
+    def is_stale(self) -> bool:
+        """
+        Check whether any of the source files changed since the context was built.
+
+        Only the file metadata is inspected, so the cost does not depend on the
+        size of the hotel data.
+
+        Returns:
+            bool: True if a source file was modified, replaced or removed
+        """
+        return get_source_stamps(path for path, _, _ in self.source_stamps) != self.source_stamps
+
+
+def get_source_stamps(paths: Iterable) -> Tuple[SourceStamp, ...]:
+    """
+    Get the modification stamps of the given source files.
+
+    Args:
+        paths: Paths to the source files
+
+    Returns:
+        tuple: One (path, mtime_ns, size) stamp per file
+    """
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append((str(path), None, None))
+    return tuple(stamps)
+
+
+def estimate_token_count(text: str) -> int:
+    """
+    Count (or estimate) the number of tokens in a text.
+
+    Uses tiktoken when installed, otherwise a characters-per-token heuristic.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Number of tokens
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def build_hotel_context_text(hotels_data: dict, hotel_details_text: str) -> str:
+    """
+    Serialize the hotel data into the text passed to the LLM.
+
+    Args:
+        hotels_data: Parsed content of hotels.json
+        hotel_details_text: Content of hotel_details.md
+
+    Returns:
+        str: Hotel context text
+    """
+    return f"""
+{hotel_details_text}
+
+Hotels JSON Summary:
+{json.dumps(hotels_data, indent=2, ensure_ascii=False)}
+"""
+
+
+def build_hotel_context(hotels_data: dict,
+                        hotel_details_text: str,
+                        source_stamps: Tuple[SourceStamp, ...]) -> HotelContext:
+    """
+    Build the immutable hotel context for a loaded version of the hotel data.
+
+    Args:
+        hotels_data: Parsed content of hotels.json
+        hotel_details_text: Content of hotel_details.md
+        source_stamps: Stamps of the files the data was loaded from, taken
+            before reading them so a write during the read is detected later
+
+    Returns:
+        HotelContext: Pre-serialized context with its token count
+    """
+    text = build_hotel_context_text(hotels_data, hotel_details_text)
+    encoded = text.encode("utf-8")
+    return HotelContext(
+        text=text,
+        token_count=estimate_token_count(text),
+        fingerprint=hashlib.sha256(encoded).hexdigest(),
+        source_stamps=source_stamps,
+        size_bytes=len(encoded)
+    )
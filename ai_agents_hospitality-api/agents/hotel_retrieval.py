@@ -0,0 +1,345 @@
+"""
+Hotel Retrieval Module
+
+This module implements the pre-LLM retrieval stage of the hotel agent.
+It indexes the hotel data by hotel name, city, country, room type and room
+category, resolves the entities mentioned in a question against that index
+and assembles a context holding only the matching hotel sections.
+"""
+
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Pruned contexts kept per index (one per combination of matched entities)
+MAX_CACHED_CONTEXTS = 256
+
+# Surface forms of the room types and categories used in hotels.json
+ROOM_TYPE_TERMS = {
+    "Single": ("single", "singles", "sigle"),
+    "Double": ("double", "doubles"),
+    "Triple": ("triple", "triples"),
+}
+ROOM_CATEGORY_TERMS = {
+    "Standard": ("standard",),
+    "Premium": ("premium",),
+}
+
+# Cities and countries that are also common words ("a nice pool", "reading
+# room"): they only count when written as a place, see `_mentions_place`
+AMBIGUOUS_LOCATIONS = frozenset({
+    "nice", "bath", "mobile", "split", "reading", "sale", "deal", "orange",
+    "hope", "union", "independence", "marathon", "paradise", "eye",
+})
+_PLACE_PREPOSITIONS = ("in", "at", "near", "around")
+
+_ROOM_HEADER = re.compile(r"^### ", re.MULTILINE)
+_ROOM_FIELD = re.compile(r"^- \*\*(Category|Type):\*\* (.+)$", re.MULTILINE)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a text for matching: lowercase, no accents, no punctuation.
+
+    The result is padded with spaces so whole words and phrases can be
+    matched with a simple `f" {term} " in text` test.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return f" {' '.join(words)} "
+
+
+def _mentions_place(question: str, location: str) -> bool:
+    """
+    Check whether a location is written as a proper noun in a question.
+
+    The location must keep its capitalisation and not start a sentence
+    ("Nice hotels?" is not a mention of Nice).
+
+    Args:
+        question: User's question (not normalized)
+        location: Location as written in the hotel data
+
+    Returns:
+        bool: True if the location appears capitalized after the sentence start
+    """
+    for found in re.finditer(rf"\b{re.escape(location)}\b", question):
+        before = question[:found.start()].rstrip()
+        if before and before[-1] not in ".!?¿¡:\"'(":
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class HotelMatch:
+    """Entities of the hotel data mentioned in a question."""
+
+    hotels: Tuple[str, ...] = ()
+    room_types: FrozenSet[str] = frozenset()
+    room_categories: FrozenSet[str] = frozenset()
+    # The hotels only come from an ambiguous location written with a capital
+    # letter ("Nice"), which may still be the common word
+    ambiguous: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.hotels or self.room_types or self.room_categories)
+
+
+@dataclass(frozen=True)
+class PrunedContext:
+    """Hotel context assembled for the entities of a question."""
+
+    text: str
+    # Size of the text in bytes (UTF-8), measured once when it is assembled
+    size_bytes: int
+
+
+@dataclass
+class _HotelSection:
+    """Pre-split markdown and JSON data of a single hotel."""
+
+    name: str
+    details_header: str
+    details_rooms: List[Tuple[str, str, str]] = field(default_factory=list)
+    hotel_json: Optional[dict] = None
+
+
+class HotelIndex:
+    """
+    In-memory index of the hotel data used to prune the agent context.
+
+    The index is built once per version of the hotel data. Resolving a
+    question only scans the (small) vocabulary of names and locations, and
+    the context for a given combination of hotels and room filters is
+    serialized once and reused afterwards.
+    """
+
+    def __init__(self, hotels_data: dict, hotel_details_text: str):
+        """
+        Build the index from the loaded hotel data.
+
+        Args:
+            hotels_data: Parsed content of hotels.json
+            hotel_details_text: Content of hotel_details.md
+        """
+        self._sections: Dict[str, _HotelSection] = {}
+        self._order: List[str] = []
+        self._terms: Dict[str, set] = defaultdict(set)
+        # Normalized term -> (location as written in the data, hotels)
+        self._ambiguous_terms: Dict[str, Tuple[str, set]] = {}
+        self._section_cache: Dict[tuple, Tuple[str, str]] = {}
+        self._context_cache: Dict[tuple, PrunedContext] = {}
+
+        for section in self._split_details(hotel_details_text):
+            self._add_section(section)
+
+        for hotel in hotels_data.get("Hotels", []):
+            name = hotel.get("Name")
+            if not name:
+                continue
+            if name not in self._sections:
+                self._add_section(_HotelSection(name=name, details_header=""))
+            self._sections[name].hotel_json = hotel
+            address = hotel.get("Address", {})
+            for location in (address.get("City"), address.get("Country")):
+                if not location:
+                    continue
+                term = normalize_text(location)
+                if term.strip() in AMBIGUOUS_LOCATIONS:
+                    self._ambiguous_terms.setdefault(term, (location.strip(), set()))[1].add(name)
+                else:
+                    self._terms[term].add(name)
+
+        self._index_hotel_names()
+
+    @property
+    def hotel_names(self) -> List[str]:
+        """Names of the indexed hotels, in source order."""
+        return list(self._order)
+
+    def _add_section(self, section: _HotelSection) -> None:
+        if section.name not in self._sections:
+            self._order.append(section.name)
+        self._sections[section.name] = section
+
+    def _index_hotel_names(self) -> None:
+        """
+        Index the full hotel names, with and without their apostrophes.
+
+        Single name words are not indexed: most of them ("grand", "tower",
+        "plaza", "golden") are common words, and pruning the context on them
+        would leave the LLM with incomplete data. A question naming a hotel
+        only partially gets the full context.
+        """
+        for name in self._order:
+            self._terms[normalize_text(name)].add(name)
+            self._terms[normalize_text(name.replace("'", ""))].add(name)
+
+    @staticmethod
+    def _split_details(hotel_details_text: str) -> List[_HotelSection]:
+        """
+        Split hotel_details.md into one section per hotel and one block per room.
+
+        Args:
+            hotel_details_text: Content of hotel_details.md
+
+        Returns:
+            list: Parsed hotel sections
+        """
+        sections = []
+        for chunk in re.split(r"^# ", hotel_details_text, flags=re.MULTILINE)[1:]:
+            name, _, body = chunk.partition("\n")
+            parts = _ROOM_HEADER.split(f"# {name}\n{body}")
+            section = _HotelSection(name=name.strip(), details_header=parts[0])
+            for room_text in parts[1:]:
+                room_fields = dict(_ROOM_FIELD.findall(room_text))
+                section.details_rooms.append((
+                    room_fields.get("Type", ""),
+                    room_fields.get("Category", ""),
+                    f"### {room_text}"
+                ))
+            sections.append(section)
+        return sections
+
+    def match(self, question: str) -> HotelMatch:
+        """
+        Resolve the hotels, room types and categories mentioned in a question.
+
+        Args:
+            question: User's question
+
+        Returns:
+            HotelMatch: Matched entities (empty if nothing matched)
+        """
+        normalized = normalize_text(question)
+
+        hotels = set()
+        for term, term_hotels in self._terms.items():
+            if term in normalized:
+                hotels.update(term_hotels)
+
+        capitalized_hotels = set()
+        for term, (location, term_hotels) in self._ambiguous_terms.items():
+            if term not in normalized:
+                continue
+            if any(f" {preposition}{term}" in normalized for preposition in _PLACE_PREPOSITIONS):
+                hotels.update(term_hotels)
+            elif _mentions_place(question, location):
+                capitalized_hotels.update(term_hotels)
+        ambiguous = bool(capitalized_hotels) and not hotels
+        hotels.update(capitalized_hotels)
+
+        room_types = frozenset(
+            room_type for room_type, terms in ROOM_TYPE_TERMS.items()
+            if any(f" {term} " in normalized for term in terms)
+        )
+        room_categories = frozenset(
+            category for category, terms in ROOM_CATEGORY_TERMS.items()
+            if any(f" {term} " in normalized for term in terms)
+        )
+
+        return HotelMatch(
+            hotels=tuple(name for name in self._order if name in hotels),
+            room_types=room_types,
+            room_categories=room_categories,
+            ambiguous=ambiguous
+        )
+
+    def _room_matches(self, room_type: str, category: str, match: HotelMatch) -> bool:
+        return ((not match.room_types or room_type in match.room_types)
+                and (not match.room_categories or category in match.room_categories))
+
+    def _serialize_section(self, name: str, match: HotelMatch) -> Tuple[str, str]:
+        """
+        Serialize the markdown and JSON parts of a hotel, keeping only matching rooms.
+
+        Args:
+            name: Hotel name
+            match: Matched entities used to filter the rooms
+
+        Returns:
+            tuple: (markdown section, JSON hotel entry)
+        """
+        key = (name, match.room_types, match.room_categories)
+        if key in self._section_cache:
+            return self._section_cache[key]
+
+        section = self._sections[name]
+        details = section.details_header + "".join(
+            text for room_type, category, text in section.details_rooms
+            if self._room_matches(room_type, category, match)
+        )
+        hotel_json = ""
+        if section.hotel_json is not None:
+            hotel = dict(section.hotel_json)
+            hotel["Rooms"] = [
+                room for room in hotel.get("Rooms", [])
+                if self._room_matches(room.get("Type"), room.get("Category"), match)
+            ]
+            hotel_json = json.dumps(hotel, indent=2, ensure_ascii=False)
+
+        self._section_cache[key] = (details.rstrip("-\n") + "\n", hotel_json)
+        return self._section_cache[key]
+
+    def build_context(self, match: HotelMatch) -> str:
+        """
+        Assemble the agent context for the matched entities.
+
+        When no hotel is matched but room types or categories are, all hotels
+        are included with their rooms filtered.
+
+        Args:
+            match: Matched entities
+
+        Returns:
+            str: Hotel context with the same layout as the full context
+        """
+        names = match.hotels or tuple(self._order)
+        sections = [self._serialize_section(name, match) for name in names]
+        details = "\n---\n\n".join(section[0] for section in sections)
+        hotels_json = ",\n".join(section[1] for section in sections if section[1])
+        return f"""
+{details}
+
+Hotels JSON Summary:
+{{"Hotels": [
+{hotels_json}
+]}}
+"""
+
+    def context_for_question(self, question: str) -> Optional[PrunedContext]:
+        """
+        Get a pruned context holding only the hotel data a question is about.
+
+        The context of each combination of matched entities is assembled once.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Optional[PrunedContext]: Pruned context and its size, or None if
+                nothing in the question matched (or only an ambiguous location
+                did) and the full context should be used
+        """
+        match = self.match(question)
+        if not match or match.ambiguous:
+            return None
+        key = (match.hotels, match.room_types, match.room_categories)
+        context = self._context_cache.get(key)
+        if context is None:
+            text = self.build_context(match)
+            context = PrunedContext(text, len(text.encode("utf-8")))
+            if len(self._context_cache) >= MAX_CACHED_CONTEXTS:
+                self._context_cache.clear()
+            self._context_cache[key] = context
+        return context
@@ -11,15 +11,20 @@ Uses a small sample of 3 hotels for learning purposes.
 import asyncio
 import json
 import os
+import time
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 
 try:
     # Try new LangChain structure (v0.2+)
     from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.language_models.chat_models import BaseChatModel
 except ImportError:
     # Fallback to old structure (v0.1)
     from langchain.prompts import ChatPromptTemplate
+    from langchain.chat_models.base import BaseChatModel
 
 try:
     from langchain_google_genai import ChatGoogleGenerativeAI
@@ -34,13 +39,57 @@ except ImportError:
     ChatOpenAI = None
 
 from util.configuration import PROJECT_ROOT
-from util.logger_config import logger
-from config.agent_config import get_agent_config, _load_config_file
+from util.logger_config import logger, SAMPLED
+from util.metrics import counter, gauge, histogram
+from util.tracing import chain_callbacks, span
+from config.agent_config import (
+    AgentConfig, ConfigChange, get_agent_config, subscribe_config_changes, _load_config_file
+)
+from agents.hotel_context import HotelContext, SourceStamp, build_hotel_context, get_source_stamps
+from agents.hotel_retrieval import HotelIndex
+from agents.answer_cache import AnswerCache, make_cache_key, normalize_question
+from agents.pricing_engine import DEFAULT_PEAK_SEASON_MONTHS, PricingEngine, answer_price_question
+from agents.booking_cube import BookingCube, answer_analytics_question, load_booking_cube
+from agents.bookings_analytics import get_bookings_data_file
+from agents.hotel_snapshot import HotelDataSnapshot, HotelDataStore
+from agents.stub_llm import create_stub_llm
+from agents.llm_cassette import wrap_with_cassette
+from agents.single_flight import SingleFlight
+from agents.llm_resilience import (
+    CircuitBreaker, LLMGuard, LLMStreamInterruptedError, LLMUnavailableError, ResiliencePolicy
+)
+
+BOOKING_CUBE_FILE_NAME = "booking_cube.json"
+
+# Agent metrics (served by /metrics)
+ANSWERS = counter(
+    "hospitality_agent_answers_total",
+    "Agent answers by source (pricing, cube, cache, llm, stale_cache, unavailable, error)", ["source"]
+)
+LLM_CALL_SECONDS = histogram(
+    "hospitality_llm_call_duration_seconds", "Duration of LLM calls", ["provider", "model", "mode"]
+)
+LLM_FIRST_TOKEN_SECONDS = histogram(
+    "hospitality_llm_time_to_first_token_seconds", "Time to the first streamed fragment", ["provider", "model"]
+)
+LLM_TOKENS = counter("hospitality_llm_tokens_total", "Tokens reported in the LLM usage metadata", ["kind"])
+LLM_CONTEXT_BYTES = histogram(
+    "hospitality_llm_context_bytes", "Size of the hotel context sent to the LLM",
+    buckets=(1024, 4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576)
+)
+LLM_REQUESTS_WAITING = gauge(
+    "hospitality_llm_requests_waiting", "LLM calls waiting for a slot (max_concurrent_requests)"
+)
+LLM_REQUESTS_IN_FLIGHT = gauge("hospitality_llm_requests_in_flight", "LLM calls in flight")
+ANSWER_CACHE_LOOKUPS = counter(
+    "hospitality_answer_cache_lookups_total", "Answer cache lookups by result (hit, miss)", ["result"]
+)
 
 # Path to hotel data files (relative to project root)
 # First try local data directory (for Docker), then fallback to bookings-db
 HOTELS_DATA_PATH_LOCAL = PROJECT_ROOT / "data" / "hotels"
 HOTELS_DATA_PATH_EXTERNAL = PROJECT_ROOT.parent / "bookings-db" / "output_files" / "hotels"
+HOTEL_DATA_FILE_NAMES = ("hotels.json", "hotel_details.md")
 
 
 def _get_hotels_data_path():
@@ -63,16 +112,45 @@ def _get_hotels_data_path():
         logger.warning(f"No valid hotel data path found; defaulting to local path: {HOTELS_DATA_PATH_LOCAL}")
         return HOTELS_DATA_PATH_LOCAL
 
+
+def _hotel_data_files() -> List[Path]:
+    """
+    Get the hotel data files watched for changes (both locations).
+    
+    Returns:
+        list: Paths of the hotel data files in the local and external directories
+    """
+    return [
+        directory / file_name
+        for directory in (HOTELS_DATA_PATH_LOCAL, HOTELS_DATA_PATH_EXTERNAL)
+        for file_name in HOTEL_DATA_FILE_NAMES
+    ]
+
+
 # Global variables to cache loaded data and agent
-_hotels_data: Optional[dict] = None
-_hotel_details_text: Optional[str] = None
+_booking_cube: Optional[BookingCube] = None
+_cube_fast_path = True
 _agent_chain = None
+_agent_config: Optional[AgentConfig] = None
+_agent_supports_async = False
+_request_semaphore: Optional[asyncio.Semaphore] = None
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_initialized = False
+# Cache an answer was looked up in and its key, to store the answer in the same cache
+CacheSlot = Optional[Tuple[AnswerCache, str]]
+# Identical questions asked at the same time share one LLM call
+_single_flight = SingleFlight()
+_llm_guard: Optional[LLMGuard] = None
 
 
 def load_hotel_data() -> Tuple[dict, str]:
     """
     Load hotel data from JSON and markdown files.
     
+    The data is held in a versioned snapshot together with its pre-serialized
+    context. When the source files change, the next snapshot is built in the
+    background and swapped in; this returns the current one meanwhile.
+    
     Returns:
         tuple: (hotels_data dict, hotel_details_text str)
         
@@ -80,12 +158,25 @@ def load_hotel_data() -> Tuple[dict, str]:
         FileNotFoundError: If hotel data files don't exist
         json.JSONDecodeError: If hotels.json is invalid
     """
-    global _hotels_data, _hotel_details_text
-    
-    # Return cached data if already loaded
-    if _hotels_data is not None and _hotel_details_text is not None:
-        return _hotels_data, _hotel_details_text
+    snapshot = _hotel_data_store.current()
+    return snapshot.hotels_data, snapshot.hotel_details_text
+
+
+def _build_hotel_snapshot(version: int, watch_stamps: Tuple[SourceStamp, ...]) -> HotelDataSnapshot:
+    """
+    Read the hotel data files and build a snapshot from them.
     
+    Args:
+        version: Version number of the snapshot
+        watch_stamps: Stamps of the watched files taken before reading them
+        
+    Returns:
+        HotelDataSnapshot: Parsed data, context, index and pricing engine
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+        json.JSONDecodeError: If hotels.json is invalid
+    """
     # Determine the correct path to hotel data
     hotels_data_path = _get_hotels_data_path()
     hotels_json_file = hotels_data_path / "hotels.json"
@@ -114,19 +205,481 @@ def load_hotel_data() -> Tuple[dict, str]:
             f"Or copy files to: {HOTELS_DATA_PATH_LOCAL}"
         )
     
+    # Stamp the files before reading them so a concurrent write is detected later
+    source_stamps = get_source_stamps([hotels_json_file, hotel_details_file])
+    
     # Load JSON data
     logger.info(f"Loading hotel data from {hotels_json_file}")
     with open(hotels_json_file, 'r', encoding='utf-8') as f:
-        _hotels_data = json.load(f)
+        hotels_data = json.load(f)
     
     # Load markdown details
     logger.info(f"Loading hotel details from {hotel_details_file}")
     with open(hotel_details_file, 'r', encoding='utf-8') as f:
-        _hotel_details_text = f.read()
+        hotel_details_text = f.read()
+    
+    # Serialize the context once for all the questions on this version of the data
+    hotel_context = build_hotel_context(hotels_data, hotel_details_text, source_stamps)
+    hotel_index = HotelIndex(hotels_data, hotel_details_text)
+    pricing_config = _load_config_file().get("pricing", {})
+    pricing_engine = PricingEngine(
+        hotels_data, pricing_config.get("peak_season_months", DEFAULT_PEAK_SEASON_MONTHS)
+    )
+    
+    snapshot = HotelDataSnapshot(
+        version=version,
+        hotels_data=hotels_data,
+        hotel_details_text=hotel_details_text,
+        context=hotel_context,
+        index=hotel_index,
+        pricing_engine=pricing_engine,
+        pricing_fast_path=pricing_config.get("fast_path", True),
+        watch_stamps=watch_stamps,
+        created_at=time.time()
+    )
+    
+    logger.info(
+        f"Successfully loaded hotel data ({snapshot.hotel_count} hotels, "
+        f"context {hotel_context.size_bytes} bytes, ~{hotel_context.token_count} tokens)"
+    )
+    
+    return snapshot
+
+
+def _on_hotel_data_swap(previous: Optional[HotelDataSnapshot], snapshot: HotelDataSnapshot) -> None:
+    """Clear the answers computed on a previous version of the data."""
+    if previous is not None and previous.context.fingerprint != snapshot.context.fingerprint:
+        answer_cache = _get_answer_cache()
+        if answer_cache is not None:
+            answer_cache.clear()
+            logger.info("Hotel data changed; answer cache cleared")
+
+
+_hotel_data_store = HotelDataStore(_build_hotel_snapshot, _hotel_data_files, on_swap=_on_hotel_data_swap)
+
+
+def get_hotel_data_snapshot() -> HotelDataSnapshot:
+    """
+    Get the current hotel data snapshot, loading the hotel data if needed.
+    
+    Returns:
+        HotelDataSnapshot: Current version of the hotel data
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+    """
+    return _hotel_data_store.current()
+
+
+def preload_hotel_data() -> None:
+    """
+    Build the first hotel data snapshot and load the booking cube.
+    
+    Called at startup (in a worker thread) so the first requests do not
+    build them. Missing files are only logged: the requests report them.
+    """
+    try:
+        _hotel_data_store.current()
+        get_booking_cube()
+    except Exception as e:
+        logger.warning(f"Could not preload the hotel data: {e}")
+
+
+async def _ensure_hotel_data_loaded() -> None:
+    """Build the first snapshot in a worker thread instead of on the event loop."""
+    if not _hotel_data_store.loaded:
+        await asyncio.to_thread(_hotel_data_store.current)
+
+
+def get_hotel_data_stats() -> dict:
+    """
+    Get the hotel data store counters.
+    
+    Returns:
+        dict: current version, requests in flight per version, builds and failed builds
+    """
+    return _hotel_data_store.stats()
+
+
+def start_hotel_data_watcher() -> None:
+    """Watch the hotel data files and swap in new versions in the background."""
+    _hotel_data_store.start_watcher()
+
+
+def stop_hotel_data_watcher() -> None:
+    """Stop watching the hotel data files."""
+    _hotel_data_store.stop_watcher()
+
+
+def get_hotel_context() -> HotelContext:
+    """
+    Get the pre-serialized hotel context, loading the hotel data if needed.
+    
+    Returns:
+        HotelContext: Immutable context for the current version of the data
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+    """
+    return _hotel_data_store.current().context
+
+
+def get_pricing_engine() -> PricingEngine:
+    """
+    Get the pricing engine for the loaded hotel data.
+    
+    Returns:
+        PricingEngine: Vectorized pricing engine (for batch quotes or tools)
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+    """
+    return _hotel_data_store.current().pricing_engine
+
+
+def _answer_from_pricing_engine(question: str, snapshot: HotelDataSnapshot) -> Optional[str]:
+    """
+    Fast path: answer fully specified price questions without the LLM.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        Optional[str]: Exact price answer, or None if the question must go to the LLM
+    """
+    if not snapshot.pricing_fast_path:
+        return None
+    answer = answer_price_question(question, snapshot.index, snapshot.pricing_engine)
+    if answer is not None:
+        ANSWERS.labels(source="pricing").inc()
+        logger.info("Answered price question with the pricing engine: %.100s...", question, extra=SAMPLED)
+    return answer
+
+
+def get_booking_cube() -> Optional[BookingCube]:
+    """
+    Get the occupancy/revenue cube, reloading it when the file changed.
+    
+    Returns:
+        Optional[BookingCube]: The cube, or None if it is disabled or not generated
+    """
+    global _booking_cube, _cube_fast_path
+    
+    if _booking_cube is not None and not _booking_cube.is_stale():
+        return _booking_cube
     
-    logger.info(f"Successfully loaded hotel data ({len(_hotels_data.get('hotels', []))} hotels)")
+    analytics_config = _load_config_file().get("analytics", {})
+    _cube_fast_path = analytics_config.get("cube_fast_path", True)
+    cube_file = get_bookings_data_file(BOOKING_CUBE_FILE_NAME, analytics_config.get("local", True))
+    if not cube_file.exists():
+        return _booking_cube
+    try:
+        _booking_cube = load_booking_cube(cube_file)
+        logger.info(f"Loaded occupancy/revenue cube from {cube_file}")
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading the occupancy/revenue cube from {cube_file}: {e}")
+    return _booking_cube
+
+
+def _answer_from_booking_cube(question: str, snapshot: HotelDataSnapshot) -> Optional[str]:
+    """
+    Fast path: answer occupancy and revenue questions from the precomputed cube.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        Optional[str]: Answer from the cube, or None if the question must go to the LLM
+    """
+    cube = get_booking_cube()
+    if cube is None or not _cube_fast_path:
+        return None
+    answer = answer_analytics_question(question, snapshot.index, cube)
+    if answer is not None:
+        ANSWERS.labels(source="cube").inc()
+        logger.info("Answered analytics question from the booking cube: %.100s...", question, extra=SAMPLED)
+    return answer
+
+
+def _answer_without_llm(question: str, snapshot: HotelDataSnapshot) -> Optional[str]:
+    """
+    Try the deterministic fast paths (pricing engine, booking cube) in order.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        Optional[str]: Exact answer, or None if the question must go to the LLM
+    """
+    with span("agent.fast_path.pricing") as pricing_span:
+        answer = _answer_from_pricing_engine(question, snapshot)
+        pricing_span.set_attribute("answered", answer is not None)
+    if answer is None:
+        with span("agent.fast_path.cube") as cube_span:
+            answer = _answer_from_booking_cube(question, snapshot)
+            cube_span.set_attribute("answered", answer is not None)
+    return answer
+
+
+def select_hotel_context(question: str, snapshot: Optional[HotelDataSnapshot] = None) -> str:
+    """
+    Retrieval stage: select the hotel context to send with a question.
+    
+    Resolves the hotel names, cities, countries, room types and categories
+    mentioned in the question against the hotel index and keeps only the
+    matching hotel sections. Falls back to the full context when nothing
+    in the question matches or pruning is disabled in the configuration.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request (defaults to the current one)
+        
+    Returns:
+        str: Hotel context for the prompt
+    """
+    return _select_hotel_context(question, snapshot or _hotel_data_store.current())[0]
+
+
+def _select_hotel_context(question: str, snapshot: HotelDataSnapshot) -> Tuple[str, int]:
+    """
+    Select the hotel context of a question together with its size.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        tuple: (hotel context, size in UTF-8 bytes measured when it was built)
+    """
+    full_context = snapshot.context
+    if _agent_config is not None and not _agent_config.context_pruning:
+        return full_context.text, full_context.size_bytes
+    
+    pruned_context = snapshot.index.context_for_question(question)
+    if pruned_context is None:
+        logger.debug("No hotel entities matched the question; using the full context")
+        return full_context.text, full_context.size_bytes
+    
+    logger.debug("Pruned hotel context to %d of %d bytes", pruned_context.size_bytes, full_context.size_bytes)
+    return pruned_context.text, pruned_context.size_bytes
+
+
+def _get_answer_cache() -> Optional[AnswerCache]:
+    """
+    Get the answer cache, creating it from the `cache` configuration section.
+    
+    Returns:
+        Optional[AnswerCache]: The answer cache, or None if caching is disabled
+    """
+    global _answer_cache, _answer_cache_initialized
+    
+    if _answer_cache_initialized:
+        return _answer_cache
+    
+    cache_config = _load_config_file().get("cache", {})
+    if cache_config.get("enabled", True):
+        persist_path = cache_config.get("persist_path")
+        if persist_path and not Path(persist_path).is_absolute():
+            persist_path = PROJECT_ROOT / persist_path
+        _answer_cache = AnswerCache(
+            max_entries=cache_config.get("max_entries", 1024),
+            ttl_seconds=cache_config.get("ttl_seconds", 3600),
+            persist_path=persist_path
+        )
+        logger.info(f"Answer cache enabled (max_entries={_answer_cache.max_entries}, ttl={_answer_cache.ttl_seconds}s)")
+    _answer_cache_initialized = True
+    return _answer_cache
+
+
+def _answer_cache_key(question: str, snapshot: HotelDataSnapshot) -> str:
+    """
+    Build the answer cache key of a question for the request's data and configuration.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        str: Cache key
+    """
+    return make_cache_key(question, snapshot.context.fingerprint, _config_signature())
+
+
+def _config_signature() -> str:
+    """Settings of the agent configuration an answer depends on."""
+    return (
+        f"{_agent_config.provider}|{_agent_config.model}|"
+        f"{_agent_config.temperature}|{_agent_config.context_pruning}"
+    )
+
+
+def _single_flight_key(question: str, snapshot: HotelDataSnapshot) -> tuple:
+    """
+    Build the key under which identical concurrent questions are coalesced.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        tuple: Data version, normalized question and configuration signature
+    """
+    return snapshot.version, normalize_question(question), _config_signature()
+
+
+def get_single_flight_stats() -> dict:
+    """
+    Get the request coalescing counters.
+    
+    Returns:
+        dict: calls, executions, saved calls, cancelled flights and flights in progress
+    """
+    return _single_flight.stats()
+
+
+def _lookup_cached_answer(question: str, snapshot: HotelDataSnapshot) -> Tuple[CacheSlot, Optional[str]]:
+    """
+    Look up the answer of a question in the answer cache.
+    
+    The answer is later stored in the same cache instance, even if a
+    configuration reload replaced the module's cache in the meantime.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        tuple: ((cache, key) or None if caching is disabled, cached answer or None)
+    """
+    answer_cache = _get_answer_cache()
+    if answer_cache is None:
+        return None, None
+    
+    with span("agent.cache_lookup") as lookup_span:
+        cache_key = _answer_cache_key(question, snapshot)
+        cached_answer = answer_cache.get(cache_key)
+        lookup_span.set_attribute("hit", cached_answer is not None)
+    ANSWER_CACHE_LOOKUPS.labels(result="hit" if cached_answer is not None else "miss").inc()
+    if cached_answer is not None:
+        ANSWERS.labels(source="cache").inc()
+        logger.info("Answer cache hit for question: %.100s...", question, extra=SAMPLED)
+    return (answer_cache, cache_key), cached_answer
+
+
+def _store_answer(cache_slot: CacheSlot, answer: str) -> None:
+    """
+    Store an answer produced by the LLM in the answer cache.
+    
+    Args:
+        cache_slot: Cache and key returned by `_lookup_cached_answer` (None if caching is disabled)
+        answer: Answer to store
+    """
+    if cache_slot is not None:
+        answer_cache, cache_key = cache_slot
+        answer_cache.put(cache_key, answer)
+
+
+def _stale_cached_answer(cache_slot: CacheSlot) -> Optional[str]:
+    """
+    Get a cached answer, even if expired, to serve while the LLM is unavailable.
+    
+    Args:
+        cache_slot: Cache and key returned by `_lookup_cached_answer` (None if caching is disabled)
+        
+    Returns:
+        Optional[str]: Cached answer, or None if there is none
+    """
+    if cache_slot is None:
+        return None
+    answer_cache, cache_key = cache_slot
+    stale_answer = answer_cache.get_stale(cache_key)
+    if stale_answer is not None:
+        ANSWERS.labels(source="stale_cache").inc()
+        logger.warning("LLM unavailable; serving a stale cached answer")
+    return stale_answer
+
+
+def get_answer_cache_stats() -> dict:
+    """
+    Get the answer cache counters.
     
-    return _hotels_data, _hotel_details_text
+    Returns:
+        dict: hits, misses, evictions, size and hit_rate (empty if caching is disabled)
+    """
+    answer_cache = _get_answer_cache()
+    return answer_cache.stats() if answer_cache is not None else {}
+
+
+def _answer_cache_metric(name: str):
+    """Scrape-time value of an answer cache statistic (None while caching is off)."""
+    def value():
+        # Read once: a configuration reload may reset the cache meanwhile
+        answer_cache = _answer_cache
+        return answer_cache.stats()[name] if answer_cache is not None else None
+    return value
+
+
+# Answer cache and hotel data gauges, computed when /metrics is scraped
+gauge("hospitality_answer_cache_entries", "Answers in the cache").set_function(_answer_cache_metric("size"))
+gauge("hospitality_llm_calls_saved", "LLM calls saved by coalescing identical concurrent questions").set_function(
+    lambda: _single_flight.stats()["saved"]
+)
+gauge("hospitality_llm_circuit_state", "LLM circuit breaker state (0 closed, 1 half-open, 2 open)").set_function(
+    lambda: CircuitBreaker.STATE_VALUES[_llm_guard.breaker.state] if _llm_guard is not None else 0
+)
+gauge("hospitality_hotel_data_version", "Version of the hotel data snapshot in use").set_function(
+    lambda: _hotel_data_store.stats()["version"]
+)
+
+
+def save_answer_cache() -> None:
+    """Persist the answer cache to disk if persistence is configured."""
+    answer_cache = _answer_cache
+    if answer_cache is not None:
+        answer_cache.save()
+
+
+def _on_hotel_data_config_change(change: ConfigChange) -> None:
+    """Rebuild the hotel data snapshot (path, pricing engine) in the background."""
+    _hotel_data_store.request_rebuild()
+
+
+def _on_analytics_config_change(change: ConfigChange) -> None:
+    """Reload the booking cube with the new analytics settings on the next request."""
+    global _booking_cube
+    _booking_cube = None
+
+
+def _on_cache_config_change(change: ConfigChange) -> None:
+    """Recreate the answer cache with the new cache settings on the next request."""
+    global _answer_cache, _answer_cache_initialized
+    save_answer_cache()
+    _answer_cache, _answer_cache_initialized = None, False
+
+
+def _on_agent_config_change(change: ConfigChange) -> None:
+    """Recreate the LLM client and the request semaphore on the next request."""
+    global _agent_chain, _request_semaphore
+    logger.info("Agent settings changed; the LLM client will be recreated")
+    _agent_chain, _request_semaphore = None, None
+
+
+def _on_resilience_config_change(change: ConfigChange) -> None:
+    """Recreate the LLM guard and the LLM client (its timeout) on the next request."""
+    global _agent_chain, _llm_guard
+    logger.info("Resilience settings changed; the LLM guard will be recreated")
+    _agent_chain, _llm_guard = None, None
+
+
+# Only the state depending on a changed section is rebuilt
+subscribe_config_changes(_on_hotel_data_config_change, sections=("hotels", "pricing"))
+subscribe_config_changes(_on_analytics_config_change, sections=("analytics",))
+subscribe_config_changes(_on_cache_config_change, sections=("cache",))
+subscribe_config_changes(_on_agent_config_change, sections=("agent", "stub", "cassette"))
+subscribe_config_changes(_on_resilience_config_change, sections=("resilience",))
 
 
 def _create_agent_chain():
@@ -136,13 +689,18 @@ def _create_agent_chain():
     Returns:
         LangChain chain: Prompt template + LLM chain
     """
-    global _agent_chain
+    global _agent_chain, _agent_config, _agent_supports_async
     
     if _agent_chain is not None:
         return _agent_chain
     
     # Load configuration from centralized config system
     config = get_agent_config()
+    _agent_config = config
+    # The guard retries transient failures, so the provider clients are created
+    # with max_retries=0 and the guard's deadline as their timeout
+    policy = _get_llm_guard().policy
+    client_timeout = policy.timeout_seconds or None
     
     # Create LLM instance based on provider and configuration
     if config.provider == "openai":
@@ -152,18 +710,29 @@ def _create_agent_chain():
         llm = ChatOpenAI(
             model=config.model,
             temperature=config.temperature,
-            api_key=config.api_key
+            api_key=config.api_key,
+            timeout=client_timeout,
+            max_retries=0
         )
         logger.info(f"Using OpenAI API with model: {config.model}")
+    elif config.provider == "stub":
+        # Local fake model for offline benchmarks and load tests
+        llm = create_stub_llm(config.model, _load_config_file().get("stub"))
+        logger.info(f"Using stub LLM provider: {llm._identifying_params}")
     else:
         # Standard Gemini API usage
         llm = ChatGoogleGenerativeAI(
             model=config.model,
             temperature=config.temperature,
-            google_api_key=config.api_key
+            google_api_key=config.api_key,
+            timeout=client_timeout,
+            max_retries=0
         )
         logger.info(f"Using Gemini API with model: {config.model}")
     
+    # Record the LLM responses, or replay recorded ones (cassette section)
+    llm = wrap_with_cassette(llm, f"{config.provider}:{config.model}", _load_config_file().get("cassette"))
+    
     # Create prompt template
     prompt_template = ChatPromptTemplate.from_messages([
         ("system", """You are a helpful hotel assistant. Use the following hotel information to answer questions.
@@ -183,10 +752,157 @@ When answering questions:
     
     # Create the chain
     _agent_chain = prompt_template | llm
+    _agent_supports_async = _has_native_async(llm)
+    if not _agent_supports_async:
+        logger.warning(f"{type(llm).__name__} has no native async support; LLM calls will run in the thread pool")
     
     return _agent_chain
 
 
+def _has_native_async(llm) -> bool:
+    """
+    Check whether a chat model implements its own async generation.
+    
+    Models that don't override `_agenerate` only get LangChain's default
+    implementation, which runs the blocking call in a thread pool anyway.
+    
+    Args:
+        llm: LangChain chat model instance
+        
+    Returns:
+        bool: True if the model provides a native async implementation
+    """
+    if not isinstance(llm, BaseChatModel):
+        return hasattr(llm, "ainvoke")
+    return type(llm)._agenerate is not BaseChatModel._agenerate
+
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding the number of LLM calls in flight.
+    
+    Returns:
+        asyncio.Semaphore: Semaphore sized from the agent configuration
+    """
+    global _request_semaphore
+    
+    if _request_semaphore is None:
+        config = _agent_config or get_agent_config()
+        _request_semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+    return _request_semaphore
+
+
+def _get_llm_guard() -> LLMGuard:
+    """
+    Get the guard applying deadlines, retries and the circuit breaker to LLM calls.
+    
+    Returns:
+        LLMGuard: Guard built from the `resilience` section of agent_config.yaml
+    """
+    global _llm_guard
+    
+    if _llm_guard is None:
+        _llm_guard = LLMGuard(ResiliencePolicy.from_config(_load_config_file().get("resilience")))
+    return _llm_guard
+
+
+def get_llm_resilience_stats() -> dict:
+    """
+    Get the LLM circuit breaker counters.
+    
+    Returns:
+        dict: state, consecutive failures, times opened and calls rejected
+    """
+    return _get_llm_guard().stats()
+
+
+@asynccontextmanager
+async def _llm_slot():
+    """Hold one of the `max_concurrent_requests` LLM slots, tracking the waiting and in-flight calls."""
+    semaphore = _get_request_semaphore()
+    with span("llm.slot_wait"), LLM_REQUESTS_WAITING.track_inprogress():
+        await semaphore.acquire()
+    try:
+        with LLM_REQUESTS_IN_FLIGHT.track_inprogress():
+            yield
+    finally:
+        semaphore.release()
+
+
+def _llm_timer(mode: str):
+    """Histogram child timing an LLM call of the current provider and model."""
+    return LLM_CALL_SECONDS.labels(provider=_agent_config.provider, model=_agent_config.model, mode=mode)
+
+
+def _record_llm_usage(usage_metadata: Optional[dict]) -> None:
+    """
+    Count the prompt and completion tokens reported by the provider.
+    
+    Args:
+        usage_metadata: `usage_metadata` of the response (None if not reported)
+    """
+    if not usage_metadata:
+        return
+    LLM_TOKENS.labels(kind="prompt").inc(usage_metadata.get("input_tokens", 0) or 0)
+    LLM_TOKENS.labels(kind="completion").inc(usage_metadata.get("output_tokens", 0) or 0)
+
+
+def _build_chain_inputs(question: str, snapshot: HotelDataSnapshot) -> dict:
+    """
+    Build the input variables of the agent chain for a question.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        
+    Returns:
+        dict: Chain inputs (hotel context and question)
+    """
+    with span("agent.context_select") as context_span:
+        hotel_context, context_bytes = _select_hotel_context(question, snapshot)
+        context_span.set_attribute("context.bytes", context_bytes)
+    LLM_CONTEXT_BYTES.observe(context_bytes)
+    return {
+        "hotel_context": hotel_context,
+        "question": question
+    }
+
+
+def _format_agent_error(error: Exception) -> str:
+    """
+    Log an agent error and turn it into a user facing markdown message.
+    
+    Args:
+        error: Exception raised while answering a question
+        
+    Returns:
+        str: Error message for the user
+    """
+    ANSWERS.labels(source="error").inc()
+    if isinstance(error, FileNotFoundError):
+        logger.error(f"Hotel data files not found: {error}")
+        return f"""❌ **Error**: Hotel data files not found.
+
+Please generate the hotel data first:
+```bash
+cd bookings-db
+python src/gen_synthetic_hotels.py --num_hotels 3
+```
+
+Then restart the API server."""
+    
+    if isinstance(error, ValueError):
+        logger.error(f"Configuration error: {error}")
+        return f"""❌ **Error**: {str(error)}"""
+    
+    logger.error(f"Error processing question: {error}", exc_info=error)
+    return f"""❌ **Error**: An unexpected error occurred while processing your question.
+
+Error details: {str(error)}
+
+Please try again or contact support if the problem persists."""
+
+
 def answer_hotel_question(question: str) -> str:
     """
     Simple agent that answers questions using hotel files as context.
@@ -203,63 +919,317 @@ def answer_hotel_question(question: str) -> str:
     Raises:
         FileNotFoundError: If hotel data files don't exist
         ValueError: If configuration is invalid or missing required values
+        LLMUnavailableError: If the LLM provider is unavailable and no cached answer exists
     """
     try:
-        # Load hotel data
-        hotels_data, hotel_details_text = load_hotel_data()
+        # The whole request uses the same version of the hotel data
+        with _hotel_data_store.acquire() as snapshot:
+            # Answer exact price and analytics questions without calling the LLM
+            fast_answer = _answer_without_llm(question, snapshot)
+            if fast_answer is not None:
+                return fast_answer
+            
+            # Create agent chain
+            chain = _create_agent_chain()
+            
+            # Serve repeated questions from the answer cache
+            cache_slot, cached_answer = _lookup_cached_answer(question, snapshot)
+            if cached_answer is not None:
+                return cached_answer
+            
+            # Invoke the chain (once for identical questions asked at the same time)
+            try:
+                return _single_flight.call(
+                    _single_flight_key(question, snapshot),
+                    partial(_invoke_llm, chain, question, snapshot, cache_slot)
+                )
+            except LLMUnavailableError:
+                stale_answer = _stale_cached_answer(cache_slot)
+                if stale_answer is None:
+                    raise
+                return stale_answer
         
-        # Prepare context from loaded files
-        hotel_context = f"""
-{hotel_details_text}
+    except LLMUnavailableError:
+        # Left to the caller, which falls back to its hardcoded answers
+        ANSWERS.labels(source="unavailable").inc()
+        raise
+    except Exception as e:
+        return _format_agent_error(e)
 
-Hotels JSON Summary:
-{json.dumps(hotels_data, indent=2, ensure_ascii=False)}
-"""
+
+async def answer_hotel_question_async(question: str) -> str:
+    """
+    Async version of `answer_hotel_question`.
+    
+    Uses the chain's native async invocation so waiting for the LLM does not
+    pin a thread. Providers without async support fall back to the default
+    thread pool. The number of LLM calls in flight is bounded by the
+    `max_concurrent_requests` setting.
+    
+    Args:
+        question: User's question about hotels
         
-        # Create agent chain
-        chain = _create_agent_chain()
+    Returns:
+        str: Agent's response
         
-        # Invoke the chain
-        logger.info(f"Processing question: {question[:100]}...")
-        response = chain.invoke({
-            "hotel_context": hotel_context,
-            "question": question
-        })
+    Raises:
+        LLMUnavailableError: If the LLM provider is unavailable and no cached answer exists
+    """
+    try:
+        await _ensure_hotel_data_loaded()
+        with _hotel_data_store.acquire() as snapshot:
+            # The fast paths are CPU-bound (and may reload the cube): keep them off the event loop
+            fast_answer = await asyncio.to_thread(_answer_without_llm, question, snapshot)
+            if fast_answer is not None:
+                return fast_answer
+            
+            chain = _create_agent_chain()
+            
+            # Serve repeated questions from the answer cache
+            cache_slot, cached_answer = _lookup_cached_answer(question, snapshot)
+            if cached_answer is not None:
+                return cached_answer
+            
+            # Identical questions asked at the same time share one LLM call
+            try:
+                return await _single_flight.run(
+                    _single_flight_key(question, snapshot),
+                    partial(_invoke_llm_async, chain, question, snapshot, cache_slot)
+                )
+            except LLMUnavailableError:
+                stale_answer = _stale_cached_answer(cache_slot)
+                if stale_answer is None:
+                    raise
+                return stale_answer
         
-        return response.content
+    except LLMUnavailableError:
+        ANSWERS.labels(source="unavailable").inc()
+        raise
+    except Exception as e:
+        return _format_agent_error(e)
+
+
+def _invoke_llm(chain, question: str, snapshot: HotelDataSnapshot, cache_slot: CacheSlot) -> str:
+    """
+    Answer a question with a blocking call of the chain and cache the answer.
+    
+    Args:
+        chain: Agent chain
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        cache_slot: Answer cache and key (None if caching is disabled)
         
-    except FileNotFoundError as e:
-        logger.error(f"Hotel data files not found: {e}")
-        return f"""❌ **Error**: Hotel data files not found.
+    Returns:
+        str: Agent's response
+    """
+    inputs = _build_chain_inputs(question, snapshot)
+    logger.info("Processing question: %.100s...", question, extra=SAMPLED)
+    with LLM_REQUESTS_IN_FLIGHT.track_inprogress(), _llm_timer("invoke").time():
+        response = _get_llm_guard().call_sync(
+            partial(chain.invoke, inputs, config={"callbacks": chain_callbacks()})
+        )
+    _record_llm_usage(getattr(response, "usage_metadata", None))
+    ANSWERS.labels(source="llm").inc()
+    
+    _store_answer(cache_slot, response.content)
+    return response.content
 
-Please generate the hotel data first:
-```bash
-cd bookings-db
-python src/gen_synthetic_hotels.py --num_hotels 3
-```
 
-Then restart the API server."""
+async def _invoke_llm_async(chain, question: str, snapshot: HotelDataSnapshot, cache_slot: CacheSlot) -> str:
+    """
+    Answer a question with an async call of the chain and cache the answer.
+    
+    Runs as the producer of a coalesced flight, which can outlive the request
+    that started it, so it holds the snapshot itself.
+    
+    Args:
+        chain: Agent chain
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        cache_slot: Answer cache and key (None if caching is disabled)
+        
+    Returns:
+        str: Agent's response
+    """
+    with _hotel_data_store.acquire(snapshot):
+        inputs = _build_chain_inputs(question, snapshot)
+        
+        logger.info("Processing question: %.100s...", question, extra=SAMPLED)
+        config = {"callbacks": chain_callbacks()}
+        
+        async def attempt():
+            # Runs inside the LLM slot, once per try
+            with _llm_timer("invoke").time():
+                if _agent_supports_async:
+                    return await chain.ainvoke(inputs, config=config)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, partial(chain.invoke, inputs, config))
+        
+        response = await _get_llm_guard().call(attempt, slot=_llm_slot)
+    _record_llm_usage(getattr(response, "usage_metadata", None))
+    ANSWERS.labels(source="llm").inc()
     
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        return f"""❌ **Error**: {str(e)}"""
+    _store_answer(cache_slot, response.content)
+    return response.content
+
+
+def _chunk_text(chunk) -> str:
+    """
+    Extract the text of a streamed message chunk.
     
+    Some providers (e.g. Gemini) return the content as a list of parts
+    instead of a plain string.
+    
+    Args:
+        chunk: Message chunk produced by the chain
+        
+    Returns:
+        str: Text contained in the chunk
+    """
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return str(content)
+
+
+async def stream_hotel_answer(question: str) -> AsyncIterator[str]:
+    """
+    Answer a question streaming the response as it is generated.
+    
+    Uses the chain's streaming API so the first tokens can be forwarded to
+    the client before the whole completion is done. Providers without async
+    support yield the complete answer as a single chunk. Errors are yielded
+    as a final chunk with the same message `answer_hotel_question` returns.
+    
+    Args:
+        question: User's question about hotels
+        
+    Yields:
+        str: Consecutive fragments of the agent's response
+        
+    Raises:
+        LLMUnavailableError: If the LLM provider is unavailable and no cached answer exists
+        LLMStreamInterruptedError: If the LLM stream failed after the first fragment
+    """
+    try:
+        await _ensure_hotel_data_loaded()
+        with _hotel_data_store.acquire() as snapshot:
+            fast_answer = await asyncio.to_thread(_answer_without_llm, question, snapshot)
+            if fast_answer is not None:
+                yield fast_answer
+                return
+            
+            chain = _create_agent_chain()
+            
+            # Serve repeated questions from the answer cache
+            cache_slot, cached_answer = _lookup_cached_answer(question, snapshot)
+            if cached_answer is not None:
+                yield cached_answer
+                return
+            
+            # Identical questions asked at the same time share one LLM call;
+            # every request gets the fragments as they are generated
+            try:
+                async for fragment in _single_flight.stream(
+                    _single_flight_key(question, snapshot),
+                    partial(_stream_llm, chain, question, snapshot, cache_slot)
+                ):
+                    yield fragment
+            except LLMStreamInterruptedError:
+                # Part of the answer was sent: it cannot be replaced by a cached one
+                raise
+            except LLMUnavailableError:
+                stale_answer = _stale_cached_answer(cache_slot)
+                if stale_answer is None:
+                    raise
+                yield stale_answer
+        
+    except LLMUnavailableError:
+        ANSWERS.labels(source="unavailable").inc()
+        raise
     except Exception as e:
-        logger.error(f"Error processing question: {e}", exc_info=True)
-        return f"""❌ **Error**: An unexpected error occurred while processing your question.
+        yield _format_agent_error(e)
 
-Error details: {str(e)}
 
-Please try again or contact support if the problem persists."""
+async def _stream_llm(chain, question: str, snapshot: HotelDataSnapshot,
+                      cache_slot: CacheSlot) -> AsyncIterator[str]:
+    """
+    Stream the answer of a question from the chain and cache the complete answer.
+    
+    Runs as the producer of a coalesced flight, which can outlive the request
+    that started it, so it holds the snapshot itself.
+    
+    Args:
+        chain: Agent chain
+        question: User's question about hotels
+        snapshot: Hotel data snapshot of the request
+        cache_slot: Answer cache and key (None if caching is disabled)
+        
+    Yields:
+        str: Consecutive fragments of the agent's response
+    """
+    with _hotel_data_store.acquire(snapshot):
+        inputs = _build_chain_inputs(question, snapshot)
+        
+        logger.info("Streaming answer for question: %.100s...", question, extra=SAMPLED)
+        fragments = []
+        config = {"callbacks": chain_callbacks()}
+        # Retried by the guard only while no fragment was produced
+        chunks = _get_llm_guard().stream(partial(_stream_chain, chain, inputs, config), slot=_llm_slot)
+        async for chunk in chunks:
+            _record_llm_usage(getattr(chunk, "usage_metadata", None))
+            text = _chunk_text(chunk)
+            if text:
+                fragments.append(text)
+                yield text
+    ANSWERS.labels(source="llm").inc()
+    
+    _store_answer(cache_slot, "".join(fragments))
+
+
+async def _stream_chain(chain, inputs: dict, config: dict) -> AsyncIterator:
+    """
+    Stream one attempt of the chain, timing it and its first fragment.
+    
+    Providers without async support yield the complete response as a single chunk.
+    
+    Args:
+        chain: Agent chain
+        inputs: Chain inputs
+        config: Chain run configuration (callbacks)
+        
+    Yields:
+        Message chunks produced by the chain
+    """
+    started = time.perf_counter()
+    if _agent_supports_async:
+        first_token = True
+        async for chunk in chain.astream(inputs, config=config):
+            if first_token and _chunk_text(chunk):
+                first_token = False
+                LLM_FIRST_TOKEN_SECONDS.labels(
+                    provider=_agent_config.provider, model=_agent_config.model
+                ).observe(time.perf_counter() - started)
+            yield chunk
+    else:
+        loop = asyncio.get_running_loop()
+        yield await loop.run_in_executor(None, partial(chain.invoke, inputs, config))
+    _llm_timer("stream").observe(time.perf_counter() - started)
 
 
 async def handle_hotel_query_simple(user_query: str) -> str:
     """
     Handle hotel queries using simple file context approach.
     
-    This is the async wrapper for the WebSocket API integration.
-    Executes the synchronous agent function in a thread pool to avoid
-    blocking the event loop.
+    This is the async entry point for the WebSocket API integration.
+    The LLM is called through the chain's async API, so the event loop
+    is never blocked and no thread is held while waiting for the answer.
     
     Args:
         user_query: User's query string
@@ -267,8 +1237,20 @@ async def handle_hotel_query_simple(user_query: str) -> str:
     Returns:
         str: Formatted response from the agent
     """
-    # Run the synchronous function in a thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(None, answer_hotel_question, user_query)
-    return response
+    with span("agent.answer"):
+        return await answer_hotel_question_async(user_query)
+
 
+def handle_hotel_query_simple_stream(user_query: str) -> AsyncIterator[str]:
+    """
+    Handle hotel queries streaming the response.
+    
+    This is the streaming entry point for the WebSocket API integration.
+    
+    Args:
+        user_query: User's query string
+        
+    Returns:
+        AsyncIterator[str]: Fragments of the formatted response
+    """
+    return stream_hotel_answer(user_query)
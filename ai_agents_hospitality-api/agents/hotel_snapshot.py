@@ -0,0 +1,302 @@
+"""
+Hotel Data Snapshots
+
+This module implements versioned, immutable snapshots of everything derived
+from the hotel data files (parsed data, pre-serialized context, hotel index
+and pricing engine) and the store that publishes them.
+
+A request acquires the current snapshot once and uses it until it is done.
+When the source files change, the next snapshot is built in a background
+thread and swapped in atomically: requests in flight finish on the version
+they started with, new requests get the new one, and nothing is rebuilt on
+the request path. The store counts the requests holding each version so
+the release of a retired version can be observed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from agents.hotel_context import HotelContext, SourceStamp, get_source_stamps
+from agents.hotel_retrieval import HotelIndex
+from agents.pricing_engine import PricingEngine
+from util.logger_config import logger
+from util.tracing import span
+
+
+@dataclass(frozen=True)
+class HotelDataSnapshot:
+    """Immutable version of the hotel data and everything derived from it."""
+
+    version: int
+    hotels_data: dict
+    hotel_details_text: str
+    context: HotelContext
+    index: HotelIndex
+    pricing_engine: PricingEngine
+    pricing_fast_path: bool
+    # Stamps of all the watched files, taken before the files were read
+    watch_stamps: Tuple[SourceStamp, ...]
+    created_at: float
+
+    @property
+    def hotel_count(self) -> int:
+        """Number of hotels in the snapshot."""
+        return len(self.hotels_data.get("Hotels", []))
+
+
+# Builds a snapshot: (version, watch stamps) -> snapshot
+SnapshotBuilder = Callable[[int, Tuple[SourceStamp, ...]], HotelDataSnapshot]
+# Called after a swap: (previous snapshot or None, new snapshot)
+SwapCallback = Callable[[Optional[HotelDataSnapshot], HotelDataSnapshot], None]
+
+
+class HotelDataStore:
+    """
+    Holder of the current hotel data snapshot.
+
+    Changes of the watched files are detected by a background watcher
+    thread, or by polling stat() at most once per check interval from the
+    request path when no watcher runs. A change is only built once the
+    stamps are the same on two consecutive checks, so a snapshot is never
+    built from a half-written set of files.
+    """
+
+    def __init__(self,
+                 builder: SnapshotBuilder,
+                 watched_files: Callable[[], Iterable[Path]],
+                 check_interval: float = 1.0,
+                 on_swap: Optional[SwapCallback] = None):
+        """
+        Initialize the store (the first snapshot is built on first access).
+
+        Args:
+            builder: Function building a snapshot from the files on disk
+            watched_files: Function returning the files whose changes trigger a rebuild
+            check_interval: Minimum seconds between checks of the files
+            on_swap: Function called after a new snapshot was swapped in
+        """
+        self._builder = builder
+        self._watched_files = watched_files
+        self.check_interval = check_interval
+        self._on_swap = on_swap
+        self._snapshot: Optional[HotelDataSnapshot] = None
+        self._refs: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._last_check = 0.0
+        self._pending_stamps: Optional[Tuple[SourceStamp, ...]] = None
+        self._failed_stamps: Optional[Tuple[SourceStamp, ...]] = None
+        self._rebuild_requested = False
+        self._build_thread: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watcher = threading.Event()
+        self.builds = 0
+        self.failed_builds = 0
+
+    def current(self) -> HotelDataSnapshot:
+        """
+        Get the current snapshot, building the first one if needed.
+
+        Without a watcher, this also checks the files for changes (at most
+        once per check interval) and starts a background rebuild; the
+        current snapshot is returned meanwhile.
+
+        Returns:
+            HotelDataSnapshot: Current snapshot
+
+        Raises:
+            FileNotFoundError: If the first snapshot cannot be built
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Concurrent first requests wait for one build
+            return self.rebuild(only_if_stale=True)
+
+        now = time.monotonic()
+        if not self.watcher_running and now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._needs_rebuild(snapshot):
+                self._rebuild_in_background()
+        return snapshot
+
+    @contextmanager
+    def acquire(self, snapshot: Optional[HotelDataSnapshot] = None) -> Iterator[HotelDataSnapshot]:
+        """
+        Hold a snapshot for the duration of a request.
+
+        Args:
+            snapshot: Snapshot to hold, e.g. by work outliving the request that
+                acquired it (defaults to the current one)
+
+        Yields:
+            HotelDataSnapshot: Snapshot to use for the whole request
+        """
+        if snapshot is None:
+            snapshot = self.current()
+        version = snapshot.version
+        with self._lock:
+            self._refs[version] = self._refs.get(version, 0) + 1
+        try:
+            yield snapshot
+        finally:
+            with self._lock:
+                remaining = self._refs[version] - 1
+                if remaining:
+                    self._refs[version] = remaining
+                else:
+                    del self._refs[version]
+                retired = self._snapshot is not snapshot
+            if retired and not remaining:
+                logger.info(f"Hotel data version {version} released by its last request")
+
+    def _needs_rebuild(self, snapshot: HotelDataSnapshot) -> bool:
+        """Check whether the watched files changed and settled since the snapshot was built."""
+        if self._rebuild_requested:
+            return True
+        stamps = get_source_stamps(self._watched_files())
+        if stamps == snapshot.watch_stamps or stamps == self._failed_stamps:
+            self._pending_stamps = None
+            return False
+        if stamps == self._pending_stamps:
+            return True
+        # Changed since the last check: wait for the writer to finish
+        self._pending_stamps = stamps
+        return False
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a snapshot was built, so `current` does not block on the first build."""
+        return self._snapshot is not None
+
+    def rebuild(self, only_if_stale: bool = False) -> HotelDataSnapshot:
+        """
+        Build a snapshot from the files on disk and swap it in.
+
+        Args:
+            only_if_stale: Keep the current snapshot if it was built from the
+                files as they are now and no rebuild was requested (checked
+                after waiting for a build already in progress)
+
+        Returns:
+            HotelDataSnapshot: The new snapshot, or the current one if it is up to date
+
+        Raises:
+            Exception: Any error raised by the builder (the current snapshot is kept)
+        """
+        with self._build_lock:
+            stamps = get_source_stamps(self._watched_files())
+            current = self._snapshot
+            if (only_if_stale and current is not None and not self._rebuild_requested
+                    and stamps == current.watch_stamps):
+                # Built by the request we were waiting for
+                self._pending_stamps = None
+                return current
+            self._rebuild_requested = False
+            self._pending_stamps = None
+            version = (self._snapshot.version if self._snapshot is not None else 0) + 1
+            started = time.perf_counter()
+            try:
+                with span("hotel_data.build", version=version):
+                    snapshot = self._builder(version, stamps)
+            except Exception:
+                self.failed_builds += 1
+                self._failed_stamps = stamps
+                raise
+            self._failed_stamps = None
+            self.builds += 1
+
+            with self._lock:
+                previous = self._snapshot
+                self._snapshot = snapshot
+                previous_refs = self._refs.get(previous.version, 0) if previous is not None else 0
+
+        logger.info(
+            f"Hotel data version {version} ready ({snapshot.hotel_count} hotels, "
+            f"built in {time.perf_counter() - started:.2f}s)"
+            + (f"; version {previous.version} still used by {previous_refs} requests" if previous_refs else "")
+        )
+        if self._on_swap is not None:
+            try:
+                self._on_swap(previous, snapshot)
+            except Exception as e:
+                logger.error(f"Error after swapping hotel data version {version}: {e}", exc_info=True)
+        return snapshot
+
+    def _rebuild_quietly(self) -> None:
+        """Rebuild, keeping the current snapshot if the files cannot be loaded."""
+        try:
+            self.rebuild(only_if_stale=True)
+        except Exception as e:
+            logger.warning(f"Could not rebuild hotel data, keeping version "
+                           f"{self._snapshot.version if self._snapshot else None}: {e}")
+
+    def _rebuild_in_background(self) -> None:
+        """Start a background rebuild unless one is already running."""
+        with self._lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return
+            self._build_thread = threading.Thread(
+                target=self._rebuild_quietly, name="hotel-data-rebuild", daemon=True
+            )
+            self._build_thread.start()
+
+    def request_rebuild(self) -> None:
+        """Rebuild the snapshot in the background even if the files did not change."""
+        self._rebuild_requested = True
+        self._failed_stamps = None
+        if self._snapshot is not None:
+            self._rebuild_in_background()
+
+    @property
+    def watcher_running(self) -> bool:
+        """Whether the background watcher thread is running."""
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def start_watcher(self, interval: Optional[float] = None) -> None:
+        """
+        Start a daemon thread checking the watched files for changes.
+
+        Args:
+            interval: Seconds between checks (defaults to the check interval)
+        """
+        if self.watcher_running:
+            return
+        interval = interval or self.check_interval
+        self._stop_watcher.clear()
+
+        def watch():
+            while not self._stop_watcher.wait(interval):
+                snapshot = self._snapshot
+                if snapshot is None or self._needs_rebuild(snapshot):
+                    self._rebuild_quietly()
+
+        self._watcher = threading.Thread(target=watch, name="hotel-data-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching hotel data files for changes every {interval}s")
+
+    def stop_watcher(self) -> None:
+        """Stop the background watcher thread."""
+        if self._watcher is None:
+            return
+        self._stop_watcher.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def stats(self) -> dict:
+        """
+        Get the store counters.
+
+        Returns:
+            dict: current version, requests in flight per version, builds and failed builds
+        """
+        with self._lock:
+            return {
+                "version": self._snapshot.version if self._snapshot is not None else None,
+                "in_flight": dict(self._refs),
+                "builds": self.builds,
+                "failed_builds": self.failed_builds,
+            }
@@ -0,0 +1,334 @@
+"""
+LLM Record / Replay Cassette
+
+This module implements a record / replay layer around the chat model of the
+agent chain, configured in the `cassette` section of agent_config.yaml.
+
+- record: calls go to the provider; the response, its timing (time to first
+  token and total latency) and its token usage are stored under a hash of
+  the rendered prompt.
+- replay: responses are served from the store, instantly or with the
+  recorded timing, so benchmarks of the agent path are reproducible and
+  independent of the provider.
+
+The store is a gzip-compressed JSON lines file, appended to while recording
+(the last recording of a prompt wins).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+try:
+    # Try new LangChain structure (v0.2+)
+    from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+except ImportError:
+    # Fallback to old structure (v0.1)
+    from langchain.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+    from langchain.chat_models.base import BaseChatModel
+    from langchain.schema import AIMessage, AIMessageChunk, BaseMessage
+    from langchain.schema.output import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from util.configuration import PROJECT_ROOT
+from util.logger_config import logger
+from util.metrics import counter
+
+CASSETTE_MODES = ("off", "record", "replay")
+REPLAY_TIMINGS = ("instant", "recorded")
+DEFAULT_CASSETTE_PATH = "cache/llm_cassette.jsonl.gz"
+
+CASSETTE_CALLS = counter(
+    "hospitality_llm_cassette_calls_total", "LLM calls seen by the cassette (recorded, hit, miss)", ["result"]
+)
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a prompt that was never recorded."""
+
+
+@dataclass(frozen=True)
+class Recording:
+    """Response recorded for one prompt."""
+
+    content: str
+    # Seconds to the first token (same as latency for non-streamed calls)
+    ttft: float
+    # Seconds to the complete response
+    latency: float
+    usage_metadata: Optional[dict] = None
+
+    def to_json(self, key: str) -> str:
+        return json.dumps(
+            {"k": key, "c": self.content, "t": round(self.ttft, 4), "l": round(self.latency, 4),
+             "u": self.usage_metadata},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, record: dict) -> "Recording":
+        return cls(content=record["c"], ttft=record["t"], latency=record["l"], usage_metadata=record.get("u"))
+
+
+class Cassette:
+    """On-disk store of recordings keyed by prompt hash."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the cassette, loading the recordings already on disk.
+
+        Args:
+            path: gzip-compressed JSON lines file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, Recording] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._recordings[record["k"]] = Recording.from_json(record)
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            # A truncated last line (interrupted recording) keeps what was read
+            logger.warning(f"Could not read the whole LLM cassette {self.path}: {e}")
+        logger.info(f"Loaded {len(self._recordings)} LLM recordings from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def get(self, key: str) -> Optional[Recording]:
+        """Get the recording of a prompt, if any."""
+        return self._recordings.get(key)
+
+    def put(self, key: str, recording: Recording) -> None:
+        """
+        Store a recording and append it to the file.
+
+        Args:
+            key: Prompt hash
+            recording: Recorded response
+        """
+        with self._lock:
+            self._recordings[key] = recording
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Every append adds a gzip member; readers decompress them as one stream
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(recording.to_json(key) + "\n")
+
+
+def prompt_key(model: str, messages: List[BaseMessage]) -> str:
+    """
+    Hash a rendered prompt.
+
+    Args:
+        model: Provider and model the prompt is sent to
+        messages: Rendered prompt messages
+
+    Returns:
+        str: Hex digest identifying the prompt
+    """
+    payload = json.dumps(
+        [model, [(message.type, message.content) for message in messages]],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _split_tokens(content: str) -> List[str]:
+    """Split a replayed response into word fragments for streaming."""
+    words = content.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model recording the responses of another model, or replaying them."""
+
+    inner: BaseChatModel
+    cassette: Any
+    mode: str = "replay"
+    replay_timing: str = "instant"
+    # Provider and model, part of the prompt key
+    model_key: str = ""
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.inner._llm_type}"
+
+    def _recording(self, messages: List[BaseMessage]) -> Recording:
+        """Look up a prompt in replay mode."""
+        recording = self.cassette.get(prompt_key(self.model_key, messages))
+        if recording is None:
+            CASSETTE_CALLS.labels(result="miss").inc()
+            raise CassetteMissError(
+                f"No recorded LLM response for this prompt in {self.cassette.path}. "
+                "Record it first with cassette mode 'record'."
+            )
+        CASSETTE_CALLS.labels(result="hit").inc()
+        return recording
+
+    def _record(self, messages: List[BaseMessage], content: str, ttft: float, latency: float,
+                usage_metadata: Optional[dict]) -> None:
+        self.cassette.put(prompt_key(self.model_key, messages),
+                          Recording(content, ttft, latency, usage_metadata))
+        CASSETTE_CALLS.labels(result="recorded").inc()
+
+    @staticmethod
+    def _result(content: str, usage_metadata: Optional[dict]) -> ChatResult:
+        message = AIMessage(content=content, usage_metadata=usage_metadata)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _replay_delays(self, recording: Recording) -> List[float]:
+        """Seconds after the start of the call at which each replayed fragment is due."""
+        tokens = _split_tokens(recording.content)
+        if self.replay_timing != "recorded":
+            return [0.0] * len(tokens)
+        if len(tokens) == 1:
+            return [recording.latency]
+        step = (recording.latency - recording.ttft) / (len(tokens) - 1)
+        return [recording.ttft + index * step for index in range(len(tokens))]
+
+    def _replay_chunks(self, recording: Recording) -> List[ChatGenerationChunk]:
+        tokens = _split_tokens(recording.content)
+        return [
+            ChatGenerationChunk(message=AIMessageChunk(
+                content=token,
+                usage_metadata=recording.usage_metadata if index == len(tokens) - 1 else None,
+            ))
+            for index, token in enumerate(tokens)
+        ]
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if self.mode == "replay":
+            recording = self._recording(messages)
+            if self.replay_timing == "recorded":
+                time.sleep(recording.latency)
+            return self._result(recording.content, recording.usage_metadata)
+
+        started = time.perf_counter()
+        response = self.inner.invoke(messages, stop=stop, **kwargs)
+        latency = time.perf_counter() - started
+        usage_metadata = getattr(response, "usage_metadata", None)
+        self._record(messages, response.content, latency, latency, usage_metadata)
+        return self._result(response.content, usage_metadata)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        if self.mode == "replay":
+            recording = self._recording(messages)
+            if self.replay_timing == "recorded":
+                await asyncio.sleep(recording.latency)
+            return self._result(recording.content, recording.usage_metadata)
+
+        started = time.perf_counter()
+        response = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+        latency = time.perf_counter() - started
+        usage_metadata = getattr(response, "usage_metadata", None)
+        self._record(messages, response.content, latency, latency, usage_metadata)
+        return self._result(response.content, usage_metadata)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            recording = self._recording(messages)
+            started = time.perf_counter()
+            for due, chunk in zip(self._replay_delays(recording), self._replay_chunks(recording)):
+                time.sleep(max(0.0, due - (time.perf_counter() - started)))
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            return
+
+        started = time.perf_counter()
+        ttft, fragments, usage_metadata = None, [], None
+        for message_chunk in self.inner.stream(messages, stop=stop, **kwargs):
+            if ttft is None and message_chunk.content:
+                ttft = time.perf_counter() - started
+            fragments.append(message_chunk.content if isinstance(message_chunk.content, str) else "")
+            usage_metadata = getattr(message_chunk, "usage_metadata", None) or usage_metadata
+            chunk = ChatGenerationChunk(message=message_chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        latency = time.perf_counter() - started
+        self._record(messages, "".join(fragments), ttft if ttft is not None else latency, latency, usage_metadata)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            recording = self._recording(messages)
+            started = time.perf_counter()
+            for due, chunk in zip(self._replay_delays(recording), self._replay_chunks(recording)):
+                await asyncio.sleep(max(0.0, due - (time.perf_counter() - started)))
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            return
+
+        started = time.perf_counter()
+        ttft, fragments, usage_metadata = None, [], None
+        async for message_chunk in self.inner.astream(messages, stop=stop, **kwargs):
+            if ttft is None and message_chunk.content:
+                ttft = time.perf_counter() - started
+            fragments.append(message_chunk.content if isinstance(message_chunk.content, str) else "")
+            usage_metadata = getattr(message_chunk, "usage_metadata", None) or usage_metadata
+            chunk = ChatGenerationChunk(message=message_chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        latency = time.perf_counter() - started
+        self._record(messages, "".join(fragments), ttft if ttft is not None else latency, latency, usage_metadata)
+
+
+def wrap_with_cassette(llm: BaseChatModel, model_key: str, cassette_config: Optional[dict]) -> BaseChatModel:
+    """
+    Wrap a chat model according to the `cassette` section of agent_config.yaml.
+
+    Args:
+        llm: Chat model calling the provider
+        model_key: Provider and model, part of the prompt key
+        cassette_config: `cassette` section of the configuration file
+
+    Returns:
+        BaseChatModel: The model itself when the cassette is off, else the recording / replaying wrapper
+
+    Raises:
+        ValueError: If the mode or the replay timing is invalid
+    """
+    cassette_config = cassette_config or {}
+    mode = str(cassette_config.get("mode", "off")).lower()
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Invalid cassette mode: {mode}. Must be one of {', '.join(CASSETTE_MODES)}")
+    if mode == "off":
+        return llm
+
+    replay_timing = str(cassette_config.get("replay_timing", "instant")).lower()
+    if replay_timing not in REPLAY_TIMINGS:
+        raise ValueError(f"Invalid cassette replay_timing: {replay_timing}. "
+                         f"Must be one of {', '.join(REPLAY_TIMINGS)}")
+
+    path = Path(cassette_config.get("path") or DEFAULT_CASSETTE_PATH)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    cassette = Cassette(path)
+    logger.info(f"LLM cassette in {mode} mode ({len(cassette)} recordings in {path}"
+                + (f", {replay_timing} timing)" if mode == "replay" else ")"))
+    return CassetteChatModel(inner=llm, cassette=cassette, mode=mode,
+                             replay_timing=replay_timing, model_key=model_key)
@@ -0,0 +1,463 @@
+"""
+LLM Resilience
+
+This module protects the agent from a slow or failing LLM provider,
+configured in the `resilience` section of agent_config.yaml:
+
+- every call has a deadline;
+- transient failures (timeouts, connection errors, rate limiting, 5xx) are
+  retried a bounded number of times with jittered exponential backoff;
+- a circuit breaker opens after consecutive failures and fails calls fast
+  (`CircuitOpenError`) until a probe call succeeds again, so requests fall
+  back to cached or hardcoded answers instead of piling up behind the
+  provider.
+
+Calls that cannot be answered raise `LLMUnavailableError`; streams failing
+after part of the answer was produced raise its `LLMStreamInterruptedError`
+subclass, so callers know the partial answer cannot be replaced.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from util.logger_config import logger
+from util.metrics import counter
+
+T = TypeVar("T")
+
+LLM_RETRIES = counter("hospitality_llm_retries_total", "LLM calls retried after a transient failure")
+LLM_FAILURES = counter(
+    "hospitality_llm_failures_total", "Failed LLM call attempts (timeout, transient or other)", ["kind"]
+)
+LLM_CIRCUIT_REJECTIONS = counter(
+    "hospitality_llm_circuit_rejections_total", "LLM calls failed fast while the circuit breaker was open"
+)
+
+# HTTP status codes worth retrying
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+# Exception class names of the provider SDKs for transient failures
+TRANSIENT_ERROR_NAMES = frozenset({
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+    "ServiceUnavailable", "ResourceExhausted", "DeadlineExceeded", "TooManyRequests",
+    "GatewayTimeout", "StubProviderError",
+})
+
+
+class LLMUnavailableError(RuntimeError):
+    """The LLM cannot answer now (circuit open, or transient failures persisted)."""
+
+
+class LLMStreamInterruptedError(LLMUnavailableError):
+    """A stream failed transiently after part of the answer was produced (not retried)."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised without calling the LLM while the circuit breaker is open."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check whether a failed LLM call is worth retrying.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        bool: True for timeouts, connection errors, rate limiting and server errors
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status_code, int) and status_code in TRANSIENT_STATUS_CODES:
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """Deadline, retry and circuit breaker settings."""
+
+    # Deadline of one LLM call attempt in seconds (0 = none)
+    timeout_seconds: float = 60.0
+    # Retries after a transient failure
+    max_retries: int = 2
+    # Backoff before retry n: random between 0 and min(max, base * 2^n)
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 8.0
+    # Consecutive failures opening the circuit
+    failure_threshold: int = 5
+    # Seconds the circuit stays open before a probe call is let through
+    reset_timeout_seconds: float = 30.0
+
+    def __post_init__(self):
+        """Validate the settings."""
+        if self.timeout_seconds < 0 or self.backoff_base_seconds < 0 or self.backoff_max_seconds < 0:
+            raise ValueError("Resilience timeouts and backoffs must not be negative")
+        if self.max_retries < 0:
+            raise ValueError(f"max_retries must not be negative, got {self.max_retries}")
+        if self.failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be at least 1, got {self.failure_threshold}")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "ResiliencePolicy":
+        """
+        Build the policy from the `resilience` section of agent_config.yaml.
+
+        Args:
+            config: `resilience` section (None for the defaults)
+
+        Returns:
+            ResiliencePolicy: Parsed policy
+        """
+        config = config or {}
+        defaults = cls()
+        return cls(
+            timeout_seconds=float(config.get("timeout_seconds", defaults.timeout_seconds)),
+            max_retries=int(config.get("max_retries", defaults.max_retries)),
+            backoff_base_seconds=float(config.get("backoff_base_seconds", defaults.backoff_base_seconds)),
+            backoff_max_seconds=float(config.get("backoff_max_seconds", defaults.backoff_max_seconds)),
+            failure_threshold=int(config.get("failure_threshold", defaults.failure_threshold)),
+            reset_timeout_seconds=float(config.get("reset_timeout_seconds", defaults.reset_timeout_seconds)),
+        )
+
+    def backoff(self, retry: int, rng: random.Random) -> float:
+        """
+        Seconds to wait before a retry ("full jitter" exponential backoff).
+
+        Args:
+            retry: Number of the retry, starting at 0
+            rng: Random generator
+
+        Returns:
+            float: Delay in seconds
+        """
+        return rng.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** retry))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls go through; `failure_threshold` consecutive failures open
+    the circuit. open: calls are rejected until `reset_timeout` elapsed.
+    half-open: a single probe call goes through; its success closes the
+    circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    # Numeric state exported as a metric
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_threshold: int, reset_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures opening the circuit
+            reset_timeout: Seconds before an open circuit lets a probe call through
+            clock: Monotonic clock
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (an open circuit reports half-open once a probe is allowed)."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go through, reserving the probe when half-open.
+
+        Returns:
+            bool: False if the call must fail fast
+        """
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy provider."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("LLM circuit breaker closed: the provider answered again")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Let another probe through after a probe call was abandoned (cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+                self.opened += 1
+                logger.warning(f"LLM circuit breaker opened after {self._failures} consecutive failures; "
+                               f"failing fast for {self.reset_timeout}s")
+
+    def stats(self) -> dict:
+        """
+        Get the breaker counters.
+
+        Returns:
+            dict: state, consecutive failures, times opened and calls rejected
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+# Context manager factory run around every attempt (e.g. a concurrency slot)
+SlotFactory = Callable[[], AsyncContextManager]
+
+
+@asynccontextmanager
+async def _no_slot():
+    yield
+
+
+class LLMGuard:
+    """Applies a resilience policy to LLM calls."""
+
+    def __init__(self, policy: ResiliencePolicy, rng: Optional[random.Random] = None):
+        """
+        Initialize the guard and its circuit breaker.
+
+        Args:
+            policy: Deadline, retry and circuit breaker settings
+            rng: Random generator of the backoff jitter
+        """
+        self.policy = policy
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout_seconds)
+        self._rng = rng or random.Random()
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            LLM_CIRCUIT_REJECTIONS.inc()
+            raise CircuitOpenError("The LLM provider is unavailable (circuit breaker open)")
+
+    def _failed(self, error: Exception, retry: int, started: bool = False) -> Optional[float]:
+        """
+        Record a failed attempt.
+
+        Returns:
+            Optional[float]: Backoff before the next attempt, or None to give up
+        """
+        if not is_transient(error):
+            # The provider answered: it is reachable, the request itself is wrong
+            LLM_FAILURES.labels(kind="other").inc()
+            self.breaker.record_success()
+            return None
+        LLM_FAILURES.labels(kind="timeout" if isinstance(error, TimeoutError) else "transient").inc()
+        self.breaker.record_failure()
+        if started or retry >= self.policy.max_retries:
+            return None
+        delay = self.policy.backoff(retry, self._rng)
+        logger.warning(f"LLM call failed ({type(error).__name__}: {error}); "
+                       f"retry {retry + 1}/{self.policy.max_retries} in {delay:.2f}s")
+        LLM_RETRIES.inc()
+        return delay
+
+    @staticmethod
+    def _give_up(error: Exception, started: bool = False):
+        """
+        Raise the error ending the call.
+
+        Transient failures raise LLMUnavailableError, or LLMStreamInterruptedError
+        once a stream produced items; other errors are raised as they are.
+        """
+        if not is_transient(error):
+            raise error
+        detail = str(error) or "no response before the deadline"
+        if started:
+            raise LLMStreamInterruptedError(
+                f"The LLM stream was interrupted ({type(error).__name__}: {detail})"
+            ) from error
+        raise LLMUnavailableError(f"The LLM provider is unavailable ({type(error).__name__}: {detail})") from error
+
+    @property
+    def _timeout(self) -> Optional[float]:
+        return self.policy.timeout_seconds or None
+
+    async def call(self, function: Callable[[], Awaitable[T]], slot: SlotFactory = _no_slot) -> T:
+        """
+        Call the LLM with a deadline, retries and the circuit breaker.
+
+        Args:
+            function: Coroutine function making one attempt
+            slot: Async context manager factory held during each attempt
+                (the deadline starts once it is entered)
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            LLMUnavailableError: If the transient failures persisted
+            Exception: Non-transient errors of the call
+        """
+        retry = 0
+        while True:
+            self._admit()
+            try:
+                async with slot():
+                    async with asyncio.timeout(self._timeout):
+                        result = await function()
+            except Exception as e:
+                delay = self._failed(e, retry)
+                if delay is None:
+                    self._give_up(e)
+                retry += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def stream(self, function: Callable[[], AsyncIterator[T]],
+                     slot: SlotFactory = _no_slot) -> AsyncIterator[T]:
+        """
+        Streaming version of `call`.
+
+        The deadline covers the whole stream. An attempt is only retried
+        while it produced nothing: once items were yielded, a transient
+        failure raises LLMStreamInterruptedError.
+
+        Args:
+            function: Function starting one streaming attempt
+            slot: Async context manager factory held during each attempt
+
+        Yields:
+            The items of the first attempt that did not fail before producing any
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            LLMUnavailableError: If the transient failures persisted before any item
+            LLMStreamInterruptedError: If a transient failure happened after the first item
+            Exception: Non-transient errors of the stream
+        """
+        retry = 0
+        while True:
+            self._admit()
+            started = False
+            try:
+                async with slot():
+                    deadline = None if self._timeout is None else asyncio.get_running_loop().time() + self._timeout
+                    iterator = function().__aiter__()
+                    try:
+                        while True:
+                            async with asyncio.timeout_at(deadline):
+                                try:
+                                    item = await iterator.__anext__()
+                                except StopAsyncIteration:
+                                    break
+                            started = True
+                            yield item
+                    finally:
+                        await _close_quietly(iterator)
+            except Exception as e:
+                delay = self._failed(e, retry, started)
+                if delay is None:
+                    self._give_up(e, started)
+                retry += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled, or closed by the consumer
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return
+
+    def call_sync(self, function: Callable[[], T]) -> T:
+        """
+        Blocking version of `call`, for calls made in threads.
+
+        The deadline cannot be enforced on a blocking call: it relies on the
+        timeout of the provider client (see `_create_agent_chain`).
+
+        Args:
+            function: Function making one attempt
+
+        Returns:
+            The result of the first successful attempt
+        """
+        retry = 0
+        while True:
+            self._admit()
+            try:
+                result = function()
+            except Exception as e:
+                delay = self._failed(e, retry)
+                if delay is None:
+                    self._give_up(e)
+                retry += 1
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        """
+        Get the circuit breaker counters.
+
+        Returns:
+            dict: state, consecutive failures, times opened and calls rejected
+        """
+        return self.breaker.stats()
+
+
+async def _close_quietly(iterator) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:
+        pass
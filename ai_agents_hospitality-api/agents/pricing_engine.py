@@ -0,0 +1,407 @@
+"""
+Pricing Engine Module
+
+This module computes exact booking prices from the hotel data, following the
+same rules the synthetic booking generator uses (`compute_total_prices` in
+bookings-db/src/generator/booking_engine.py). The API image does not ship the
+generator, so the rules are mirrored here over the hotel arrays, and
+test_pricing_engine.py checks both give the same totals:
+
+- Room base price: `PriceOffSeason` / `PricePeakSeason` per night, depending
+  on whether the month of the night is a peak season month
+- Occupancy discount (`OccupancyBaseDiscountPercentage`) when there are fewer
+  guests than the room capacity
+- Extra bed charge (`ExtraBedChargePercentage`) when there is one guest more
+  than the room capacity
+- Meal plan multiplier (`MealPlanPrices`)
+- Promotion discount (`PromotionPriceDiscount`) on the total
+
+Prices are computed with NumPy over arrays of quote requests, so many hotels,
+rooms and dates can be quoted in a single batch. The module also provides the
+parser used by the agent to answer fully specified price questions without
+calling the LLM.
+"""
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.hotel_retrieval import HotelIndex, normalize_text
+
+# Peak season months used by the synthetic data generator
+DEFAULT_PEAK_SEASON_MONTHS = (
+    "January", "April", "May", "June", "July", "August", "September", "December"
+)
+
+ROOM_CAPACITY = {"Single": 1, "Double": 2, "Triple": 3}
+
+# Surface forms of the meal plans, checked in order (most specific first)
+MEAL_PLAN_TERMS = (
+    ("Room Only", ("room only", "no meal plan", "without meal plan", "without meals", "no meals")),
+    ("All Inclusive", ("all inclusive",)),
+    ("Half Board", ("half board",)),
+    ("Full Board", ("full board",)),
+    ("Room and Breakfast", ("room and breakfast", "bed and breakfast", "breakfast")),
+)
+
+# "rate" and "total" alone also appear in other questions ("occupancy rate",
+# "total rooms"), so they only count as part of a price phrase
+PRICE_TERMS = ("price", "prices", "cost", "costs", "how much", "quote",
+               "room rate", "nightly rate", "rate per night")
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+_MONTH_PATTERN = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_DATE_PATTERNS = (
+    re.compile(rf"\b({_MONTH_PATTERN}) (\d{{1,2}})(?:st|nd|rd|th)?(?: (\d{{4}}))?\b"),
+    re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)? (?:of )?({_MONTH_PATTERN})(?: (\d{{4}}))?\b"),
+)
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_NIGHTS = re.compile(r"\b(\d{1,2}) nights?\b")
+_GUESTS = re.compile(r"\b(\d{1,2}) (?:guests?|people|persons?|adults?|pax)\b")
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """Exact price of a stay with its breakdown."""
+
+    hotel: str
+    room_type: str
+    room_category: str
+    check_in: date
+    check_out: date
+    guests: int
+    meal_plan: str
+    extra_bed: bool
+    promotion: bool
+    nightly_price_off_season: float
+    nightly_price_peak_season: float
+    nights: int
+    peak_nights: int
+    total_price: float
+
+
+class PricingEngine:
+    """
+    Vectorized price calculator over the rooms of all hotels.
+
+    Rooms sharing hotel, type and category are collapsed into a single
+    product (they share the same prices), and every product parameter is
+    kept in a NumPy array indexed by product.
+    """
+
+    def __init__(self, hotels_data: dict,
+                 peak_season_months: Sequence[str] = DEFAULT_PEAK_SEASON_MONTHS):
+        """
+        Build the pricing arrays from the loaded hotel data.
+
+        Args:
+            hotels_data: Parsed content of hotels.json
+            peak_season_months: Names of the peak season months
+        """
+        self.peak_months = np.zeros(12, dtype=bool)
+        for month in peak_season_months:
+            self.peak_months[_MONTHS[month.lower()] - 1] = True
+
+        hotels = [hotel for hotel in hotels_data.get("Hotels", []) if hotel.get("Name")]
+        self.hotel_names: List[str] = [hotel["Name"] for hotel in hotels]
+        self.meal_plans: List[str] = sorted({
+            meal_plan
+            for hotel in hotels
+            for meal_plan in hotel.get("SyntheticParams", {}).get("MealPlanPrices", {})
+        })
+        self._meal_plan_codes = {name: code for code, name in enumerate(self.meal_plans)}
+
+        # Hotel level parameters
+        self.occupancy_discount = np.empty(len(hotels))
+        self.extra_bed_charge = np.empty(len(hotels))
+        self.promotion_discount = np.empty(len(hotels))
+        self.meal_plan_multiplier = np.full((len(hotels), len(self.meal_plans)), np.nan)
+        for hotel_code, hotel in enumerate(hotels):
+            params = hotel.get("SyntheticParams", {})
+            self.occupancy_discount[hotel_code] = params.get("OccupancyBaseDiscountPercentage", 0)
+            self.extra_bed_charge[hotel_code] = params.get("ExtraBedChargePercentage", 0)
+            self.promotion_discount[hotel_code] = params.get("PromotionPriceDiscount", 0)
+            for meal_plan, multiplier in params.get("MealPlanPrices", {}).items():
+                self.meal_plan_multiplier[hotel_code, self._meal_plan_codes[meal_plan]] = multiplier
+
+        # Product level parameters (hotel x room type x category)
+        products: Dict[Tuple[str, str, str], Tuple[int, float, float]] = {}
+        for hotel_code, hotel in enumerate(hotels):
+            for room in hotel.get("Rooms", []):
+                key = (hotel["Name"], room.get("Type"), room.get("Category"))
+                if key not in products:
+                    products[key] = (hotel_code, room["PriceOffSeason"], room["PricePeakSeason"])
+        self._product_codes = {key: code for code, key in enumerate(products)}
+        self.product_keys: List[Tuple[str, str, str]] = list(products)
+        self.product_hotel = np.array([value[0] for value in products.values()], dtype=np.int64)
+        self.product_capacity = np.array(
+            [ROOM_CAPACITY.get(room_type, 0) for _, room_type, _ in products], dtype=np.int64
+        )
+        self.product_price_off = np.array([value[1] for value in products.values()], dtype=float)
+        self.product_price_peak = np.array([value[2] for value in products.values()], dtype=float)
+
+    def find_product(self, hotel: str, room_type: str, room_category: str) -> Optional[int]:
+        """
+        Get the product code of a hotel room type and category.
+
+        Returns:
+            Optional[int]: Product code, or None if the hotel has no such rooms
+        """
+        return self._product_codes.get((hotel, room_type, room_category))
+
+    def meal_plan_code(self, meal_plan: str) -> Optional[int]:
+        """Get the code of a meal plan name, or None if unknown."""
+        return self._meal_plan_codes.get(meal_plan)
+
+    def _peak_nights(self, check_in: np.ndarray, check_out: np.ndarray) -> np.ndarray:
+        """
+        Count the nights of each stay that fall in a peak season month.
+
+        Builds the cumulative number of peak days over the date range of the
+        batch once, so each stay is resolved with two lookups.
+        """
+        first_day = check_in.min()
+        days = np.arange(first_day, check_out.max() + np.timedelta64(1, "D"))
+        month_index = days.astype("datetime64[M]").astype(np.int64) % 12
+        cumulative_peak = np.concatenate(([0], np.cumsum(self.peak_months[month_index])))
+        start = (check_in - first_day).astype(np.int64)
+        end = (check_out - first_day).astype(np.int64)
+        return cumulative_peak[end] - cumulative_peak[start]
+
+    def quote_batch(self,
+                    products: Sequence[int],
+                    check_in: Sequence,
+                    check_out: Sequence,
+                    guests: Sequence[int],
+                    meal_plans: Sequence[int],
+                    promotion: Optional[Sequence[bool]] = None) -> Dict[str, np.ndarray]:
+        """
+        Quote many stays at once.
+
+        All arguments are sequences of the same length, one element per stay.
+
+        Args:
+            products: Product codes from `find_product`
+            check_in: Check-in dates (anything convertible to datetime64[D])
+            check_out: Check-out dates (exclusive, as in the booking data)
+            guests: Number of guests, including the extra bed guest if any
+            meal_plans: Meal plan codes from `meal_plan_code`
+            promotion: Whether the promotion discount applies (default: no)
+
+        Returns:
+            dict: Arrays `total_price`, `nightly_price_off_season`,
+                `nightly_price_peak_season`, `nights`, `peak_nights` and
+                `extra_bed` (NaN prices for unknown meal plans)
+        """
+        products = np.asarray(products, dtype=np.int64)
+        check_in = np.asarray(check_in, dtype="datetime64[D]")
+        check_out = np.asarray(check_out, dtype="datetime64[D]")
+        guests = np.asarray(guests, dtype=np.int64)
+        meal_plans = np.asarray(meal_plans, dtype=np.int64)
+        promotion = (np.zeros(len(products), dtype=bool) if promotion is None
+                     else np.asarray(promotion, dtype=bool))
+
+        hotel = self.product_hotel[products]
+        capacity = self.product_capacity[products]
+        extra_bed = guests > capacity
+
+        factor = self.meal_plan_multiplier[hotel, meal_plans]
+        factor = np.where(guests < capacity, factor * (1 - self.occupancy_discount[hotel] / 100), factor)
+        factor = np.where(extra_bed, factor * (1 + self.extra_bed_charge[hotel] / 100), factor)
+        price_off = self.product_price_off[products] * factor
+        price_peak = self.product_price_peak[products] * factor
+
+        nights = np.maximum((check_out - check_in).astype(np.int64), 0)
+        peak_nights = self._peak_nights(check_in, np.maximum(check_out, check_in))
+        total = price_off * (nights - peak_nights) + price_peak * peak_nights
+        total = np.where(promotion, total * (1 - self.promotion_discount[hotel] / 100), total)
+
+        return {
+            "total_price": np.round(total, 2),
+            "nightly_price_off_season": np.round(price_off, 2),
+            "nightly_price_peak_season": np.round(price_peak, 2),
+            "nights": nights,
+            "peak_nights": peak_nights,
+            "extra_bed": extra_bed,
+        }
+
+    def quote(self, hotel: str, room_type: str, room_category: str,
+              check_in: date, check_out: date,
+              guests: Optional[int] = None,
+              meal_plan: str = "Room Only",
+              promotion: bool = False) -> PriceQuote:
+        """
+        Quote a single stay.
+
+        Args:
+            hotel: Hotel name
+            room_type: Room type ("Single", "Double" or "Triple")
+            room_category: Room category ("Standard" or "Premium")
+            check_in: Check-in date
+            check_out: Check-out date (exclusive)
+            guests: Number of guests (default: room capacity)
+            meal_plan: Meal plan name
+            promotion: Whether the promotion discount applies
+
+        Returns:
+            PriceQuote: Price with its breakdown
+
+        Raises:
+            ValueError: If the room, meal plan or number of guests is not available
+        """
+        product = self.find_product(hotel, room_type, room_category)
+        if product is None:
+            raise ValueError(f"{hotel} has no {room_category} {room_type} rooms")
+        meal_plan_code = self.meal_plan_code(meal_plan)
+        if meal_plan_code is None or np.isnan(self.meal_plan_multiplier[self.product_hotel[product], meal_plan_code]):
+            raise ValueError(f"Meal plan '{meal_plan}' is not available at {hotel}")
+        capacity = int(self.product_capacity[product])
+        guests = capacity if guests is None else guests
+        max_guests = capacity if room_type == "Single" else capacity + 1
+        if guests < 1 or guests > max_guests:
+            raise ValueError(f"A {room_type} room at {hotel} takes 1 to {max_guests} guests, got {guests}")
+
+        result = self.quote_batch([product], [check_in], [check_out], [guests],
+                                  [meal_plan_code], [promotion])
+        return PriceQuote(
+            hotel=hotel,
+            room_type=room_type,
+            room_category=room_category,
+            check_in=check_in,
+            check_out=check_out,
+            guests=guests,
+            meal_plan=meal_plan,
+            extra_bed=bool(result["extra_bed"][0]),
+            promotion=promotion,
+            nightly_price_off_season=float(result["nightly_price_off_season"][0]),
+            nightly_price_peak_season=float(result["nightly_price_peak_season"][0]),
+            nights=int(result["nights"][0]),
+            peak_nights=int(result["peak_nights"][0]),
+            total_price=float(result["total_price"][0])
+        )
+
+
+def _next_occurrence(month: int, day: int, today: date) -> Optional[date]:
+    """Get the next date (today included) with the given month and day."""
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= today:
+            return candidate
+    return None
+
+
+def _parse_dates(normalized: str, text: str, today: date) -> List[date]:
+    """Extract the dates mentioned in a question, in order of appearance."""
+    found = []
+    for match in _ISO_DATE.finditer(text):
+        try:
+            found.append((match.start(), date(*map(int, match.groups()))))
+        except ValueError:
+            continue
+    for pattern in _DATE_PATTERNS:
+        for match in pattern.finditer(normalized):
+            groups = match.groups()
+            month_name, day = (groups[0], groups[1]) if groups[0].isalpha() else (groups[1], groups[0])
+            month, day = _MONTHS[month_name], int(day)
+            if groups[2]:
+                try:
+                    found.append((match.start(), date(int(groups[2]), month, day)))
+                except ValueError:
+                    continue
+            else:
+                occurrence = _next_occurrence(month, day, today)
+                if occurrence is not None:
+                    found.append((match.start(), occurrence))
+    return [found_date for _, found_date in sorted(found)]
+
+
+def answer_price_question(question: str, index: HotelIndex, engine: PricingEngine,
+                          today: Optional[date] = None) -> Optional[str]:
+    """
+    Answer a fully specified price question deterministically.
+
+    The question must ask for a price (a price word, not just "rate" or
+    "total") of a recognised stay: exactly one hotel, one room type, one
+    room category, a check-in date and a meal plan. The stay defaults to one
+    night and to the room capacity in guests.
+
+    Args:
+        question: User's question
+        index: Hotel index used to resolve the hotel, room type and category
+        engine: Pricing engine for the same version of the hotel data
+        today: Reference date to resolve dates without a year (default: today)
+
+    Returns:
+        Optional[str]: Markdown answer, or None if the question is not a fully
+            specified price question and must go to the LLM
+    """
+    normalized = normalize_text(question)
+    if not any(f" {term} " in normalized for term in PRICE_TERMS):
+        return None
+
+    match = index.match(question)
+    if match.ambiguous or len(match.hotels) != 1 or len(match.room_types) != 1 \
+            or len(match.room_categories) != 1:
+        return None
+
+    meal_plan = next((name for name, terms in MEAL_PLAN_TERMS
+                      if any(f" {term} " in normalized for term in terms)), None)
+    if meal_plan is None:
+        return None
+
+    dates = _parse_dates(normalized, question, today or date.today())
+    if not dates:
+        return None
+    check_in = dates[0]
+    if len(dates) > 1 and dates[1] > check_in:
+        check_out = dates[1]
+    else:
+        nights = _NIGHTS.search(normalized)
+        check_out = check_in + timedelta(days=int(nights.group(1)) if nights else 1)
+
+    guests = _GUESTS.search(normalized)
+    try:
+        quote = engine.quote(
+            match.hotels[0], next(iter(match.room_types)), next(iter(match.room_categories)),
+            check_in, check_out,
+            guests=int(guests.group(1)) if guests else None,
+            meal_plan=meal_plan
+        )
+    except ValueError:
+        return None
+    return format_quote(quote)
+
+
+def format_quote(quote: PriceQuote) -> str:
+    """
+    Format a price quote as a markdown answer.
+
+    Args:
+        quote: Price quote
+
+    Returns:
+        str: Markdown answer with the price breakdown
+    """
+    off_nights = quote.nights - quote.peak_nights
+    lines = [
+        f"Price for a **{quote.room_category} {quote.room_type}** room at **{quote.hotel}**:",
+        "",
+        f"- **Stay:** {quote.check_in:%B %d, %Y} to {quote.check_out:%B %d, %Y} "
+        f"({quote.nights} night{'s' if quote.nights != 1 else ''})",
+        f"- **Guests:** {quote.guests}" + (" (includes an extra bed)" if quote.extra_bed else ""),
+        f"- **Meal plan:** {quote.meal_plan}",
+    ]
+    if off_nights:
+        lines.append(f"- **Off season:** {off_nights} × €{quote.nightly_price_off_season:.2f}/night")
+    if quote.peak_nights:
+        lines.append(f"- **Peak season:** {quote.peak_nights} × €{quote.nightly_price_peak_season:.2f}/night")
+    lines += ["", f"**Total:** €{quote.total_price:.2f}"]
+    return "\n".join(lines)
@@ -0,0 +1,202 @@
+"""
+Single-Flight Request Coalescing
+
+This module implements the de-duplication of identical concurrent requests:
+while an answer is being generated for a key, other requests with the same
+key wait for it instead of starting their own LLM call, and the result fans
+out to all of them.
+
+Async requests share the fragments of one producer task, so streaming and
+non-streaming requests can join the same flight and streaming followers get
+the fragments as they are produced. The producer is cancelled when the last
+request waiting for it goes away. Blocking requests (thread pool) coalesce
+among themselves through a future.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Produces the fragments of an answer
+FragmentProducer = Callable[[], AsyncIterator[str]]
+# Produces a complete answer
+AnswerProducer = Callable[[], Awaitable[str]]
+
+
+class _Flight:
+    """Answer being produced for one key, shared by all the requests waiting for it."""
+
+    def __init__(self):
+        self.fragments: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self) -> None:
+        """Wake up the requests waiting for new fragments."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        """Yield all the fragments, past and future, until the answer is complete."""
+        index = 0
+        while True:
+            while index < len(self.fragments):
+                yield self.fragments[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent requests with the same key into one execution.
+
+    A key is only shared while its answer is in flight; a request arriving
+    after the answer completed starts a new flight.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._sync_flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.cancelled = 0
+
+    def _count(self, leader: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            if leader:
+                self.executions += 1
+
+    async def stream(self, key: Hashable, producer: FragmentProducer) -> AsyncIterator[str]:
+        """
+        Get the fragments of the answer for a key, producing it if no request is already doing so.
+
+        Args:
+            key: Identity of the answer
+            producer: Function returning the fragments (only called by the first request)
+
+        Yields:
+            str: Consecutive fragments of the answer
+        """
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight()
+            self._flights[key] = flight
+            # The producer runs in its own task, so it survives the request that started it
+            flight.task = asyncio.create_task(self._produce(key, flight, producer))
+        self._count(leader)
+
+        flight.waiters += 1
+        try:
+            async for fragment in flight.follow():
+                yield fragment
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.done:
+                # Nobody is waiting for the answer anymore
+                self.cancelled += 1
+                flight.task.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    async def run(self, key: Hashable, producer: AnswerProducer) -> str:
+        """
+        Get the complete answer for a key, producing it if no request is already doing so.
+
+        The answer joins the flight of a streaming request with the same key,
+        and streaming requests can join its flight.
+
+        Args:
+            key: Identity of the answer
+            producer: Coroutine function returning the answer (only called by the first request)
+
+        Returns:
+            str: Complete answer
+        """
+        async def produce() -> AsyncIterator[str]:
+            yield await producer()
+
+        fragments = self.stream(key, produce)
+        try:
+            return "".join([fragment async for fragment in fragments])
+        finally:
+            await fragments.aclose()
+
+    async def _produce(self, key: Hashable, flight: _Flight, producer: FragmentProducer) -> None:
+        try:
+            async for fragment in producer():
+                flight.fragments.append(fragment)
+                flight.publish()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            # Raised to every waiting request
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.publish()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def call(self, key: Hashable, function: Callable[[], T]) -> T:
+        """
+        Blocking version of `run`, for requests answered in threads.
+
+        Args:
+            key: Identity of the answer
+            function: Function computing the answer (only called by the first request)
+
+        Returns:
+            The answer
+        """
+        with self._lock:
+            future = self._sync_flights.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._sync_flights[key] = future
+        self._count(leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._sync_flights[key]
+
+    def stats(self) -> dict:
+        """
+        Get the coalescing counters.
+
+        Returns:
+            dict: calls, executions, saved calls (calls - executions), flights
+                cancelled for lack of waiters and flights in progress
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "saved": self.calls - self.executions,
+                "cancelled": self.cancelled,
+                "in_flight": len(self._flights) + len(self._sync_flights),
+            }
@@ -0,0 +1,297 @@
+"""
+Stub LLM Provider
+
+This module implements a local fake chat model used with `provider: "stub"`
+in agent_config.yaml. It needs no network access nor API key, so the
+throughput and latency of the API can be measured (see load_test.py) and
+regression-tested offline.
+
+The time to first token, the token rate, the answer length and the error
+rate are drawn from the distributions configured in the `stub` section of
+agent_config.yaml. Both the blocking and the async, streaming and
+non-streaming calls are supported; the async ones sleep without holding a
+thread, like a real provider client.
+"""
+
+import asyncio
+import math
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+try:
+    # Try new LangChain structure (v0.2+)
+    from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+except ImportError:
+    # Fallback to old structure (v0.1)
+    from langchain.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+    from langchain.chat_models.base import BaseChatModel
+    from langchain.schema import AIMessage, AIMessageChunk, BaseMessage
+    from langchain.schema.output import ChatGeneration, ChatGenerationChunk, ChatResult
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+_WORD = re.compile(r"\S+")
+
+
+class StubProviderError(RuntimeError):
+    """Simulated provider failure (raised with the configured error rate)."""
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    Distribution of a non-negative random value.
+
+    - fixed: always `mean`
+    - uniform: between `min` and `max`
+    - normal: `mean` and `stddev`, clipped at `min`
+    - lognormal: `mean` and `stddev` of the value itself (long right tail)
+    """
+
+    kind: str = "fixed"
+    mean: float = 0.0
+    stddev: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        """Validate the distribution parameters."""
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"Invalid distribution: {self.kind}. Must be one of {', '.join(DISTRIBUTIONS)}")
+        if self.kind == "uniform" and self.max < self.min:
+            raise ValueError(f"Uniform distribution needs min <= max, got {self.min} > {self.max}")
+        if self.mean < 0 or self.stddev < 0 or self.min < 0:
+            raise ValueError("Distribution parameters must not be negative")
+
+    @classmethod
+    def from_config(cls, value: Any, default: float) -> "Distribution":
+        """
+        Build a distribution from its YAML configuration.
+
+        Args:
+            value: A number (fixed value), a dict with `distribution` and its
+                parameters, or None
+            default: Fixed value used when not configured
+
+        Returns:
+            Distribution: Parsed distribution
+        """
+        if value is None:
+            return cls(mean=float(default))
+        if isinstance(value, (int, float)):
+            return cls(mean=float(value))
+        kind = value.get("distribution", "fixed")
+        mean = float(value.get("mean", default))
+        return cls(
+            kind=kind,
+            mean=mean,
+            stddev=float(value.get("stddev", 0.0)),
+            min=float(value.get("min", 0.0)),
+            max=float(value.get("max", mean)),
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draw a value.
+
+        Args:
+            rng: Random generator
+
+        Returns:
+            float: Non-negative value
+        """
+        if self.kind == "uniform":
+            return rng.uniform(self.min, self.max)
+        if self.kind == "normal":
+            return max(self.min, rng.gauss(self.mean, self.stddev))
+        if self.kind == "lognormal":
+            if self.mean <= 0:
+                return self.min
+            # Parameters of the underlying normal giving the configured mean and stddev
+            sigma2 = math.log1p((self.stddev / self.mean) ** 2)
+            mu = math.log(self.mean) - sigma2 / 2
+            return max(self.min, rng.lognormvariate(mu, math.sqrt(sigma2)))
+        return self.mean
+
+
+@dataclass(frozen=True)
+class _CallPlan:
+    """Timing and outcome drawn for one call."""
+
+    ttft: float
+    tokens_per_second: float
+    tokens: List[str]
+    fail: bool
+    input_tokens: int
+
+    def token_due(self, index: int) -> float:
+        """Seconds after the start of the call at which a token is emitted."""
+        if self.tokens_per_second <= 0:
+            return self.ttft
+        return self.ttft + index / self.tokens_per_second
+
+    @property
+    def usage_metadata(self) -> dict:
+        output_tokens = len(self.tokens)
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": self.input_tokens + output_tokens,
+        }
+
+
+class StubChatModel(BaseChatModel):
+    """Local fake chat model with configurable latency, token rate and error rate."""
+
+    model_name: str = "stub"
+    # Seconds before the first token
+    ttft_seconds: Distribution = Distribution(mean=0.2)
+    # Rate at which the following tokens are emitted
+    tokens_per_second: Distribution = Distribution(mean=50.0)
+    # Length of an answer in tokens (words)
+    output_tokens: Distribution = Distribution(mean=100.0)
+    # Fraction of calls failing with StubProviderError after the first token delay
+    error_rate: float = 0.0
+    # Seed of the random generator (None = not reproducible)
+    seed: Optional[int] = None
+    _rng: Any = None
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0.0 and 1.0, got {self.error_rate}")
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {
+            "model_name": self.model_name,
+            "ttft_seconds": self.ttft_seconds,
+            "tokens_per_second": self.tokens_per_second,
+            "output_tokens": self.output_tokens,
+            "error_rate": self.error_rate,
+        }
+
+    def _plan(self, messages: List[BaseMessage]) -> _CallPlan:
+        """Draw the timing, the answer and the outcome of a call."""
+        texts = [message.content if isinstance(message.content, str) else str(message.content)
+                 for message in messages]
+        question = texts[-1] if texts else ""
+        # The beginning of the system prompt is enough to shape the answer
+        context_words = _WORD.findall(texts[0][:4096]) if len(texts) > 1 else []
+
+        rng = self._rng
+        count = max(1, int(round(self.output_tokens.sample(rng))))
+        words = _WORD.findall(f"Stub answer to: {question[:200]}") or ["Stub"]
+        # Fill the answer with words of the hotel context so it has a realistic shape
+        filler = context_words or ["lorem", "ipsum", "dolor", "sit", "amet"]
+        start = rng.randrange(len(filler))
+        while len(words) < count:
+            words.append(filler[(start + len(words)) % len(filler)])
+        tokens = [word + " " for word in words[:count - 1]] + [words[count - 1]]
+
+        return _CallPlan(
+            ttft=self.ttft_seconds.sample(rng),
+            tokens_per_second=self.tokens_per_second.sample(rng),
+            tokens=tokens,
+            fail=rng.random() < self.error_rate,
+            input_tokens=sum(len(text) for text in texts) // 4,
+        )
+
+    def _result(self, plan: _CallPlan) -> ChatResult:
+        message = AIMessage(content="".join(plan.tokens), usage_metadata=plan.usage_metadata)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunk(self, plan: _CallPlan, index: int) -> ChatGenerationChunk:
+        last = index == len(plan.tokens) - 1
+        message = AIMessageChunk(
+            content=plan.tokens[index],
+            usage_metadata=plan.usage_metadata if last else None,
+        )
+        return ChatGenerationChunk(message=message)
+
+    def _error(self) -> StubProviderError:
+        return StubProviderError(f"Simulated {self.model_name} provider error (error_rate={self.error_rate})")
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        plan = self._plan(messages)
+        time.sleep(plan.ttft)
+        if plan.fail:
+            raise self._error()
+        time.sleep(plan.token_due(len(plan.tokens) - 1) - plan.ttft)
+        return self._result(plan)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        plan = self._plan(messages)
+        await asyncio.sleep(plan.ttft)
+        if plan.fail:
+            raise self._error()
+        await asyncio.sleep(plan.token_due(len(plan.tokens) - 1) - plan.ttft)
+        return self._result(plan)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        plan = self._plan(messages)
+        started = time.perf_counter()
+        for index in range(len(plan.tokens)):
+            # Sleep until the token is due, so the rate does not drift
+            time.sleep(max(0.0, plan.token_due(index) - (time.perf_counter() - started)))
+            if index == 0 and plan.fail:
+                raise self._error()
+            chunk = self._chunk(plan, index)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        plan = self._plan(messages)
+        started = time.perf_counter()
+        for index in range(len(plan.tokens)):
+            await asyncio.sleep(max(0.0, plan.token_due(index) - (time.perf_counter() - started)))
+            if index == 0 and plan.fail:
+                raise self._error()
+            chunk = self._chunk(plan, index)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def create_stub_llm(model: str, stub_config: Optional[dict] = None) -> StubChatModel:
+    """
+    Create the stub chat model from the `stub` section of agent_config.yaml.
+
+    Args:
+        model: Model name reported in logs and metrics
+        stub_config: `stub` section of the configuration file
+
+    Returns:
+        StubChatModel: Configured stub model
+
+    Raises:
+        ValueError: If a setting is invalid
+    """
+    stub_config = stub_config or {}
+    return StubChatModel(
+        model_name=model,
+        ttft_seconds=Distribution.from_config(stub_config.get("ttft_seconds"), 0.2),
+        tokens_per_second=Distribution.from_config(stub_config.get("tokens_per_second"), 50.0),
+        output_tokens=Distribution.from_config(stub_config.get("output_tokens"), 100.0),
+        error_rate=float(stub_config.get("error_rate", 0.0)),
+        seed=stub_config.get("seed"),
+    )
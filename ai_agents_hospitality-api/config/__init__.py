@@ -6,7 +6,21 @@ from both configuration files and environment variables, with environment
 variables taking precedence.
 """
 
-from .agent_config import AgentConfig, get_agent_config
+from .agent_config import (
+    AgentConfig,
+    ConfigChange,
+    get_agent_config,
+    start_config_watcher,
+    stop_config_watcher,
+    subscribe_config_changes,
+)
 
-__all__ = ["AgentConfig", "get_agent_config"]
+__all__ = [
+    "AgentConfig",
+    "ConfigChange",
+    "get_agent_config",
+    "start_config_watcher",
+    "stop_config_watcher",
+    "subscribe_config_changes",
+]
 
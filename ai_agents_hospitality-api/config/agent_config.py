@@ -4,11 +4,16 @@ Agent Configuration Module
 This module provides centralized configuration management for AI agents.
 It loads configuration from YAML files and environment variables, with
 environment variables taking precedence over file configuration.
+
+The YAML file is parsed once and cached; it is reloaded when it changes on
+disk and subscribers are notified of the sections that changed.
 """
 
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 import yaml
@@ -21,47 +26,263 @@ from util.logger_config import logger
 class AgentConfig:
     """Configuration for AI agents."""
     
-    provider: str = "gemini"  # "gemini" or "openai"
+    provider: str = "gemini"  # "gemini", "openai" or "stub" (local fake model)
     model: str = "gemini-2.5-flash-lite"
     temperature: float = 0.0
     api_key: str = ""
+    max_concurrent_requests: int = 256  # LLM calls allowed in flight at once
+    context_pruning: bool = True  # Send only the hotels a question is about
     
     def __post_init__(self):
         """Validate configuration after initialization."""
-        if self.provider not in ["gemini", "openai"]:
-            raise ValueError(f"Invalid provider: {self.provider}. Must be 'gemini' or 'openai'")
+        if self.provider not in ["gemini", "openai", "stub"]:
+            raise ValueError(f"Invalid provider: {self.provider}. Must be 'gemini', 'openai' or 'stub'")
         
-        if not self.api_key:
+        # The stub provider runs locally and needs no credentials
+        if not self.api_key and self.provider != "stub":
             raise ValueError("API key is required. Set AI_AGENTIC_API_KEY environment variable or configure in agent_config.yaml")
         
         if self.temperature < 0.0 or self.temperature > 1.0:
             raise ValueError(f"Temperature must be between 0.0 and 1.0, got {self.temperature}")
+        
+        if self.max_concurrent_requests < 1:
+            raise ValueError(f"max_concurrent_requests must be at least 1, got {self.max_concurrent_requests}")
+
+
+CONFIG_FILE = PROJECT_ROOT / "config" / "agent_config.yaml"
+
+# Minimum seconds between two stat() calls on the configuration file
+# when no watcher thread is running
+CONFIG_CHECK_INTERVAL_SECONDS = 1.0
+
+FileStamp = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """Change event published when the configuration file is reloaded."""
+    
+    old_config: dict
+    new_config: dict
+    changed_sections: FrozenSet[str]
+
+
+ConfigSubscriber = Callable[[ConfigChange], None]
+
+
+class ConfigStore:
+    """
+    Cached view of a YAML configuration file.
+    
+    The file is parsed once and cached with its modification time and size.
+    It is only parsed again when the stamp changes, detected either by a
+    background watcher thread or by polling stat() at most once per check
+    interval. A reload builds a new dictionary and swaps it in, so readers
+    always see a complete configuration. Subscribers are notified with the
+    top-level sections that actually changed.
+    """
+    
+    def __init__(self, config_file: Path, check_interval: float = CONFIG_CHECK_INTERVAL_SECONDS):
+        """
+        Initialize the store (the file is read on first access).
+        
+        Args:
+            config_file: Path to the YAML configuration file
+            check_interval: Minimum seconds between checks of the file
+        """
+        self.config_file = Path(config_file)
+        self.check_interval = check_interval
+        self._config: dict = {}
+        self._stamp: Optional[FileStamp] = None
+        self._loaded = False
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._subscribers: List[Tuple[ConfigSubscriber, Optional[FrozenSet[str]]]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watcher = threading.Event()
+    
+    def get(self) -> dict:
+        """
+        Get the current configuration, reloading it if the file changed.
+        
+        The returned dictionary is shared and must not be modified.
+        
+        Returns:
+            dict: Configuration dictionary, or empty dict if the file is missing
+        """
+        if self._loaded and (
+            self.watcher_running or time.monotonic() - self._last_check < self.check_interval
+        ):
+            return self._config
+        self.reload()
+        return self._config
+    
+    def _file_stamp(self) -> Optional[FileStamp]:
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _parse(self, stamp: Optional[FileStamp]) -> Optional[dict]:
+        """Parse the file, or return None if it cannot be parsed."""
+        if stamp is None:
+            logger.warning(f"Configuration file not found: {self.config_file}. Using defaults and environment variables.")
+            return {}
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+            logger.info(f"Loaded configuration from {self.config_file}")
+            return config
+        except yaml.YAMLError as e:
+            logger.error(f"Error parsing configuration file {self.config_file}: {e}")
+        except Exception as e:
+            logger.error(f"Error loading configuration file {self.config_file}: {e}")
+        return None
+    
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the configuration if the file changed since it was last read.
+        
+        A file that cannot be parsed keeps the previous configuration in
+        place (or an empty one on first load).
+        
+        Args:
+            force: Parse the file even if its stamp did not change
+            
+        Returns:
+            bool: True if a new configuration was swapped in
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            stamp = self._file_stamp()
+            if self._loaded and stamp == self._stamp and not force:
+                return False
+            
+            new_config = self._parse(stamp)
+            self._stamp = stamp
+            if new_config is None:
+                if self._loaded:
+                    logger.warning("Keeping the previous configuration")
+                    return False
+                new_config = {}
+            
+            first_load = not self._loaded
+            old_config = self._config
+            self._config = new_config
+            self._loaded = True
+        
+        if first_load:
+            return True
+        changed_sections = frozenset(
+            section for section in set(old_config) | set(new_config)
+            if old_config.get(section) != new_config.get(section)
+        )
+        if changed_sections:
+            logger.info(f"Configuration sections changed: {', '.join(sorted(changed_sections))}")
+            self._publish(ConfigChange(old_config, new_config, changed_sections))
+        return True
+    
+    def _publish(self, change: ConfigChange) -> None:
+        """Notify the subscribers interested in the changed sections."""
+        for callback, sections in list(self._subscribers):
+            if sections is not None and not sections & change.changed_sections:
+                continue
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"Error in configuration change subscriber {callback.__qualname__}: {e}", exc_info=True)
+    
+    def subscribe(self, callback: ConfigSubscriber, sections: Optional[Iterable[str]] = None) -> None:
+        """
+        Register a callback for configuration changes.
+        
+        Args:
+            callback: Function called with a ConfigChange after a reload
+            sections: Top-level sections the callback depends on (None = any)
+        """
+        self._subscribers.append((callback, frozenset(sections) if sections is not None else None))
+    
+    @property
+    def watcher_running(self) -> bool:
+        """Whether the background watcher thread is running."""
+        return self._watcher is not None and self._watcher.is_alive()
+    
+    def start_watcher(self, interval: Optional[float] = None) -> None:
+        """
+        Start a daemon thread checking the file for changes.
+        
+        While it runs, readers get the cached configuration without any
+        stat() call and changes are published even when no request comes in.
+        
+        Args:
+            interval: Seconds between checks (defaults to the check interval)
+        """
+        if self.watcher_running:
+            return
+        interval = interval or self.check_interval
+        self._stop_watcher.clear()
+        self.reload()
+        
+        def watch():
+            while not self._stop_watcher.wait(interval):
+                self.reload()
+        
+        self._watcher = threading.Thread(target=watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {self.config_file} for changes every {interval}s")
+    
+    def stop_watcher(self) -> None:
+        """Stop the background watcher thread."""
+        if self._watcher is None:
+            return
+        self._stop_watcher.set()
+        self._watcher.join()
+        self._watcher = None
+
+
+# Shared store of agent_config.yaml
+_config_store = ConfigStore(CONFIG_FILE)
 
 
 def _load_config_file() -> dict:
     """
     Load configuration from YAML file.
     
+    The file is parsed once and cached; it is only parsed again after it
+    changed on disk. The returned dictionary is shared and must not be
+    modified.
+    
     Returns:
         dict: Configuration dictionary from file, or empty dict if file not found
     """
-    config_file = PROJECT_ROOT / "config" / "agent_config.yaml"
+    return _config_store.get()
+
+
+def subscribe_config_changes(callback: ConfigSubscriber, sections: Optional[Iterable[str]] = None) -> None:
+    """
+    Register a callback called when agent_config.yaml changes.
     
-    if not config_file.exists():
-        logger.warning(f"Configuration file not found: {config_file}. Using defaults and environment variables.")
-        return {}
+    Args:
+        callback: Function called with a ConfigChange after a reload
+        sections: Top-level sections the callback depends on (None = any)
+    """
+    _config_store.subscribe(callback, sections)
+
+
+def start_config_watcher(interval: Optional[float] = None) -> None:
+    """
+    Start watching agent_config.yaml for changes in a background thread.
     
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
-        logger.info(f"Loaded configuration from {config_file}")
-        return config
-    except yaml.YAMLError as e:
-        logger.error(f"Error parsing configuration file {config_file}: {e}")
-        return {}
-    except Exception as e:
-        logger.error(f"Error loading configuration file {config_file}: {e}")
-        return {}
+    Args:
+        interval: Seconds between checks of the file
+    """
+    _config_store.start_watcher(interval)
+
+
+def stop_config_watcher() -> None:
+    """Stop watching agent_config.yaml."""
+    _config_store.stop_watcher()
 
 
 def _get_env_value(key: str, default: Optional[str] = None) -> Optional[str]:
@@ -97,6 +318,8 @@ def get_agent_config() -> AgentConfig:
     provider = agent_config.get("provider", "gemini")
     model = agent_config.get("model", "gemini-2.5-flash-lite")
     temperature = agent_config.get("temperature", 0.0)
+    max_concurrent_requests = agent_config.get("max_concurrent_requests", 256)
+    context_pruning = bool(agent_config.get("context_pruning", True))
     
     # Override with environment variables (if set)
     provider = _get_env_value("AI_AGENTIC_PROVIDER", provider)
@@ -109,6 +332,13 @@ def get_agent_config() -> AgentConfig:
         except ValueError:
             logger.warning(f"Invalid temperature value in environment: {temp_str}. Using default: {temperature}")
     
+    concurrency_str = _get_env_value("AI_AGENTIC_MAX_CONCURRENCY")
+    if concurrency_str is not None:
+        try:
+            max_concurrent_requests = int(concurrency_str)
+        except ValueError:
+            logger.warning(f"Invalid max concurrency value in environment: {concurrency_str}. Using default: {max_concurrent_requests}")
+    
     # API key ONLY from environment variables (for security)
     # Should never be in configuration files
     api_key = _get_env_value("AI_AGENTIC_API_KEY")
@@ -118,10 +348,12 @@ def get_agent_config() -> AgentConfig:
         provider=provider,
         model=model,
         temperature=temperature,
-        api_key=api_key or ""  # Empty string if not set (will be validated in __post_init__)
+        api_key=api_key or "",  # Empty string if not set (will be validated in __post_init__)
+        max_concurrent_requests=max_concurrent_requests,
+        context_pruning=context_pruning
     )
     
-    logger.info(f"Agent configuration loaded: provider={provider}, model={model}, temperature={temperature}")
+    logger.info(f"Agent configuration loaded: provider={provider}, model={model}, temperature={temperature}, max_concurrent_requests={max_concurrent_requests}")
     
     return config
 
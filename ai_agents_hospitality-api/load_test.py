@@ -0,0 +1,347 @@
+"""
+Load-testing harness for the WebSocket API.
+
+Replays the generated hotel queries (hotel_room_queries.csv, written by
+bookings-db/src/gen_synthetic_hotels.py) over N concurrent /ws/{uuid}
+sessions and reports throughput, latency percentiles and error rates.
+
+Two load models are supported:
+- closed loop (default): every session sends its next query as soon as the
+  previous answer arrived, so the load adapts to the server speed.
+- open loop (--rate): queries arrive at a fixed rate (uniform or Poisson)
+  whatever the server speed. Latency is measured from the scheduled arrival
+  time, so time spent queued behind a slow answer is counted.
+
+Run it against a server using the local stub model (`provider: "stub"` in
+config/agent_config.yaml) so the numbers reflect the API and not the LLM
+provider.
+
+Usage:
+    python load_test.py --sessions 20 --duration 30
+    python load_test.py --sessions 50 --rate 100 --requests 2000 --stream
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import random
+import sys
+import time
+import uuid as uuid_lib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import websockets
+
+PROJECT_ROOT = Path(__file__).parent
+DEFAULT_QUERIES_FILES = [
+    PROJECT_ROOT / "data" / "hotels" / "hotel_room_queries.csv",
+    PROJECT_ROOT.parent / "bookings-db" / "output_files" / "hotels" / "hotel_room_queries.csv",
+]
+FRAME_START = "JSONSTART"
+FRAME_END = "JSONEND"
+# Agent answers reporting a failure start with this marker
+AGENT_ERROR_PREFIX = "❌"
+
+
+@dataclass
+class RequestResult:
+    """Outcome of one query."""
+
+    latency: float
+    first_byte: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadTestStats:
+    """Results collected during a run."""
+
+    results: List[RequestResult] = field(default_factory=list)
+    started: float = 0.0
+    finished: float = 0.0
+
+    def add(self, result: RequestResult) -> None:
+        self.results.append(result)
+
+
+def load_queries(queries_file: Optional[str]) -> List[str]:
+    """
+    Load the queries to replay.
+
+    Args:
+        queries_file: CSV file with a 'Query' column (defaults to the generated file)
+
+    Returns:
+        list: Queries
+    """
+    candidates = [Path(queries_file)] if queries_file else DEFAULT_QUERIES_FILES
+    for path in candidates:
+        if path.exists():
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                queries = [row["Query"] for row in csv.DictReader(f) if row.get("Query")]
+            print(f"📄 Loaded {len(queries)} queries from {path}")
+            return queries
+    raise FileNotFoundError(
+        "No query file found. Generate one with:\n"
+        "cd bookings-db && python src/gen_synthetic_hotels.py --num_hotels 3"
+    )
+
+
+def parse_frames(text: str) -> List[dict]:
+    """
+    Extract the JSON messages of a WebSocket text frame.
+
+    Args:
+        text: Received text (JSONSTART{...}JSONEND framing)
+
+    Returns:
+        list: Decoded messages
+    """
+    messages = []
+    while FRAME_START in text:
+        start = text.index(FRAME_START) + len(FRAME_START)
+        end = text.index(FRAME_END, start)
+        messages.append(json.loads(text[start:end]))
+        text = text[end + len(FRAME_END):]
+    return messages
+
+
+async def ask(websocket, query: str, stream: bool, timeout: float, scheduled: float) -> RequestResult:
+    """
+    Send one query and wait for its complete answer.
+
+    Args:
+        websocket: Open WebSocket connection
+        query: Query to send
+        stream: Use the streaming protocol (start / delta / end frames)
+        timeout: Seconds to wait for the complete answer
+        scheduled: perf_counter time the query was due (latency origin)
+
+    Returns:
+        RequestResult: Latency, time to first byte and error, if any
+    """
+    await websocket.send(json.dumps({"content": query, "stream": stream}))
+    first_byte = None
+    content = []
+    deadline = scheduled + timeout
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        messages = parse_frames(await asyncio.wait_for(websocket.recv(), remaining))
+        for message in messages:
+            # The server dropped the query (too many waiting) or cancelled its answer
+            if message.get("type") in ("throttled", "cancelled"):
+                return RequestResult(time.perf_counter() - scheduled, first_byte, message["type"])
+            if first_byte is None and message.get("content"):
+                first_byte = time.perf_counter() - scheduled
+            if not stream and message.get("role") == "assistant":
+                content.append(message.get("content", ""))
+                return _result(scheduled, first_byte, content)
+            if message.get("type") == "delta":
+                content.append(message.get("content", ""))
+            elif message.get("type") == "error":
+                # The stream failed after its first fragment
+                return RequestResult(time.perf_counter() - scheduled, first_byte, "stream_error")
+            elif message.get("type") == "end":
+                if message.get("cancelled"):
+                    return RequestResult(time.perf_counter() - scheduled, first_byte, "cancelled")
+                return _result(scheduled, first_byte, content)
+
+
+def _result(scheduled: float, first_byte: Optional[float], content: List[str]) -> RequestResult:
+    answer = "".join(content)
+    error = "agent_error" if answer.lstrip().startswith(AGENT_ERROR_PREFIX) else None
+    return RequestResult(time.perf_counter() - scheduled, first_byte, error)
+
+
+async def run_session(index: int, url: str, queries: List[str], args, stats: LoadTestStats,
+                      arrivals: Optional[asyncio.Queue], budget: Dict[str, int]) -> None:
+    """
+    Run one WebSocket session until the run is over.
+
+    In closed-loop mode the session sends queries back to back; in open-loop
+    mode it takes the scheduled arrival times from the shared queue.
+    """
+    rng = random.Random(args.seed + index if args.seed is not None else None)
+    session_url = f"{url.rstrip('/')}/ws/{uuid_lib.uuid4()}"
+    websocket = None
+    while True:
+        if arrivals is not None:
+            scheduled = await arrivals.get()
+            if scheduled is None:
+                break
+        else:
+            if time.perf_counter() >= stats.started + args.duration or budget["remaining"] <= 0:
+                break
+            budget["remaining"] -= 1
+            scheduled = time.perf_counter()
+
+        query = rng.choice(queries)
+        try:
+            if websocket is None:
+                websocket = await websockets.connect(session_url, max_size=None)
+            stats.add(await ask(websocket, query, args.stream, args.timeout, scheduled))
+        except asyncio.TimeoutError:
+            stats.add(RequestResult(time.perf_counter() - scheduled, error="timeout"))
+            # The answer may still arrive later: start over on a new connection
+            await _close(websocket)
+            websocket = None
+        except (OSError, websockets.WebSocketException) as e:
+            stats.add(RequestResult(time.perf_counter() - scheduled, error=type(e).__name__))
+            await _close(websocket)
+            websocket = None
+    await _close(websocket)
+
+
+async def _close(websocket) -> None:
+    if websocket is not None:
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+async def schedule_arrivals(args, arrivals: asyncio.Queue, started: float) -> None:
+    """Put the arrival times of an open-loop run on the queue, then one stop marker per session."""
+    rng = random.Random(args.seed)
+    scheduled = started
+    sent = 0
+    while sent < args.requests and scheduled < started + args.duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        arrivals.put_nowait(scheduled)
+        sent += 1
+        interval = rng.expovariate(args.rate) if args.arrivals == "poisson" else 1.0 / args.rate
+        scheduled += interval
+    for _ in range(args.sessions):
+        arrivals.put_nowait(None)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_report(stats: LoadTestStats, args) -> dict:
+    """
+    Summarize the results of a run.
+
+    Returns:
+        dict: Throughput, latency percentiles (ms) and error counts
+    """
+    elapsed = stats.finished - stats.started
+    succeeded = [result for result in stats.results if result.error is None]
+    latencies = [result.latency * 1000 for result in succeeded]
+    first_bytes = [result.first_byte * 1000 for result in succeeded if result.first_byte is not None]
+    errors: Dict[str, int] = {}
+    for result in stats.results:
+        if result.error is not None:
+            errors[result.error] = errors.get(result.error, 0) + 1
+
+    report = {
+        "mode": f"open ({args.rate}/s, {args.arrivals})" if args.rate else "closed",
+        "sessions": args.sessions,
+        "stream": args.stream,
+        "duration_s": round(elapsed, 2),
+        "requests": len(stats.results),
+        "succeeded": len(succeeded),
+        "error_rate": round(1 - len(succeeded) / len(stats.results), 4) if stats.results else 0.0,
+        "errors": errors,
+        "throttled": errors.get("throttled", 0),
+        "throughput_rps": round(len(succeeded) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction), 2)
+            for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+    }
+    if latencies:
+        report["latency_ms"]["mean"] = round(sum(latencies) / len(latencies), 2)
+    if args.stream and first_bytes:
+        report["first_byte_ms"] = {
+            name: round(percentile(first_bytes, fraction), 2)
+            for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    """Print a run summary."""
+    print("\n" + "=" * 60)
+    print(f"📊 Load test results ({report['mode']}, {report['sessions']} sessions"
+          f"{', streaming' if report['stream'] else ''})")
+    print("=" * 60)
+    print(f"   Requests:    {report['requests']} in {report['duration_s']}s")
+    print(f"   Succeeded:   {report['succeeded']} ({report['throughput_rps']} req/s)")
+    print(f"   Error rate:  {report['error_rate']:.2%} {report['errors'] or ''}")
+    print(f"   Throttled:   {report['throttled']}")
+    latency = report["latency_ms"]
+    print(f"   Latency ms:  p50={latency['p50']}  p95={latency['p95']}  p99={latency['p99']}  max={latency['max']}")
+    if "first_byte_ms" in report:
+        first_byte = report["first_byte_ms"]
+        print(f"   First byte:  p50={first_byte['p50']}  p95={first_byte['p95']}  p99={first_byte['p99']}")
+
+
+async def run_load_test(args) -> dict:
+    """
+    Run the load test described by the command line arguments.
+
+    Returns:
+        dict: Report of the run
+    """
+    queries = load_queries(args.queries)
+    stats = LoadTestStats()
+    arrivals = asyncio.Queue() if args.rate else None
+    budget = {"remaining": args.requests}
+
+    print(f"🚀 {args.sessions} sessions against {args.url} "
+          f"({'open loop at ' + str(args.rate) + ' req/s' if args.rate else 'closed loop'})")
+    stats.started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(run_session(index, args.url, queries, args, stats, arrivals, budget))
+        for index in range(args.sessions)
+    ]
+    if arrivals is not None:
+        tasks.append(asyncio.create_task(schedule_arrivals(args, arrivals, stats.started)))
+    await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+    return build_report(stats, args)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay hotel queries against the WebSocket API")
+    parser.add_argument("--url", default="ws://localhost:8001", help="Base WebSocket URL of the API")
+    parser.add_argument("--queries", help="CSV file with a 'Query' column (default: hotel_room_queries.csv)")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent WebSocket sessions")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Open loop: total arrival rate in requests/s (default: closed loop)")
+    parser.add_argument("--arrivals", choices=["uniform", "poisson"], default="poisson",
+                        help="Open loop: inter-arrival time distribution")
+    parser.add_argument("--duration", type=float, default=30.0, help="Maximum duration of the run in seconds")
+    parser.add_argument("--requests", type=int, default=sys.maxsize, help="Maximum number of requests")
+    parser.add_argument("--stream", action="store_true", help="Use the streaming protocol")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for an answer")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the query and arrival randomness")
+    parser.add_argument("--output", help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+    return 0 if report["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,23 +9,62 @@ Exercise 0 Implementation:
 - Uses LangChain agent with file context (3 hotels sample)
 - Falls back to hardcoded responses if agent is unavailable
 - Integrates with WebSocket API for real-time chat
+
+WebSocket protocol:
+- Clients send `{"content": "<question>"}` and receive one
+  `JSONSTART{"role": "assistant", "content": ...}JSONEND` frame per answer.
+- Clients that send `{"content": "<question>", "stream": true}` receive the
+  answer as it is generated: a `start` frame, one `delta` frame per
+  fragment and an `end` frame, all carrying the same message `id`. A stream
+  that fails after its first fragment ends with
+  `{"type": "error", "id": ..., "content": ...}` instead of `end`.
+- Messages of a session are answered one at a time, in order. With
+  WS_CANCEL_ON_NEW_MESSAGE a new message cancels the answer still being
+  generated: a cancelled stream ends with
+  `{"type": "end", "id": ..., "cancelled": true}` and a cancelled one-shot
+  answer (or a message superseded before it started) is replaced by
+  `{"type": "cancelled"}`.
+- With WS_MAX_QUEUED_MESSAGES or WS_MAX_MESSAGES_PER_MINUTE, messages over
+  the limit are dropped and answered with a
+  `{"type": "throttled", "reason": ..., "content": ...}` frame.
 """
 
+import asyncio
 import json
 import re
+import time
+import uuid as uuid_lib
 from contextlib import asynccontextmanager
+from functools import partial
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.requests import Request
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from util.logger_config import logger
+from util.logger_config import logger, SAMPLED
 from util.configuration import settings, PROJECT_ROOT
+from config.agent_config import start_config_watcher, stop_config_watcher
+from util.metrics import CONTENT_TYPE_LATEST, counter, gauge, histogram, render_metrics
+from util.tracing import span, start_request
+from util.session_tasks import (
+    CANCEL_SUPERSEDED, REJECTED_CLOSED, THROTTLED_QUEUE_FULL, THROTTLED_RATE,
+    SessionTaskManager, cancel_reason
+)
 
 # Import Exercise 0 agent
 EXERCISE_0_AVAILABLE = False
 try:
-    from agents.hotel_simple_agent import handle_hotel_query_simple, load_hotel_data
+    from agents.hotel_simple_agent import (
+        handle_hotel_query_simple,
+        handle_hotel_query_simple_stream,
+        load_hotel_data,
+        preload_hotel_data,
+        save_answer_cache,
+        start_hotel_data_watcher,
+        stop_hotel_data_watcher
+    )
+    from agents.llm_resilience import LLMUnavailableError
     # Try to load hotel data to verify everything is set up correctly
     try:
         load_hotel_data()
@@ -171,14 +210,148 @@ Example: "list the hotels in France" or "tell me the prices for triple premium r
 *This is a workshop starter - implement your LangChain agent here!*"""
 
 
+# WebSocket metrics (served by /metrics)
+WS_ACTIVE_CONNECTIONS = gauge("hospitality_ws_active_connections", "Open WebSocket connections")
+WS_MESSAGES = counter("hospitality_ws_messages_total", "WebSocket messages received", ["mode"])
+WS_MESSAGE_SECONDS = histogram(
+    "hospitality_ws_message_duration_seconds", "Time from receiving a message to sending its answer", ["mode"]
+)
+WS_RESPONSES = counter(
+    "hospitality_ws_responses_total", "Answers sent, by handler (agent or hardcoded fallback)", ["handler"]
+)
+WS_CANCELLED = counter(
+    "hospitality_ws_cancelled_messages_total",
+    "Messages whose answer was cancelled or dropped (superseded by a new message, or disconnected)",
+    ["reason"]
+)
+WS_THROTTLED = counter(
+    "hospitality_ws_throttled_messages_total",
+    "Messages rejected on a busy session (rate: too many messages per minute, queue_full: too many waiting)",
+    ["reason"]
+)
+# Text of the throttled frame by rejection reason
+STREAM_ERROR_MESSAGE = "The answer was interrupted: please ask again."
+THROTTLED_MESSAGES = {
+    THROTTLED_RATE: "Too many questions in a short time: please wait a moment before asking again.",
+    THROTTLED_QUEUE_FULL: "Too many questions at once: please wait for the current answers.",
+}
+EXECUTOR_QUEUE_DEPTH = gauge(
+    "hospitality_executor_queue_depth", "Blocking calls waiting for a thread of the default executor"
+)
+
+
+def _default_executor_queue_depth() -> int:
+    """Number of jobs queued in the event loop's default thread pool."""
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    work_queue = getattr(executor, "_work_queue", None)
+    return work_queue.qsize() if work_queue is not None else 0
+
+
+EXECUTOR_QUEUE_DEPTH.set_function(_default_executor_queue_depth)
+
+
+def _frame(message: dict) -> str:
+    """
+    Wrap a message in the JSONSTART/JSONEND framing expected by the client.
+
+    Args:
+        message: Message to send
+
+    Returns:
+        Framed message text
+    """
+    return f"JSONSTART{json.dumps(message)}JSONEND"
+
+
+async def _send_quietly(websocket: WebSocket, message: dict) -> None:
+    """Send a notice frame, ignoring a connection that is already gone."""
+    try:
+        await websocket.send_text(_frame(message))
+    except (WebSocketDisconnect, RuntimeError, ConnectionError):
+        pass
+
+
+async def send_streamed_response(websocket: WebSocket, uuid: str, user_query: str) -> None:
+    """
+    Answer a query streaming the response as start / delta / end frames.
+
+    Falls back to the hardcoded responses when the agent is not available
+    or fails before producing any output. A failure after the first delta
+    closes the message with an error frame instead of the end frame.
+
+    Args:
+        websocket: The WebSocket connection instance
+        uuid: Unique identifier for the WebSocket connection
+        user_query: User query string
+    """
+    message_id = uuid_lib.uuid4().hex
+    await websocket.send_text(_frame({"type": "start", "id": message_id, "role": "assistant"}))
+
+    try:
+        streamed = False
+        failed = False
+        if EXERCISE_0_AVAILABLE:
+            try:
+                logger.info("Streaming Exercise 0 agent response for %s", uuid, extra=SAMPLED)
+                frames = 0
+                async for delta in handle_hotel_query_simple_stream(user_query):
+                    with span("ws.send", **{"ws.bytes": len(delta), "ws.frame": frames}):
+                        await websocket.send_text(
+                            _frame({"type": "delta", "id": message_id, "content": delta})
+                        )
+                    frames += 1
+                    streamed = True
+            except WebSocketDisconnect:
+                raise
+            except LLMUnavailableError as e:
+                logger.warning("LLM unavailable for %s: %s", uuid, e)
+                failed = True
+            except Exception as e:
+                logger.error("❌ Error in Exercise 0 agent stream: %s", e, exc_info=True)
+                failed = True
+
+        if streamed and failed:
+            # The client already shows part of the answer: mark it as incomplete
+            WS_RESPONSES.labels(handler="agent").inc()
+            await websocket.send_text(_frame({"type": "error", "id": message_id, "content": STREAM_ERROR_MESSAGE}))
+            return
+
+        WS_RESPONSES.labels(handler="agent" if streamed else "fallback").inc()
+        if not streamed:
+            logger.warning("Falling back to hardcoded response for %s", uuid)
+            await websocket.send_text(_frame({
+                "type": "delta",
+                "id": message_id,
+                "content": find_matching_response(user_query)
+            }))
+    except asyncio.CancelledError as e:
+        # Superseded by a newer message: close the message on the client
+        if cancel_reason(e) == CANCEL_SUPERSEDED:
+            await _send_quietly(websocket, {"type": "end", "id": message_id, "cancelled": True})
+        raise
+
+    await websocket.send_text(_frame({"type": "end", "id": message_id}))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan event handler for startup and shutdown logic.
     """
     logger.info("Starting AI Hospitality API...")
+    # Reload agent_config.yaml in the background when it is edited
+    start_config_watcher()
+    # Swap in newly generated hotel data without restarting the server
+    if EXERCISE_0_AVAILABLE:
+        # Load the cube (and any data not loaded yet) before the first request, off the event loop
+        await asyncio.to_thread(preload_hotel_data)
+        start_hotel_data_watcher()
     yield
     logger.info("Shutting down AI Hospitality API...")
+    stop_config_watcher()
+    if EXERCISE_0_AVAILABLE:
+        stop_hotel_data_watcher()
+        save_answer_cache()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -200,6 +373,112 @@ async def get(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Expose the application metrics in the Prometheus text format.
+
+    Returns:
+        Response: Metrics exposition text
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def handle_message(websocket: WebSocket, uuid: str, data: str) -> None:
+    """
+    Answer one message received on a WebSocket connection.
+
+    The message is handled as a request: it gets its own request id
+    (propagated to the agent and the logs) and a trace of its stages.
+    It runs as a task of the session, cancelled when a newer message
+    supersedes it or the client disconnects.
+
+    Args:
+        websocket: The WebSocket connection instance
+        uuid: Unique identifier for the WebSocket connection
+        data: Raw message text
+    """
+    received_at = time.perf_counter()
+    # The payload itself is only logged at DEBUG level
+    logger.info("Received %d characters from %s", len(data), uuid, extra=SAMPLED)
+    logger.debug("Received from %s: %s", uuid, data)
+    
+    # Parse the query
+    stream_response = False
+    try:
+        message_data = json.loads(data)
+        user_query = message_data.get("content", data)
+        stream_response = bool(message_data.get("stream", False))
+    except json.JSONDecodeError:
+        user_query = data
+    
+    mode = "stream" if stream_response else "single"
+    WS_MESSAGES.labels(mode=mode).inc()
+    try:
+        await _answer_message(websocket, uuid, user_query, stream_response, received_at)
+    except asyncio.CancelledError as e:
+        logger.info("Answer cancelled for %s (%s)", uuid, cancel_reason(e), extra=SAMPLED)
+        if not stream_response and cancel_reason(e) == CANCEL_SUPERSEDED:
+            await _send_quietly(websocket, {"type": "cancelled", "reason": CANCEL_SUPERSEDED})
+        raise
+
+
+async def _answer_message(websocket: WebSocket, uuid: str, user_query: str,
+                          stream_response: bool, received_at: float) -> None:
+    """
+    Answer a parsed message with the agent, or the hardcoded responses as fallback.
+
+    Args:
+        websocket: The WebSocket connection instance
+        uuid: Unique identifier for the WebSocket connection
+        user_query: User query string
+        stream_response: Whether the client asked for the streaming protocol
+        received_at: perf_counter time the message was received
+    """
+    mode = "stream" if stream_response else "single"
+    with start_request("ws.message", **{"ws.uuid": uuid, "ws.mode": mode}):
+        # Stream the response if the client asked for it
+        if stream_response:
+            await send_streamed_response(websocket, uuid, user_query)
+            WS_MESSAGE_SECONDS.labels(mode=mode).observe(time.perf_counter() - received_at)
+            logger.info("Streamed response to %s", uuid, extra=SAMPLED)
+            return
+        
+        # Get response from Exercise 0 agent or fallback to hardcoded
+        if EXERCISE_0_AVAILABLE:
+            try:
+                response_content = await handle_hotel_query_simple(user_query)
+                handler = "agent"
+                logger.info("✅ Exercise 0 agent response generated successfully for %s", uuid, extra=SAMPLED)
+            except LLMUnavailableError as e:
+                logger.warning("LLM unavailable for %s: %s", uuid, e)
+                logger.warning("Falling back to hardcoded response for %s", uuid)
+                response_content = find_matching_response(user_query)
+                handler = "fallback"
+            except Exception as e:
+                logger.error("❌ Error in Exercise 0 agent: %s", e, exc_info=True)
+                logger.warning("Falling back to hardcoded response for %s", uuid)
+                response_content = find_matching_response(user_query)
+                handler = "fallback"
+        else:
+            # Fallback to hardcoded responses
+            logger.debug("Using hardcoded responses (Exercise 0 not available) for %s", uuid)
+            response_content = find_matching_response(user_query)
+            handler = "fallback"
+        WS_RESPONSES.labels(handler=handler).inc()
+        
+        # Send response back to client
+        agent_message = {
+            "role": "assistant",
+            "content": response_content
+        }
+        
+        with span("ws.send", **{"ws.bytes": len(response_content)}):
+            await websocket.send_text(_frame(agent_message))
+        WS_MESSAGE_SECONDS.labels(mode=mode).observe(time.perf_counter() - received_at)
+        logger.info("Sent response to %s", uuid, extra=SAMPLED)
+
+
 @app.websocket("/ws/{uuid}")
 async def websocket_endpoint(websocket: WebSocket, uuid: str):
     """
@@ -217,46 +496,34 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
     """
     await websocket.accept()
     logger.info("WebSocket connection opened for %s", uuid)
+    WS_ACTIVE_CONNECTIONS.inc()
+    # Messages are answered in tasks so the session keeps receiving meanwhile
+    session = SessionTaskManager(
+        partial(handle_message, websocket, uuid),
+        name=uuid,
+        max_queued=settings.WS_MAX_QUEUED_MESSAGES,
+        cancel_on_new_message=settings.WS_CANCEL_ON_NEW_MESSAGE,
+        on_cancel=lambda reason: WS_CANCELLED.labels(reason=reason).inc(),
+        # Superseded before it started: still answer it with a notice
+        on_drop=lambda data, reason: _send_quietly(websocket, {"type": "cancelled", "reason": reason}),
+        max_messages_per_minute=settings.WS_MAX_MESSAGES_PER_MINUTE,
+        burst=settings.WS_MESSAGE_BURST
+    )
 
     try:
         while True:
             try:
                 # Receive message from client
                 data = await websocket.receive_text()
-                logger.info(f"Received from {uuid}: {data}")
-                
-                # Parse the query
-                try:
-                    message_data = json.loads(data)
-                    user_query = message_data.get("content", data)
-                except json.JSONDecodeError:
-                    user_query = data
-                
-                # Get response from Exercise 0 agent or fallback to hardcoded
-                if EXERCISE_0_AVAILABLE:
-                    try:
-                        logger.info(f"Using Exercise 0 agent for query: {user_query[:100]}...")
-                        response_content = await handle_hotel_query_simple(user_query)
-                        logger.info(f"✅ Exercise 0 agent response generated successfully for {uuid}")
-                    except Exception as e:
-                        logger.error(f"❌ Error in Exercise 0 agent: {e}", exc_info=True)
-                        logger.warning(f"Falling back to hardcoded response for {uuid}")
-                        response_content = find_matching_response(user_query)
-                else:
-                    # Fallback to hardcoded responses
-                    logger.debug(f"Using hardcoded responses (Exercise 0 not available) for {uuid}")
-                    response_content = find_matching_response(user_query)
-                
-                # Send response back to client
-                agent_message = {
-                    "role": "assistant",
-                    "content": response_content
-                }
-                
-                await websocket.send_text(
-                    f"JSONSTART{json.dumps(agent_message)}JSONEND"
-                )
-                logger.info(f"Sent response to {uuid}")
+                rejection = await session.submit(data)
+                if rejection is not None and rejection != REJECTED_CLOSED:
+                    WS_THROTTLED.labels(reason=rejection).inc()
+                    logger.warning("Throttling %s (%s): %d messages waiting", uuid, rejection, session.queued)
+                    await websocket.send_text(_frame({
+                        "type": "throttled",
+                        "reason": rejection,
+                        "content": THROTTLED_MESSAGES[rejection]
+                    }))
                 
             except WebSocketDisconnect:
                 logger.info("WebSocket connection closed for %s", uuid)
@@ -273,8 +540,14 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
             uuid, str(e)
         )
     finally:
+        # Nobody will read the answers still being generated
+        await session.close()
+        WS_ACTIVE_CONNECTIONS.dec()
         try:
             await websocket.close()
+        except WebSocketDisconnect:
+            # The client closed the connection first
+            pass
         except (RuntimeError, ConnectionError) as e:
             logger.error(
                 "Error closing WebSocket for %s: %s", 
@@ -1,14 +1,72 @@
 let previousTimestamp = null;  
 const ws = new WebSocket("ws://0.0.0.0:8001/ws/fdfb8545-c177-48a2-bdce-b06af2032092_test_poc");
   
+// Assistant messages being streamed, by message id
+const streamingMessages = {};
+
 ws.onmessage = function(event) {  
-    const messages = document.getElementById('messages');  
     const data = event.data;
     const jsonStr = data.substring(data.indexOf("JSONSTART") + 9, data.indexOf("JSONEND"));
     const messageData = JSON.parse(jsonStr);
     
     console.log('Received message:', messageData);
-    const currentTimestamp = messageData.timestamp;  
+
+    // Streaming protocol: start / delta / end frames sharing a message id
+    if (messageData.type === 'start') {
+        streamingMessages[messageData.id] = {
+            element: appendServerMessage(messageData.role, '', messageData.timestamp),
+            content: '',
+            renderPending: false
+        };
+        return;
+    }
+    if (messageData.type === 'delta') {
+        const streaming = streamingMessages[messageData.id];
+        if (streaming) {
+            streaming.content += messageData.content;
+            scheduleRender(streaming);
+        }
+        return;
+    }
+    // Stream failed after part of the answer: keep it, marked as incomplete
+    if (messageData.type === 'error') {
+        const streaming = streamingMessages[messageData.id];
+        if (streaming) {
+            streaming.content += '\n\n*(' + messageData.content + ')*';
+            renderMarkdown(streaming.element, streaming.content);
+            delete streamingMessages[messageData.id];
+        }
+        return;
+    }
+    if (messageData.type === 'end') {
+        const streaming = streamingMessages[messageData.id];
+        if (streaming) {
+            // Answer cancelled because a newer question was sent
+            if (messageData.cancelled) {
+                streaming.content += '\n\n*(cancelled)*';
+            }
+            renderMarkdown(streaming.element, streaming.content);
+            delete streamingMessages[messageData.id];
+        }
+        return;
+    }
+
+    // Cancelled one-shot answer: the answer to the newer question follows
+    if (messageData.type === 'cancelled') {
+        return;
+    }
+    // Too many questions (rate or queue): the server dropped this one
+    if (messageData.type === 'throttled') {
+        appendServerMessage('system', messageData.content, messageData.timestamp);
+        return;
+    }
+
+    // One-shot framing: the whole answer in a single message
+    appendServerMessage(messageData.role, messageData.content, messageData.timestamp);
+};
+
+function appendServerMessage(roleName, content, currentTimestamp) {
+    const messages = document.getElementById('messages');  
     const showTimestamp = previousTimestamp  
         ? (currentTimestamp - previousTimestamp >= 300)  
         : true;  
@@ -26,23 +84,41 @@ ws.onmessage = function(event) {
   
     const role = document.createElement('div');  
     role.classList.add('role');  
-    role.textContent = messageData.role;  
+    role.textContent = roleName;  
   
     const icon = document.createElement('div');  
     icon.classList.add('icon');  
-    icon.textContent = getInitials(messageData.role);  
-    icon.style.background = getGradient(messageData.role);  
+    icon.textContent = getInitials(roleName);  
+    icon.style.background = getGradient(roleName);  
   
     const message = document.createElement('li');  
     message.classList.add('server-message');  
-    const md = window.markdownit();  
-    message.innerHTML = md.render(messageData.content);  
+    renderMarkdown(message, content);
     messageWrapper.appendChild(icon);  
     messageWrapper.appendChild(role);  
     messageWrapper.appendChild(message);  
     messages.appendChild(messageWrapper);  
     scrollToBottom();  
-};
+    return message;
+}
+
+function renderMarkdown(element, content) {
+    const md = window.markdownit();  
+    element.innerHTML = md.render(content);  
+    scrollToBottom();
+}
+
+function scheduleRender(streaming) {
+    // Re-render at most once per animation frame while deltas keep arriving
+    if (streaming.renderPending) {
+        return;
+    }
+    streaming.renderPending = true;
+    window.requestAnimationFrame(() => {
+        streaming.renderPending = false;
+        renderMarkdown(streaming.element, streaming.content);
+    });
+}
   
 function sendMessage(event) {  
     const input = document.getElementById("messageText");  
@@ -72,7 +148,7 @@ function sendMessage(event) {
     messageWrapper.appendChild(userMessage);  
     messages.appendChild(messageWrapper);  
   
-    ws.send(JSON.stringify({content: input.value, timestamp: currentTimestamp}));  
+    ws.send(JSON.stringify({content: input.value, timestamp: currentTimestamp, stream: true}));  
     input.value = '';  
     event.preventDefault();  
     scrollToBottom();  
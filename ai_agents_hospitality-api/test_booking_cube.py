@@ -0,0 +1,111 @@
+"""
+Regression checks for the occupancy/revenue cube fast path.
+
+Questions the cube cannot answer correctly must return None so they go to
+the LLM instead of getting a wrong table. The checks against the generated
+data need the hotel files and booking_cube.json and are skipped otherwise;
+the others run on a small cube built here.
+
+Usage:
+    python -m pytest test_booking_cube.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.booking_cube import BookingCube, answer_analytics_question
+from agents.hotel_retrieval import HotelIndex
+from agents.hotel_simple_agent import get_booking_cube, get_hotel_data_snapshot
+
+HOTELS = {"Hotels": [
+    {"Name": "Grand Victoria", "Address": {"City": "Paris", "Country": "France"}, "Rooms": []},
+    {"Name": "Royal Sovereign", "Address": {"City": "Lyon", "Country": "France"}, "Rooms": []},
+]}
+# Only Grand Victoria sells All Inclusive; both hotels have 310 room-nights in July
+CUBE = {
+    "Cells": [
+        ["Grand Victoria", "Double", "Standard", "All Inclusive", "2025-07", 62, 10, 5000.0],
+        ["Grand Victoria", "Double", "Standard", "Room Only", "2025-07", 31, 5, 1000.0],
+        ["Royal Sovereign", "Double", "Standard", "Room Only", "2025-07", 93, 12, 2000.0],
+    ],
+    "Capacity": [
+        ["Grand Victoria", "Double", "Standard", "2025-07", 310],
+        ["Royal Sovereign", "Double", "Standard", "2025-07", 310],
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def small_cube_and_index():
+    """Cube and index of two hotels, only one of them offering All Inclusive."""
+    return BookingCube(CUBE), HotelIndex(HOTELS, "")
+
+
+@pytest.fixture(scope="module")
+def cube_and_index():
+    """Booking cube and hotel index of the generated data."""
+    try:
+        cube = get_booking_cube()
+        index = get_hotel_data_snapshot().index
+    except FileNotFoundError:
+        cube = None
+    if cube is None:
+        pytest.skip("Hotel data or booking_cube.json not generated")
+    return cube, index
+
+
+@pytest.mark.parametrize("question", [
+    # Ranking without a grouping listing the hotels
+    "Which hotel has the highest occupancy in July?",
+    # Year not held by the cube
+    "What was the occupancy in 2024?",
+    # "occupied" is not an occupancy question
+    "Is the pool occupied at night?",
+    # Relative period
+    "How much revenue did we make in Nice last week?",
+])
+def test_unsupported_questions_go_to_the_llm(cube_and_index, question):
+    """The cube does not answer questions it cannot resolve."""
+    cube, index = cube_and_index
+    assert answer_analytics_question(question, index, cube) is None
+
+
+def test_supported_questions_are_answered(cube_and_index):
+    """Questions fully covered by the cube are still answered."""
+    cube, index = cube_and_index
+    year = cube.values["month"][0].split("-")[0]
+    assert answer_analytics_question(f"What was the occupancy in July {year}?", index, cube) is not None
+    assert answer_analytics_question("What is the occupancy by hotel in July?", index, cube) is not None
+
+
+@pytest.mark.parametrize("question", [
+    "Do any hotels offer sales on rooms?",
+    "Is there an income requirement to book a suite?",
+    "Do the earnings of the staff include tips?",
+    # A measure without a period or grouping
+    "What is the revenue of Grand Victoria?",
+    "Is the occupancy of the hotels high?",
+])
+def test_non_analytics_questions_go_to_the_llm(small_cube_and_index, question):
+    """Keywords alone do not trigger the cube."""
+    cube, index = small_cube_and_index
+    assert answer_analytics_question(question, index, cube) is None
+
+
+def test_meal_plan_occupancy_uses_the_capacity_of_the_plan():
+    """A meal plan is measured against the hotels offering it."""
+    cube = BookingCube(CUBE)
+    all_inclusive = cube.total({"meal_plan": ["All Inclusive"]})
+    assert all_inclusive.available_room_nights == 310
+    assert all_inclusive.occupancy_rate == pytest.approx(0.2)
+    assert cube.lookup(meal_plan="All Inclusive").available_room_nights == 310
+    assert cube.total({"meal_plan": ["Room Only"]}).available_room_nights == 620
+    assert cube.total({}).available_room_nights == 620
+    rows = dict(cube.breakdown(["meal_plan"], {"month": ["2025-07"]}))
+    assert rows[("All Inclusive",)].occupancy_rate == pytest.approx(0.2)
+    assert rows[("Room Only",)].occupancy_rate == pytest.approx(0.2)
@@ -0,0 +1,94 @@
+"""
+Regression checks for the hotel index used to prune the agent context.
+
+Usage:
+    python -m pytest test_hotel_retrieval.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.hotel_retrieval import HotelIndex
+
+HOTELS = {"Hotels": [
+    {"Name": "Grand Victoria", "Address": {"City": "Nice", "Country": "France"}, "Rooms": []},
+    {"Name": "Royal Sovereign", "Address": {"City": "Paris", "Country": "France"}, "Rooms": []},
+    {"Name": "Grand Plaza", "Address": {"City": "Madrid", "Country": "Spain"}, "Rooms": []},
+    {"Name": "Chancellor's Retreat", "Address": {"City": "Seville", "Country": "Spain"}, "Rooms": []},
+]}
+
+
+@pytest.fixture(scope="module")
+def index():
+    """Index of four hotels, one of them in a city that is also a common word."""
+    return HotelIndex(HOTELS, "")
+
+
+@pytest.mark.parametrize("question", [
+    "Which hotels have a nice pool?",
+    "Nice pool at any hotel?",
+])
+def test_common_word_location_does_not_match(index, question):
+    """'nice' as an adjective does not prune the context to the hotel in Nice."""
+    assert not index.match(question).hotels
+    assert index.context_for_question(question) is None
+
+
+@pytest.mark.parametrize("question", [
+    "Which hotels are in Nice?",
+    "what hotels are there near nice",
+])
+def test_location_after_preposition_matches(index, question):
+    """A preposition makes the location unambiguous."""
+    match = index.match(question)
+    assert match.hotels == ("Grand Victoria",) and not match.ambiguous
+
+
+def test_capitalized_location_alone_uses_full_context(index):
+    """A capitalized ambiguous location is matched but does not prune the context."""
+    match = index.match("Is Nice a good city for a holiday?")
+    assert match.hotels == ("Grand Victoria",) and match.ambiguous
+    assert index.context_for_question("Is Nice a good city for a holiday?") is None
+
+
+@pytest.mark.parametrize("question, hotels", [
+    ("How much is a double room at Royal Sovereign?", ("Royal Sovereign",)),
+    ("Does the grand plaza have a gym?", ("Grand Plaza",)),
+    ("Is breakfast included at Chancellor's Retreat?", ("Chancellor's Retreat",)),
+    ("Is breakfast included at Chancellors Retreat?", ("Chancellor's Retreat",)),
+])
+def test_full_hotel_name_matches(index, question, hotels):
+    """A hotel named in full prunes the context to that hotel."""
+    assert index.match(question).hotels == hotels
+    context = index.context_for_question(question)
+    assert context is not None and hotels[0] in context.text
+    assert "Grand Victoria" not in context.text
+
+
+def test_several_hotels_in_one_question(index):
+    """Every hotel named in the question is kept, in source order."""
+    question = "Compare Royal Sovereign with Grand Victoria and hotels in Madrid"
+    assert index.match(question).hotels == ("Grand Victoria", "Royal Sovereign", "Grand Plaza")
+    context = index.context_for_question(question).text
+    assert "Chancellor's Retreat" not in context
+    assert all(name in context for name in ("Grand Victoria", "Royal Sovereign", "Grand Plaza"))
+
+
+@pytest.mark.parametrize("question", [
+    # Single, common name words do not identify a hotel
+    "Which hotel is the most grand?",
+    "Is there a plaza near the hotels?",
+    "Is there a retreat for families?",
+    "How many rooms does Victoria have?",
+    # Nothing about a hotel at all
+    "What is the cancellation policy?",
+])
+def test_unclear_questions_use_full_context(index, question):
+    """Without a full hotel name (or location) the full context is used."""
+    assert not index.match(question).hotels
+    assert index.context_for_question(question) is None
@@ -0,0 +1,65 @@
+"""
+Checks for the hotel data store: one build for concurrent first requests,
+rebuilds only when the files changed or a rebuild was requested.
+
+Usage:
+    python -m pytest test_hotel_snapshot.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.hotel_snapshot import HotelDataStore
+
+
+class SlowBuilder:
+    """Snapshot builder counting its calls, slow enough for requests to pile up."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, version, stamps):
+        self.calls += 1
+        time.sleep(0.05)
+        return SimpleNamespace(version=version, watch_stamps=stamps, hotel_count=0)
+
+
+def _store(tmp_path):
+    data_file = tmp_path / "hotels.json"
+    data_file.write_text("{}")
+    builder = SlowBuilder()
+    return HotelDataStore(builder, lambda: [data_file], check_interval=3600), builder, data_file
+
+
+def test_concurrent_first_requests_build_once(tmp_path):
+    """Requests waiting for the first build get its snapshot instead of building again."""
+    store, builder, _ = _store(tmp_path)
+    versions = []
+    threads = [threading.Thread(target=lambda: versions.append(store.current().version)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert builder.calls == 1 and versions == [1] * 8
+    assert store.loaded
+
+
+def test_rebuild_only_when_stale(tmp_path):
+    """Up-to-date snapshots are kept; changed files and explicit requests rebuild."""
+    store, builder, data_file = _store(tmp_path)
+    store.current()
+    assert store.rebuild(only_if_stale=True).version == 1 and builder.calls == 1
+
+    data_file.write_text('{"Hotels": []}')
+    assert store.rebuild(only_if_stale=True).version == 2
+
+    store._rebuild_requested = True
+    assert store.rebuild(only_if_stale=True).version == 3
+    # Without the flag, rebuild always builds
+    assert store.rebuild().version == 4 and builder.calls == 4
@@ -0,0 +1,168 @@
+"""
+Checks for the LLM resilience layer: circuit breaker states, jittered
+backoff, deadlines and failures of streams.
+
+Usage:
+    python -m pytest test_llm_resilience.py
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.llm_resilience import (
+    CircuitBreaker, CircuitOpenError, LLMGuard, LLMStreamInterruptedError, LLMUnavailableError,
+    ResiliencePolicy
+)
+
+# No waiting between retries
+FAST_POLICY = ResiliencePolicy(timeout_seconds=0.05, max_retries=2, backoff_base_seconds=0,
+                               backoff_max_seconds=0, failure_threshold=3, reset_timeout_seconds=30)
+
+
+def test_breaker_opens_probes_and_closes():
+    """closed -> open after the threshold -> half-open after the timeout -> closed on success."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    now[0] += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # A single probe goes through
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    assert breaker.stats()["opened"] == 1 and breaker.stats()["rejected"] == 2
+
+
+def test_failed_probe_reopens_and_cancelled_probe_is_released():
+    """A failed probe opens the circuit again; an abandoned one lets another probe through."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] += 10
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+
+def test_backoff_is_jittered_and_capped():
+    """Retry n waits between 0 and min(max, base * 2^n), with varying delays."""
+    policy = ResiliencePolicy(backoff_base_seconds=0.5, backoff_max_seconds=3)
+    rng = random.Random(1)
+    for retry, cap in enumerate([0.5, 1, 2, 3, 3]):
+        delays = [policy.backoff(retry, rng) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap * 0.9 and len(set(delays)) > 100
+
+
+def test_deadline_and_retries_raise_unavailable():
+    """Attempts over the deadline are retried, then reported as unavailable."""
+    async def scenario():
+        guard = LLMGuard(FAST_POLICY)
+        attempts = []
+
+        async def slow():
+            attempts.append(1)
+            await asyncio.sleep(1)
+
+        with pytest.raises(LLMUnavailableError):
+            await guard.call(slow)
+        return guard, attempts
+
+    guard, attempts = asyncio.run(scenario())
+    assert len(attempts) == FAST_POLICY.max_retries + 1
+    # The three timeouts reached the failure threshold
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(guard.call(lambda: asyncio.sleep(0)))
+
+
+def test_transient_failure_is_retried_and_other_errors_are_not():
+    """A transient failure is retried; an error of the request is raised as it is."""
+    async def scenario():
+        guard = LLMGuard(FAST_POLICY)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("reset")
+            return "ok"
+
+        async def invalid():
+            raise ValueError("bad request")
+
+        result = await guard.call(flaky)
+        with pytest.raises(ValueError):
+            await guard.call(invalid)
+        return result, attempts, guard
+
+    result, attempts, guard = asyncio.run(scenario())
+    assert result == "ok" and len(attempts) == 2
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def _collect(guard, function):
+    async def scenario():
+        items = []
+        with pytest.raises(Exception) as error:
+            async for item in guard.stream(function):
+                items.append(item)
+        return items, error.value
+
+    return asyncio.run(scenario())
+
+
+def test_stream_failing_after_the_first_item_is_interrupted():
+    """A transient failure after an item is wrapped in the guard error, not retried."""
+    guard = LLMGuard(FAST_POLICY)
+    attempts = []
+
+    async def breaks():
+        attempts.append(1)
+        yield "Hello"
+        raise ConnectionError("reset")
+
+    items, error = _collect(guard, breaks)
+    assert items == ["Hello"] and len(attempts) == 1
+    assert isinstance(error, LLMStreamInterruptedError) and isinstance(error.__cause__, ConnectionError)
+
+
+def test_stream_deadline_covers_the_whole_stream():
+    """A stream still running at the deadline is interrupted."""
+    guard = LLMGuard(FAST_POLICY)
+
+    async def slow():
+        yield "Hello"
+        await asyncio.sleep(1)
+        yield "world"
+
+    items, error = _collect(guard, slow)
+    assert items == ["Hello"] and isinstance(error, LLMStreamInterruptedError)
+
+
+def test_stream_failing_before_any_item_is_retried():
+    """Until the first item, a stream is retried like a call."""
+    guard = LLMGuard(FAST_POLICY)
+    attempts = []
+
+    async def always_down():
+        attempts.append(1)
+        raise ConnectionError("refused")
+        yield
+
+    items, error = _collect(guard, always_down)
+    assert not items and len(attempts) == FAST_POLICY.max_retries + 1
+    assert type(error) is LLMUnavailableError
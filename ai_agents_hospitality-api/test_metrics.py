@@ -0,0 +1,40 @@
+"""
+Checks for the metrics registry rendering.
+
+Usage:
+    python -m pytest test_metrics.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from util.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_unlabeled_metrics_render_zero_before_first_use():
+    """Metrics without labels are exported from the start; labeled ones once used."""
+    registry = MetricsRegistry()
+    registry.register(Counter("requests_total", "Requests"))
+    registry.register(Gauge("in_flight", "In flight"))
+    registry.register(Histogram("latency_seconds", "Latency", buckets=(1,)))
+    labeled = registry.register(Counter("answers_total", "Answers", ["source"]))
+    lines = registry.render().splitlines()
+    for sample in ("requests_total 0", "in_flight 0", 'latency_seconds_bucket{le="+Inf"} 0',
+                   "latency_seconds_count 0"):
+        assert sample in lines
+    assert not any(line.startswith("answers_total") for line in lines)
+    labeled.labels(source="llm").inc()
+    assert 'answers_total{source="llm"} 1' in registry.render().splitlines()
+
+
+def test_failing_callback_only_skips_its_gauge():
+    """A callback raising at scrape time drops its samples, not the whole scrape."""
+    registry = MetricsRegistry()
+    registry.register(Gauge("broken", "Broken")).set_function(lambda: {}["missing"])
+    registry.register(Gauge("working", "Working")).set_function(lambda: 3)
+    lines = registry.render().splitlines()
+    assert "working 3" in lines
+    assert "# TYPE broken gauge" in lines and not any(line.startswith("broken ") for line in lines)
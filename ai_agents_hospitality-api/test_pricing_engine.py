@@ -0,0 +1,128 @@
+"""
+Checks for the pricing engine and the price fast path.
+
+The engine quotes must match the prices of the synthetic booking generator
+(`get_total_price` in bookings-db); that check is skipped when the generator
+is not available next to the API.
+
+Usage:
+    python -m pytest test_pricing_engine.py
+"""
+
+import sys
+from datetime import date, timedelta
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.hotel_retrieval import HotelIndex
+from agents.pricing_engine import DEFAULT_PEAK_SEASON_MONTHS, ROOM_CAPACITY, PricingEngine, answer_price_question
+
+BOOKINGS_DB_PATH = Path(__file__).parent.parent / "bookings-db"
+
+HOTEL = {
+    "Name": "Grand Victoria",
+    "Address": {"City": "Paris", "Country": "France"},
+    "SyntheticParams": {
+        "OccupancyBaseDiscountPercentage": 25,
+        "ExtraBedChargePercentage": 21,
+        "PromotionPriceDiscount": 30,
+        "MealPlanPrices": {"Room Only": 1.0, "Room and Breakfast": 1.18, "Half Board": 1.5},
+    },
+    "Rooms": [
+        {"RoomId": "01-001", "Type": "Single", "Category": "Standard",
+         "PriceOffSeason": 80.0, "PricePeakSeason": 120.35},
+        {"RoomId": "01-002", "Type": "Double", "Category": "Premium",
+         "PriceOffSeason": 115.5, "PricePeakSeason": 179.03},
+        {"RoomId": "01-003", "Type": "Triple", "Category": "Standard",
+         "PriceOffSeason": 140.25, "PricePeakSeason": 199.99},
+    ],
+}
+HOTELS = {"Hotels": [HOTEL]}
+TODAY = date(2025, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Pricing engine over the test hotel."""
+    return PricingEngine(HOTELS)
+
+
+def _sample_bookings():
+    """Bookings over every room, guest count, meal plan and promotion, across season changes."""
+    for room, meal_plan, promotion, (check_in, nights) in product(
+            HOTEL["Rooms"], HOTEL["SyntheticParams"]["MealPlanPrices"], ("Yes", "No"),
+            [(date(2025, 3, 28), 7), (date(2025, 8, 30), 3), (date(2025, 12, 30), 4), (date(2025, 2, 10), 1)]):
+        capacity = ROOM_CAPACITY[room["Type"]]
+        max_guests = capacity if room["Type"] == "Single" else capacity + 1
+        for guests in range(1, max_guests + 1):
+            yield room, {
+                "CheckInDate": check_in.isoformat(),
+                "CheckOutDate": (check_in + timedelta(days=nights)).isoformat(),
+                "NumberOfGuests": guests,
+                "ExtraBed": "Yes" if guests > capacity else "No",
+                "MealPlan": meal_plan,
+                "Promotion": promotion,
+            }
+
+
+def test_quotes_match_the_booking_generator(engine):
+    """The engine prices every sample booking like the generator does."""
+    sys.path.insert(0, str(BOOKINGS_DB_PATH))
+    parametric_utils = pytest.importorskip("src.generator.parametric_utils")
+    for room, booking in _sample_bookings():
+        quote = engine.quote(
+            HOTEL["Name"], room["Type"], room["Category"],
+            date.fromisoformat(booking["CheckInDate"]), date.fromisoformat(booking["CheckOutDate"]),
+            guests=booking["NumberOfGuests"], meal_plan=booking["MealPlan"],
+            promotion=booking["Promotion"] == "Yes"
+        )
+        expected = parametric_utils.get_total_price(
+            booking, room, list(DEFAULT_PEAK_SEASON_MONTHS), HOTEL["SyntheticParams"]
+        )
+        assert quote.total_price == pytest.approx(expected, abs=0.011), booking
+
+
+def test_batch_matches_single_quotes(engine):
+    """A batch gives the same totals as quoting each stay on its own."""
+    stays = [(room["Type"], room["Category"], date(2025, month, 25), 10)
+             for room in HOTEL["Rooms"] for month in (3, 6, 11)]
+    batch = engine.quote_batch(
+        [engine.find_product(HOTEL["Name"], room_type, category) for room_type, category, _, _ in stays],
+        [check_in for _, _, check_in, _ in stays],
+        [check_in + timedelta(days=nights) for _, _, check_in, nights in stays],
+        [1] * len(stays),
+        [engine.meal_plan_code("Half Board")] * len(stays),
+    )
+    for (room_type, category, check_in, nights), total in zip(stays, batch["total_price"]):
+        quote = engine.quote(HOTEL["Name"], room_type, category, check_in,
+                             check_in + timedelta(days=nights), guests=1, meal_plan="Half Board")
+        assert quote.total_price == pytest.approx(total)
+
+
+def test_price_question_is_answered(engine):
+    """A fully specified price question gets the quote."""
+    answer = answer_price_question(
+        "How much is a Double Premium room at Grand Victoria on March 3 for 2 nights with breakfast?",
+        HotelIndex(HOTELS, ""), engine, today=TODAY
+    )
+    expected = engine.quote("Grand Victoria", "Double", "Premium", date(2025, 3, 3), date(2025, 3, 5),
+                            meal_plan="Room and Breakfast")
+    assert answer is not None and f"€{expected.total_price:.2f}" in answer
+
+
+@pytest.mark.parametrize("question", [
+    # "rate" and "total" without a price word
+    "What is the occupancy rate of Double Premium rooms at Grand Victoria with breakfast on March 3?",
+    "What is the total of Double Premium rooms at Grand Victoria with breakfast on March 3?",
+    # A price word without a recognised stay
+    "How much is breakfast at Grand Victoria?",
+    "What is the price of a Double room at Grand Victoria on March 3 with breakfast?",
+])
+def test_other_questions_go_to_the_llm(engine, question):
+    """Only price questions about a recognised stay are answered."""
+    assert answer_price_question(question, HotelIndex(HOTELS, ""), engine, today=TODAY) is None
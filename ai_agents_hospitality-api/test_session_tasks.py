@@ -0,0 +1,154 @@
+"""
+Checks for the WebSocket session task manager: ordering, cancellation,
+throttling and closing.
+
+Usage:
+    python -m pytest test_session_tasks.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from util.session_tasks import (
+    CANCEL_DISCONNECTED, CANCEL_SUPERSEDED, REJECTED_CLOSED, THROTTLED_QUEUE_FULL, THROTTLED_RATE,
+    SessionTaskManager, cancel_reason
+)
+
+
+class Recorder:
+    """Message handler recording what was answered or cancelled."""
+
+    def __init__(self):
+        self.answered = []
+        self.cancelled = []
+        self.release = asyncio.Event()
+
+    async def handle(self, data: str) -> None:
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError as error:
+            self.cancelled.append((data, cancel_reason(error)))
+            raise
+        self.answered.append(data)
+
+
+async def _settle() -> None:
+    """Let the session tasks run until they wait again."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_messages_are_answered_in_order_by_default():
+    """Without options, every message waits for its turn and is answered."""
+    async def scenario():
+        recorder = Recorder()
+        session = SessionTaskManager(recorder.handle, name="test")
+        for data in ("a", "b", "c"):
+            assert await session.submit(data) is None
+        await _settle()
+        assert session.busy and session.queued == 2
+        recorder.release.set()
+        await _settle()
+        await session.close()
+        return recorder
+
+    recorder = asyncio.run(scenario())
+    assert recorder.answered == ["a", "b", "c"] and not recorder.cancelled
+
+
+def test_new_message_supersedes_the_answer_in_progress():
+    """In cancel mode the running answer is cancelled and the new one runs."""
+    async def scenario():
+        recorder = Recorder()
+        reasons, dropped = [], []
+
+        async def on_drop(data, reason):
+            dropped.append((data, reason))
+
+        session = SessionTaskManager(recorder.handle, name="test", cancel_on_new_message=True,
+                                     on_cancel=reasons.append, on_drop=on_drop)
+        await session.submit("a")
+        await _settle()
+        await session.submit("b")
+        # Superseded before it started: dropped, not cancelled in the handler
+        await session.submit("c")
+        await _settle()
+        recorder.release.set()
+        await _settle()
+        await session.close()
+        return recorder, reasons, dropped
+
+    recorder, reasons, dropped = asyncio.run(scenario())
+    assert recorder.cancelled == [("a", CANCEL_SUPERSEDED)]
+    assert dropped == [("b", CANCEL_SUPERSEDED)]
+    assert reasons == [CANCEL_SUPERSEDED, CANCEL_SUPERSEDED]
+    assert recorder.answered == ["c"]
+
+
+def test_queue_bound_throttles_new_messages():
+    """Beyond max_queued waiting messages, new ones are rejected."""
+    async def scenario():
+        recorder = Recorder()
+        session = SessionTaskManager(recorder.handle, name="test", max_queued=1)
+        results = [await session.submit(data) for data in ("a", "b")]
+        await _settle()
+        results.append(await session.submit("c"))
+        recorder.release.set()
+        await _settle()
+        await session.close()
+        return recorder, results
+
+    recorder, results = asyncio.run(scenario())
+    assert results == [None, None, THROTTLED_QUEUE_FULL]
+    assert recorder.answered == ["a", "b"]
+
+
+def test_rate_limit_throttles_without_cancelling():
+    """Messages over the rate are rejected and the answer in progress keeps running."""
+    now = [0.0]
+
+    async def scenario():
+        recorder = Recorder()
+        session = SessionTaskManager(recorder.handle, name="test", cancel_on_new_message=True,
+                                     max_messages_per_minute=60, burst=2, clock=lambda: now[0])
+        results = [await session.submit("a")]
+        await _settle()
+        results += [await session.submit("b"), await session.submit("c")]
+        await _settle()
+        # One message per second refills one token
+        now[0] += 1
+        results.append(await session.submit("d"))
+        recorder.release.set()
+        await _settle()
+        await session.close()
+        return recorder, results
+
+    recorder, results = asyncio.run(scenario())
+    # "c" did not cancel "b"; "d" did once the bucket refilled
+    assert results == [None, None, THROTTLED_RATE, None]
+    assert recorder.cancelled == [("a", CANCEL_SUPERSEDED), ("b", CANCEL_SUPERSEDED)]
+    assert recorder.answered == ["d"]
+
+
+def test_close_cancels_the_remaining_work():
+    """Closing cancels the running answer, drops the queue and rejects new messages."""
+    async def scenario():
+        recorder = Recorder()
+        reasons = []
+        session = SessionTaskManager(recorder.handle, name="test", on_cancel=reasons.append)
+        await session.submit("a")
+        await session.submit("b")
+        await _settle()
+        await session.close()
+        rejection = await session.submit("c")
+        return recorder, reasons, rejection, session
+
+    recorder, reasons, rejection, session = asyncio.run(scenario())
+    assert recorder.cancelled == [("a", CANCEL_DISCONNECTED)]
+    assert reasons == [CANCEL_DISCONNECTED, CANCEL_DISCONNECTED]
+    assert rejection == REJECTED_CLOSED
+    assert not recorder.answered and not session.busy and session.queued == 0
@@ -0,0 +1,143 @@
+"""
+Checks for the coalescing of identical concurrent requests: one execution
+shared by all the requests, and cancellation of the leader and followers.
+
+Usage:
+    python -m pytest test_single_flight.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.single_flight import SingleFlight
+
+
+class Producer:
+    """Fragment producer releasing its fragments on demand and recording its fate."""
+
+    def __init__(self, fragments=("Hello", ", ", "world")):
+        self.fragments = fragments
+        self.calls = 0
+        self.cancelled = False
+        self.finished = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            for fragment in self.fragments:
+                await self.release.wait()
+                yield fragment
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.finished = True
+
+
+async def _collect(fragments) -> str:
+    return "".join([fragment async for fragment in fragments])
+
+
+async def _settle() -> None:
+    """Let the requests and the producer run until they wait again."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_requests_share_one_execution():
+    """Streaming and non-streaming requests with the same key share one producer."""
+    async def scenario():
+        flight = SingleFlight()
+        producer = Producer()
+
+        async def answer():
+            await producer.release.wait()
+            return "Hello, world"
+
+        requests = [asyncio.create_task(_collect(flight.stream("q", producer))) for _ in range(3)]
+        requests.append(asyncio.create_task(flight.run("q", answer)))
+        await _settle()
+        producer.release.set()
+        return producer, flight, await asyncio.gather(*requests)
+
+    producer, flight, answers = asyncio.run(scenario())
+    assert answers == ["Hello, world"] * 4
+    assert producer.calls == 1
+    assert flight.stats() == {"calls": 4, "executions": 1, "saved": 3, "cancelled": 0, "in_flight": 0}
+
+
+def test_run_takes_a_coroutine():
+    """Non-streaming requests coalesce on a plain coroutine function."""
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def answer():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return "42"
+
+        return calls, await asyncio.gather(flight.run("q", answer), flight.run("q", answer))
+
+    calls, answers = asyncio.run(scenario())
+    assert answers == ["42", "42"] and calls == [1]
+
+
+def test_cancelled_leader_leaves_the_followers_their_answer():
+    """The producer outlives the request that started it while others wait for it."""
+    async def scenario():
+        flight = SingleFlight()
+        producer = Producer()
+        leader = asyncio.create_task(_collect(flight.stream("q", producer)))
+        await _settle()
+        follower = asyncio.create_task(_collect(flight.stream("q", producer)))
+        await _settle()
+        leader.cancel()
+        await _settle()
+        producer.release.set()
+        return producer, flight, leader, await follower
+
+    producer, flight, leader, answer = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert answer == "Hello, world" and producer.finished and not producer.cancelled
+    assert flight.stats()["cancelled"] == 0
+
+
+def test_producer_is_cancelled_with_its_last_request():
+    """Once the leader and every follower are gone, the producer is cancelled."""
+    async def scenario():
+        flight = SingleFlight()
+        producer = Producer()
+        requests = [asyncio.create_task(_collect(flight.stream("q", producer))) for _ in range(2)]
+        await _settle()
+        for request in requests:
+            request.cancel()
+        await _settle()
+        # A new request starts a new flight
+        producer.release.set()
+        return producer, flight, await _collect(flight.stream("q", producer))
+
+    producer, flight, answer = asyncio.run(scenario())
+    assert producer.cancelled and producer.calls == 2 and answer == "Hello, world"
+    assert flight.stats()["cancelled"] == 1 and flight.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_request():
+    """An error of the producer is raised to all the requests of the flight."""
+    async def scenario():
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("provider down")
+            yield
+
+        return await asyncio.gather(*[_collect(flight.stream("q", failing)) for _ in range(2)],
+                                    return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert all(isinstance(error, RuntimeError) and str(error) == "provider down" for error in errors)
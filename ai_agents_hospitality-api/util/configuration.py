@@ -29,6 +29,39 @@ class Settings(BaseSettings):
     # CORS settings
     CORS_ORIGINS: List[str] = Field(default=["*"])
 
+    # Logging settings
+    LOG_LEVEL: str = Field(default="INFO")
+    # Hand records to a background thread through a queue (no I/O on the caller thread)
+    LOG_QUEUE: bool = Field(default=True)
+    # Records dropped when the queue is full (0 = unbounded)
+    LOG_QUEUE_SIZE: int = Field(default=10000)
+    # "text" or "json" (one JSON object per line)
+    LOG_FORMAT: str = Field(default="text")
+    # Keep one of every N high-volume INFO records of the same message (1 = keep all)
+    LOG_SAMPLE_EVERY: int = Field(default=1)
+
+    # Tracing settings
+    # Record per-stage spans of each request and export them as OTLP JSON lines
+    TRACE_ENABLED: bool = Field(default=False)
+    # Trace file (relative to the project root)
+    TRACE_FILE: str = Field(default="logs/traces.jsonl")
+    # Fraction of the requests traced (0.0 to 1.0)
+    TRACE_SAMPLE_RATIO: float = Field(default=1.0)
+
+    # WebSocket session settings
+    # By default every message is answered, in order. Cancelling and throttling
+    # drop answers, so they are opt-in.
+    # A new message cancels the answer still being generated on the same session
+    # (otherwise it waits for its turn)
+    WS_CANCEL_ON_NEW_MESSAGE: bool = Field(default=False)
+    # Messages waiting for their turn before new ones are throttled (0 = unlimited;
+    # only used when WS_CANCEL_ON_NEW_MESSAGE is false)
+    WS_MAX_QUEUED_MESSAGES: int = Field(default=0)
+    # Sustained messages per minute accepted on a session, in both modes (0 = unlimited)
+    WS_MAX_MESSAGES_PER_MINUTE: float = Field(default=0)
+    # Messages accepted back to back before WS_MAX_MESSAGES_PER_MINUTE applies
+    WS_MESSAGE_BURST: int = Field(default=5)
+
     class Config:
         """
         Configuration for the settings class.
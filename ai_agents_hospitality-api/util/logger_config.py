@@ -4,33 +4,136 @@ Logger Configuration Module
 This module provides functionality for configuring and managing logging in the application.
 It sets up a logger with appropriate formatting, handlers, and log levels to ensure
 consistent and informative logging throughout the application.
+
+By default the console and file handlers run on a background thread behind a
+QueueHandler, so logging on the event loop thread only enqueues the record:
+message formatting and file I/O happen on the listener thread. High-volume
+INFO records logged with `extra=SAMPLED` can be sampled, and records can be
+written as one JSON object per line (see the LOG_* settings).
 """
 
+import atexit
+import itertools
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from util.configuration import settings
+from util.tracing import get_request_id
+
+# Pass as `extra=SAMPLED` on high-volume INFO records (one per WebSocket message...)
+SAMPLED = {"sampled": True}
+
+# Attributes of every LogRecord; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName", "sampled"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        # Fields passed through `extra` (request id, uuid...)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one of every N sampled records per message template.
+
+    Only records logged with `extra=SAMPLED` at INFO level or below are
+    sampled; warnings and errors always pass.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or not getattr(record, "sampled", False) or record.levelno > logging.INFO:
+            return True
+        counter = self._counters.get(record.msg)
+        if counter is None:
+            counter = self._counters.setdefault(record.msg, itertools.count())
+        return next(counter) % self.every == 0
+
+
+class RequestIdFilter(logging.Filter):
+    """Add the id of the request being handled to the records (`request_id`)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = get_request_id()
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the formatting to the listener thread.
+
+    The default `prepare` merges the arguments into the message on the
+    caller thread; here the record is enqueued as is (log immutable values
+    only). Records are dropped, and counted, when the queue is full instead
+    of blocking the caller.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def stop_log_listener() -> None:
+    """Flush the records still in the queue and stop the listener thread."""
+    if queue_listener is not None and queue_listener._thread is not None:
+        queue_listener.stop()
+
+
 # Create logs directory if it doesn't exist
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
 # Configure the logger
 logger = logging.getLogger("hospitality_api")
-logger.setLevel(logging.INFO)
+logger.setLevel(settings.LOG_LEVEL.upper())
 
 # Create formatters
-console_formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-file_formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+if settings.LOG_FORMAT == "json":
+    console_formatter = file_formatter = JsonFormatter()
+else:
+    console_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    file_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
 
 # Create handlers
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
 
 # Configure file handler with rotation
 file_handler = RotatingFileHandler(
@@ -40,7 +143,24 @@ file_handler = RotatingFileHandler(
     encoding="utf-8",
 )
 file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
 
+# Dropped sampled records are never formatted nor enqueued
+logger.addFilter(SamplingFilter(settings.LOG_SAMPLE_EVERY))
+# Captured on the caller thread, where the request context is set
+logger.addFilter(RequestIdFilter())
 
+queue_handler = None
+queue_listener = None
+if settings.LOG_QUEUE:
+    queue_handler = NonBlockingQueueHandler(queue.Queue(max(0, settings.LOG_QUEUE_SIZE)))
+    logger.addHandler(queue_handler)
+    queue_listener = QueueListener(
+        queue_handler.queue, console_handler, file_handler, respect_handler_level=True
+    )
+    queue_listener.start()
+else:
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
 
+# Flush the records still in the queue at exit
+atexit.register(stop_log_listener)
@@ -0,0 +1,206 @@
+"""
+Session Task Manager
+
+This module runs the messages of one WebSocket session as cancellable
+asyncio tasks, one at a time and in order, so the session keeps receiving
+while an answer is generated.
+
+- By default the messages wait for their turn and every one is answered.
+  The wait can be bounded, and beyond the bound a message is rejected
+  (`THROTTLED_QUEUE_FULL`).
+- Optionally a new message supersedes the answer in progress: its task is
+  cancelled (and the messages still waiting are dropped) before the new one
+  starts.
+- Optionally, in both modes, the messages accepted per session are rate
+  limited with a token bucket; a message over the rate is rejected
+  (`THROTTLED_RATE`) without cancelling anything, so a flooding client
+  cannot keep restarting the answer. The caller tells the client it is
+  throttled.
+- Closing the session cancels the work nobody will read anymore.
+
+Tasks are cancelled with the reason as cancel message (`CANCEL_SUPERSEDED`
+or `CANCEL_DISCONNECTED`), available to the handler through
+`cancel_reason()`. Superseded messages dropped before they started are
+passed to an `on_drop` callback, so the client can still be told.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional
+
+from util.logger_config import logger
+
+CANCEL_SUPERSEDED = "superseded"
+CANCEL_DISCONNECTED = "disconnected"
+
+THROTTLED_QUEUE_FULL = "queue_full"
+THROTTLED_RATE = "rate"
+REJECTED_CLOSED = "closed"
+
+MessageHandler = Callable[[str], Awaitable[None]]
+# Called with the reason of every cancelled or dropped message
+CancelCallback = Callable[[str], None]
+# Called with a superseded message dropped before it started and the reason
+DropCallback = Callable[[str, str], Awaitable[None]]
+
+
+def cancel_reason(error: asyncio.CancelledError) -> Optional[str]:
+    """
+    Get the reason a session task was cancelled.
+
+    Args:
+        error: CancelledError raised in the task
+
+    Returns:
+        str: CANCEL_SUPERSEDED, CANCEL_DISCONNECTED, or None for other cancellations
+    """
+    return error.args[0] if error.args else None
+
+
+class SessionTaskManager:
+    """Runs the messages of a session one at a time as cancellable tasks."""
+
+    def __init__(self,
+                 handler: MessageHandler,
+                 name: str,
+                 max_queued: int = 0,
+                 cancel_on_new_message: bool = False,
+                 on_cancel: Optional[CancelCallback] = None,
+                 on_drop: Optional[DropCallback] = None,
+                 max_messages_per_minute: float = 0,
+                 burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the manager of a session.
+
+        Args:
+            handler: Coroutine function answering one message
+            name: Session name used in logs and task names
+            max_queued: Messages allowed to wait while one is being answered, 0 = unlimited
+                (only when new messages don't supersede the work in progress)
+            cancel_on_new_message: Whether a new message supersedes the work in progress
+            on_cancel: Function called with the reason of every cancelled or dropped message
+            on_drop: Coroutine function called with each superseded message dropped before it started
+            max_messages_per_minute: Sustained rate of accepted messages (0 = unlimited)
+            burst: Messages accepted back to back before the rate applies
+            clock: Monotonic clock of the rate limit
+        """
+        self._handler = handler
+        self.name = name
+        self.max_queued = max_queued
+        self.cancel_on_new_message = cancel_on_new_message
+        self._on_cancel = on_cancel
+        self._on_drop = on_drop
+        self.max_messages_per_minute = max_messages_per_minute
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._pending: Deque[str] = deque()
+        self._current: Optional[asyncio.Task] = None
+        self._current_data: Optional[str] = None
+        self._current_started = False
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        """Whether a message is being answered."""
+        return self._current is not None and not self._current.done()
+
+    @property
+    def queued(self) -> int:
+        """Number of messages waiting for their turn."""
+        return len(self._pending)
+
+    async def submit(self, data: str) -> Optional[str]:
+        """
+        Schedule a message.
+
+        Args:
+            data: Raw message text
+
+        Returns:
+            Optional[str]: None if the message was accepted, otherwise why it was
+                rejected (THROTTLED_RATE, THROTTLED_QUEUE_FULL or REJECTED_CLOSED)
+        """
+        if self._closed:
+            return REJECTED_CLOSED
+        if (not self.cancel_on_new_message and self.max_queued > 0
+                and self.busy and len(self._pending) >= self.max_queued):
+            return THROTTLED_QUEUE_FULL
+        # Checked before cancelling anything, so a flood does not restart the answer
+        if not self._take_token():
+            return THROTTLED_RATE
+        dropped = []
+        if self.cancel_on_new_message:
+            dropped = self._cancel(CANCEL_SUPERSEDED)
+        self._pending.append(data)
+        self._start_next()
+        if self._on_drop is not None:
+            for dropped_data in dropped:
+                await self._on_drop(dropped_data, CANCEL_SUPERSEDED)
+        return None
+
+    def _take_token(self) -> bool:
+        """Take a token of the rate limit bucket, if one is available."""
+        if self.max_messages_per_minute <= 0:
+            return True
+        now = self._clock()
+        self._tokens = min(float(self.burst),
+                           self._tokens + (now - self._refilled_at) * self.max_messages_per_minute / 60)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _start_next(self) -> None:
+        # A cancelled task starts the next message when it is done
+        if self.busy or not self._pending or self._closed:
+            return
+        data = self._pending.popleft()
+        self._current_data, self._current_started = data, False
+        self._current = asyncio.create_task(self._run(data), name=f"ws-message-{self.name}")
+        self._current.add_done_callback(self._on_done)
+
+    async def _run(self, data: str) -> None:
+        self._current_started = True
+        await self._handler(data)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            error = task.exception()
+            logger.error(f"Error answering a message on {self.name}: {error}", exc_info=error)
+        self._start_next()
+
+    def _cancel(self, reason: str) -> List[str]:
+        """
+        Cancel the message being answered and drop the waiting ones.
+
+        Returns:
+            list: Messages dropped before they started
+        """
+        dropped = []
+        if self.busy and not self._current.cancelling():
+            self._current.cancel(reason)
+            self._notify_cancel(reason)
+            if not self._current_started:
+                # Cancelled before its first step: the handler never sees it
+                dropped.append(self._current_data)
+        for _ in self._pending:
+            self._notify_cancel(reason)
+        dropped.extend(self._pending)
+        self._pending.clear()
+        return dropped
+
+    def _notify_cancel(self, reason: str) -> None:
+        if self._on_cancel is not None:
+            self._on_cancel(reason)
+
+    async def close(self) -> None:
+        """Cancel the remaining work of the session and wait for it to stop."""
+        self._closed = True
+        self._cancel(CANCEL_DISCONNECTED)
+        if self._current is not None:
+            await asyncio.gather(self._current, return_exceptions=True)
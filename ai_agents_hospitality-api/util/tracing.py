@@ -0,0 +1,392 @@
+"""
+Tracing Module
+
+This module provides lightweight request tracing: a request id propagated
+through a context variable from the WebSocket endpoint down to the agent,
+and timed spans for each stage of the pipeline (data loading, fast paths,
+cache lookup, context selection, prompt rendering, LLM call, WebSocket send).
+
+Traces are exported as OTLP-compatible JSON (one `resourceSpans` document per
+trace and line) to a local file by a background thread, so latency
+breakdowns can be analysed offline or imported into any OTLP tool.
+Spans are only recorded when TRACE_ENABLED is set; the request id is always
+propagated (and added to the log records).
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid as uuid_lib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from util.configuration import PROJECT_ROOT, settings
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+except ImportError:
+    # langchain_core is optional here; chain spans are not recorded without it
+    BaseCallbackHandler = object
+
+SERVICE_NAME = "hospitality_api"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+
+@dataclass
+class Span:
+    """Timed operation of a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    error: Optional[str] = None
+    _started: int = field(default_factory=time.perf_counter_ns)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """End the span (the duration is measured with the monotonic clock)."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = self.start_time_ns + time.perf_counter_ns() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+
+class _NoopSpan:
+    """Span returned when the request is not traced."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    """Spans of one traced request."""
+
+    def __init__(self, request_id: str):
+        self.trace_id = uuid_lib.uuid4().hex
+        self.request_id = request_id
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Optional[Span], kind: int = SPAN_KIND_INTERNAL,
+                   attributes: Optional[Dict[str, Any]] = None) -> Span:
+        span = Span(name, self.trace_id, uuid_lib.uuid4().hex[:16],
+                    parent.span_id if parent is not None else None, kind, dict(attributes or {}))
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """
+    Get the id of the request being handled.
+
+    Returns:
+        Optional[str]: Request id, or None outside a request
+    """
+    return _request_id.get()
+
+
+def _reset(variable: ContextVar, token) -> None:
+    try:
+        variable.reset(token)
+    except ValueError:
+        # Reset from another context (e.g. an async generator closed by the GC)
+        pass
+
+
+@contextmanager
+def start_request(name: str, request_id: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Handle a request: set its request id and record its root span.
+
+    Args:
+        name: Name of the root span
+        request_id: Request id (a new one is generated if not given)
+        **attributes: Attributes of the root span
+
+    Yields:
+        Span: Root span (a no-op span when the request is not traced)
+    """
+    request_id = request_id or uuid_lib.uuid4().hex
+    request_token = _request_id.set(request_id)
+    if not settings.TRACE_ENABLED or random.random() >= settings.TRACE_SAMPLE_RATIO:
+        try:
+            yield NOOP_SPAN
+        finally:
+            _reset(_request_id, request_token)
+        return
+
+    trace = _Trace(request_id)
+    root = trace.start_span(name, None, SPAN_KIND_SERVER, {"request.id": request_id, **attributes})
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    error = None
+    try:
+        yield root
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        root.end(error)
+        _reset(_current_span, span_token)
+        _reset(_current_trace, trace_token)
+        _reset(_request_id, request_token)
+        _exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Record a timed span as a child of the current span.
+
+    Args:
+        name: Name of the span (stage of the pipeline)
+        **attributes: Attributes of the span
+
+    Yields:
+        Span: The span (a no-op span when the request is not traced)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    current = trace.start_span(name, _current_span.get(), attributes=attributes)
+    token = _current_span.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        current.end(error)
+        _reset(_current_span, token)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler recording the runs of a chain as spans.
+
+    The handler is created for one request and parents the runs under the
+    span that was current when it was created (callbacks may run in other
+    threads, where the context variables are not set).
+    """
+
+    run_inline = True
+
+    def __init__(self, trace: _Trace, parent: Optional[Span]):
+        super().__init__()
+        self._trace = trace
+        self._parent = parent
+        self._spans: Dict[UUID, Span] = {}
+
+    def _start(self, name: str, run_id: UUID, parent_run_id: Optional[UUID], kind: int = SPAN_KIND_INTERNAL,
+               attributes: Optional[Dict[str, Any]] = None) -> None:
+        parent = self._spans.get(parent_run_id, self._parent) if parent_run_id else self._parent
+        self._spans[run_id] = self._trace.start_span(name, parent, kind, attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        run_span = self._spans.pop(run_id, None)
+        if run_span is not None:
+            run_span.end(error)
+        return run_span
+
+    @staticmethod
+    def _name(serialized: Optional[dict], kwargs: dict, default: str) -> str:
+        if kwargs.get("name"):
+            return kwargs["name"]
+        if serialized:
+            return serialized.get("name") or (serialized.get("id") or [default])[-1]
+        return default
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        self._start(f"chain.{self._name(serialized, kwargs, 'chain')}", run_id, parent_run_id)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        invocation = kwargs.get("invocation_params") or {}
+        self._start(f"llm.{self._name(serialized, kwargs, 'chat_model')}", run_id, parent_run_id, SPAN_KIND_CLIENT,
+                    {"llm.model": invocation.get("model") or invocation.get("model_name")})
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(f"llm.{self._name(serialized, kwargs, 'llm')}", run_id, parent_run_id, SPAN_KIND_CLIENT)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run_span = self._spans.get(run_id)
+        if run_span is not None and "llm.time_to_first_token_ms" not in run_span.attributes:
+            run_span.set_attribute(
+                "llm.time_to_first_token_ms", (time.perf_counter_ns() - run_span._started) / 1e6
+            )
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        run_span = self._end(run_id)
+        if run_span is None:
+            return
+        for generations in getattr(response, "generations", None) or []:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    run_span.set_attribute("llm.prompt_tokens", usage.get("input_tokens"))
+                    run_span.set_attribute("llm.completion_tokens", usage.get("output_tokens"))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+
+def chain_callbacks() -> list:
+    """
+    Get the callbacks tracing a chain invocation under the current span.
+
+    Returns:
+        list: Callback handlers to pass in the chain `config` (empty if not traced)
+    """
+    trace = _current_trace.get()
+    if trace is None or BaseCallbackHandler is object:
+        return []
+    return [TracingCallbackHandler(trace, _current_span.get())]
+
+
+def _attribute_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace_span: Span) -> dict:
+    otlp = {
+        "traceId": trace_span.trace_id,
+        "spanId": trace_span.span_id,
+        "name": trace_span.name,
+        "kind": trace_span.kind,
+        "startTimeUnixNano": str(trace_span.start_time_ns),
+        "endTimeUnixNano": str(trace_span.end_time_ns or trace_span.start_time_ns),
+        "attributes": [
+            {"key": key, "value": _attribute_value(value)}
+            for key, value in trace_span.attributes.items() if value is not None
+        ],
+        "status": {"code": STATUS_CODE_ERROR, "message": trace_span.error} if trace_span.error else {},
+    }
+    if trace_span.parent_span_id:
+        otlp["parentSpanId"] = trace_span.parent_span_id
+    return otlp
+
+
+def to_otlp_json(trace: _Trace) -> dict:
+    """
+    Convert a trace to an OTLP/JSON `ExportTraceServiceRequest` document.
+
+    Args:
+        trace: Finished trace
+
+    Returns:
+        dict: Document with one resourceSpans entry
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": [_otlp_span(trace_span) for trace_span in trace.spans],
+            }],
+        }]
+    }
+
+
+class TraceFileExporter:
+    """Append finished traces to a JSON lines file from a background thread."""
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self._queue: "queue.Queue[Optional[_Trace]]" = queue.Queue(maxsize=10000)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def export(self, trace: _Trace) -> None:
+        """Queue a finished trace for writing (dropped if the queue is full)."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    break
+                f.write(json.dumps(to_otlp_json(trace), ensure_ascii=False, default=str) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def shutdown(self) -> None:
+        """Write the queued traces and stop the background thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+_trace_file = Path(settings.TRACE_FILE)
+if not _trace_file.is_absolute():
+    _trace_file = PROJECT_ROOT / _trace_file
+_exporter = TraceFileExporter(_trace_file)
+atexit.register(_exporter.shutdown)
@@ -9,6 +9,15 @@ until PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -c '\q
 done
 echo "PostgreSQL is up - executing command"
 
+# Table layout: basic (init.sql) or performance (init_performance.sql)
+DATABASE_SCHEMA=${DATABASE_SCHEMA:-basic}
+if [ "$DATABASE_SCHEMA" = "performance" ]; then
+    SCHEMA_FILE=/app/db/init_performance.sql
+else
+    SCHEMA_FILE=/app/db/init.sql
+fi
+echo "Using the '$DATABASE_SCHEMA' schema ($SCHEMA_FILE)."
+
 # Check if database exists
 DB_EXISTS=$(PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -t -c "SELECT 1 FROM pg_database WHERE datname='$POSTGRES_DB';")
 if [ -z "$DB_EXISTS" ]; then
@@ -21,7 +30,7 @@ fi
 # Check if table exists
 if ! PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -c "\dt" | grep -qw bookings; then
     echo "Table 'bookings' does not exist. Creating it..."
-    PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -f /app/db/init.sql
+    PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -f $SCHEMA_FILE
 else
     echo "Table 'bookings' already exists."
 fi
@@ -29,7 +38,11 @@ fi
 # Check if table is empty
 if [ "$(PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -t -c "SELECT COUNT(*) FROM bookings;")" -eq 0 ]; then
     echo "Table 'bookings' is empty. Loading data..."
-    POSTGRES_USER=$POSTGRES_USER POSTGRES_PASSWORD=$POSTGRES_PASSWORD POSTGRES_DB=$POSTGRES_DB python /app/db/load_data.py
+    POSTGRES_USER=$POSTGRES_USER POSTGRES_PASSWORD=$POSTGRES_PASSWORD POSTGRES_DB=$POSTGRES_DB DATABASE_SCHEMA=$DATABASE_SCHEMA python /app/db/load_data.py
+    if [ "$DATABASE_SCHEMA" = "performance" ]; then
+        echo "Refreshing the analytics materialized views..."
+        PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -c "SELECT refresh_booking_analytics();"
+    fi
 else
     echo "Table 'bookings' already contains data. Skipping data load."
 fi
@@ -0,0 +1,156 @@
+-- Performance schema for the bookings database (DATABASE_SCHEMA=performance)
+--
+-- Same `bookings` columns as init.sql, plus:
+--   * hotel and room dimension tables referenced by the bookings
+--   * bookings range-partitioned by month of check-in date
+--   * indexes on (hotel, check-in date) and (check-in date, check-out date)
+--   * materialized views with daily occupancy and revenue aggregates by
+--     hotel, room type and meal plan, refreshed with
+--     refresh_booking_analytics() after each load
+
+-- Hotel dimension
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id SERIAL PRIMARY KEY,
+    hotel_name VARCHAR(255) NOT NULL UNIQUE,
+    city VARCHAR(100),
+    country VARCHAR(100)
+);
+
+-- Room dimension
+CREATE TABLE IF NOT EXISTS rooms (
+    room_key SERIAL PRIMARY KEY,
+    hotel_id INTEGER NOT NULL REFERENCES hotels (hotel_id),
+    room_id VARCHAR(50) NOT NULL,
+    room_type VARCHAR(100),
+    room_category VARCHAR(100),
+    UNIQUE (hotel_id, room_id)
+);
+
+-- Bookings, partitioned by month of check-in date
+CREATE TABLE IF NOT EXISTS bookings (
+    id SERIAL,
+    hotel_id INTEGER REFERENCES hotels (hotel_id),
+    room_key INTEGER REFERENCES rooms (room_key),
+    hotel_name VARCHAR(255),
+    room_id VARCHAR(50),
+    room_type VARCHAR(100),
+    room_category VARCHAR(100),
+    check_in_date DATE NOT NULL,
+    check_out_date DATE,
+    total_nights INTEGER,
+    guest_first_name VARCHAR(100),
+    guest_last_name VARCHAR(100),
+    guest_email VARCHAR(255),
+    guest_phone VARCHAR(50),
+    guest_country VARCHAR(100),
+    guest_city VARCHAR(100),
+    guest_address TEXT,
+    guest_zip_code VARCHAR(20),
+    meal_plan VARCHAR(50),
+    total_price DECIMAL(10, 2),
+    PRIMARY KEY (id, check_in_date)
+) PARTITION BY RANGE (check_in_date);
+
+-- Rows outside the monthly partitions created by the loader
+CREATE TABLE IF NOT EXISTS bookings_default PARTITION OF bookings DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_bookings_hotel_check_in
+    ON bookings (hotel_id, check_in_date);
+CREATE INDEX IF NOT EXISTS idx_bookings_stay_dates
+    ON bookings (check_in_date, check_out_date);
+
+-- Create one partition per month between two dates (inclusive).
+-- Called by load_data.py with the date range of the data before loading it.
+CREATE OR REPLACE FUNCTION create_booking_partitions(from_date DATE, to_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date)::DATE;
+    created INTEGER := 0;
+    partition_name TEXT;
+BEGIN
+    WHILE month_start <= to_date LOOP
+        partition_name := format('bookings_%s', to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, (month_start + INTERVAL '1 month')::DATE
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Daily occupancy by hotel, room type and meal plan: one row per night with
+-- at least one room sold. rooms_available is the capacity of the room type
+-- (from the room dimension); the meal plans of a room type share it, so
+-- occupancy_rate adds up over the meal plans of a room type.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_occupancy AS
+WITH room_type_capacity AS (
+    SELECT hotel_id, room_type, COUNT(*) AS rooms_available
+    FROM rooms
+    GROUP BY hotel_id, room_type
+)
+SELECT
+    b.hotel_id,
+    h.hotel_name,
+    h.city,
+    h.country,
+    b.room_type,
+    b.meal_plan,
+    stay.stay_date::DATE AS stay_date,
+    COUNT(*) AS rooms_occupied,
+    c.rooms_available,
+    ROUND(COUNT(*)::NUMERIC / NULLIF(c.rooms_available, 0), 4) AS occupancy_rate
+FROM bookings b
+JOIN hotels h ON h.hotel_id = b.hotel_id
+LEFT JOIN room_type_capacity c ON c.hotel_id = b.hotel_id AND c.room_type = b.room_type
+CROSS JOIN LATERAL generate_series(
+    b.check_in_date, b.check_out_date - 1, INTERVAL '1 day'
+) AS stay(stay_date)
+GROUP BY b.hotel_id, h.hotel_name, h.city, h.country, b.room_type, b.meal_plan,
+         stay.stay_date, c.rooms_available
+WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_daily_occupancy
+    ON mv_daily_occupancy (hotel_id, room_type, meal_plan, stay_date);
+
+-- Daily revenue by hotel, room type and meal plan (attributed to the check-in date)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_revenue AS
+SELECT
+    b.hotel_id,
+    h.hotel_name,
+    b.room_type,
+    b.meal_plan,
+    b.check_in_date AS revenue_date,
+    COUNT(*) AS bookings,
+    SUM(b.total_nights) AS room_nights,
+    SUM(b.total_price) AS revenue
+FROM bookings b
+JOIN hotels h ON h.hotel_id = b.hotel_id
+GROUP BY b.hotel_id, h.hotel_name, b.room_type, b.meal_plan, b.check_in_date
+WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_daily_revenue
+    ON mv_daily_revenue (hotel_id, room_type, meal_plan, revenue_date);
+
+-- Refresh the analytics views (run after every load).
+-- The first refresh populates the views; later ones run concurrently so
+-- readers are never blocked.
+CREATE OR REPLACE FUNCTION refresh_booking_analytics()
+RETURNS VOID AS $$
+DECLARE
+    view_name TEXT;
+BEGIN
+    FOREACH view_name IN ARRAY ARRAY['mv_daily_occupancy', 'mv_daily_revenue'] LOOP
+        IF EXISTS (SELECT 1 FROM pg_matviews
+                   WHERE matviewname = view_name AND ispopulated) THEN
+            EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I', view_name);
+        ELSE
+            EXECUTE format('REFRESH MATERIALIZED VIEW %I', view_name);
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
@@ -1,16 +1,133 @@
 #!/usr/bin/env python3
-"""Script to load booking data from Excel into PostgreSQL database."""
+"""Script to load booking data from Parquet (or Excel) into PostgreSQL database.
 
+By default the rows are streamed into `COPY bookings FROM STDIN` in chunks,
+which loads the whole file in a handful of statements. The legacy
+row-by-row INSERT loader is kept behind `--mode insert`.
+
+Usage:
+    python load_data.py [--mode copy|insert] [--chunk-size N] [--file PATH]
+                        [--schema basic|performance] [--hotels-file PATH]
+                        [--host HOST] [--port PORT] [--dry-run]
+
+The input is all_bookings.parquet, read through a memory map with its
+typed dates and decimal prices. An all_bookings.xlsx export is still
+accepted (the format is picked from the file extension).
+
+With `--schema performance` (or DATABASE_SCHEMA=performance) the tables of
+init_performance.sql are used: the hotel and room dimensions are filled
+from hotels.json (and the bookings), the monthly partitions covering the
+data are created and the bookings are copied with their dimension keys.
+The analytics views are refreshed afterwards by init-db.sh.
+
+`--dry-run` runs the whole pipeline (read, convert, chunk, serialize) against
+a local stand-in that consumes the COPY stream without a PostgreSQL server.
+"""
+
+import argparse
+import io
+import json
 import os
+import time
 import pandas as pd
-import psycopg2
-from psycopg2 import OperationalError, DatabaseError
+import pyarrow.parquet as pq
+
+try:
+    import psycopg2
+    from psycopg2 import OperationalError, DatabaseError
+except ImportError:
+    # psycopg2 is only needed to talk to a real database (not for --dry-run)
+    psycopg2 = None
+    OperationalError = DatabaseError = Exception
+
+DEFAULT_BOOKINGS_FILE = "/app/data/all_bookings.parquet"
+DEFAULT_HOTELS_FILE = "/app/data/hotels.json"
+DEFAULT_CHUNK_SIZE = 10000
+
+# File column -> bookings table column, in COPY order
+BOOKING_COLUMNS = {
+    'Hotel Name': 'hotel_name',
+    'Room ID': 'room_id',
+    'Room Type': 'room_type',
+    'Room Category': 'room_category',
+    'Check-in Date': 'check_in_date',
+    'Check-out Date': 'check_out_date',
+    'Total Nights': 'total_nights',
+    'Guest First Name': 'guest_first_name',
+    'Guest Last Name': 'guest_last_name',
+    'Guest Email': 'guest_email',
+    'Guest Phone': 'guest_phone',
+    'Guest Country': 'guest_country',
+    'Guest City': 'guest_city',
+    'Guest Address': 'guest_address',
+    'Guest Zip Code': 'guest_zip_code',
+    'Meal Plan': 'meal_plan',
+    'Total Price': 'total_price',
+}
+
+# Table creation script of each schema option
+SCHEMA_FILES = {
+    'basic': '/app/db/init.sql',
+    'performance': '/app/db/init_performance.sql',
+}
+
+# Dimension keys copied with the bookings in the performance schema
+DIMENSION_COLUMNS = {
+    'Hotel ID': 'hotel_id',
+    'Room Key': 'room_key',
+}
+
+def copy_sql(columns):
+    """Build the COPY ... FROM STDIN statement for the given bookings columns."""
+    return f"COPY bookings ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+COPY_SQL = copy_sql(BOOKING_COLUMNS.values())
+
+
+class DryRunCursor:
+    """Local stand-in for a PostgreSQL cursor used by --dry-run.
+
+    It consumes the COPY stream like the server would and counts the rows and
+    bytes received, so the loader can be exercised without a database.
+    Booking rows and the hotel/room dimension rows (performance schema) are
+    counted separately.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.dimension_rows = 0
+        self.bytes = 0
+        self.statements = 0
+
+    def copy_expert(self, sql, file):
+        """Consume a COPY ... FROM STDIN stream."""
+        self.statements += 1
+        for line in file:
+            self.rows += 1
+            self.bytes += len(line.encode('utf-8'))
+
+    def execute(self, sql, params=None):
+        """Accept a statement without running it."""
+        self.statements += 1
+        statement = ' '.join(sql.split()).upper()
+        if statement.startswith('INSERT INTO BOOKINGS'):
+            self.rows += 1
+        elif statement.startswith('INSERT'):
+            self.dimension_rows += 1
+
+    def fetchone(self):
+        """Return a synthetic key for INSERT ... RETURNING statements."""
+        return (self.statements,)
+
+    def close(self):
+        """Nothing to release."""
+
 
 def check_table_exists(cursor, table_name):
     """Check if a table exists in the database."""
     cursor.execute("""
         SELECT EXISTS (
-            SELECT FROM information_schema.tables 
+            SELECT FROM information_schema.tables
             WHERE table_name = %s
         );
     """, (table_name,))
@@ -22,12 +139,244 @@ def execute_sql_file(cursor, file_path):
         sql_commands = file.read()
         cursor.execute(sql_commands)
 
-def load_excel_to_postgres():
-    """Load booking data from Excel file into PostgreSQL database."""
+def read_bookings(bookings_file):
+    """Read the bookings file and derive the table columns.
+
+    Args:
+        bookings_file (str): Path to all_bookings.parquet (or all_bookings.xlsx).
+
+    Returns:
+        pd.DataFrame: Bookings with the columns of BOOKING_COLUMNS.
+    """
+    if bookings_file.endswith(('.xlsx', '.xls')):
+        # Zip codes are text in the table; keep leading zeros
+        df = pd.read_excel(bookings_file, dtype={'Guest Zip Code': str})
+    else:
+        df = pq.read_table(bookings_file, memory_map=True).to_pandas()
+
+    # Convert date columns to datetime
+    df['Check-in Date'] = pd.to_datetime(df['Check-in Date'])
+    df['Check-out Date'] = pd.to_datetime(df['Check-out Date'])
+
+    # Calculate total nights
+    df['Total Nights'] = (df['Check-out Date'] - df['Check-in Date']).dt.days
+
+    return df[list(BOOKING_COLUMNS)]
+
+def report_progress(loaded, total, start_time):
+    """Print the number of rows loaded so far and the throughput."""
+    elapsed = time.perf_counter() - start_time
+    rate = loaded / elapsed if elapsed > 0 else 0.0
+    print(f"Loaded {loaded}/{total} rows ({loaded / total:.0%}) "
+          f"in {elapsed:.2f}s - {rate:,.0f} rows/s")
+
+def copy_bookings(cursor, df, chunk_size=DEFAULT_CHUNK_SIZE, sql=COPY_SQL):
+    """Stream the bookings into the table with COPY FROM STDIN, one chunk at a time.
+
+    Args:
+        cursor: psycopg2 cursor (or DryRunCursor).
+        df (pd.DataFrame): Bookings returned by read_bookings.
+        chunk_size (int): Number of rows sent per COPY statement.
+        sql (str): COPY statement matching the columns of df.
+
+    Returns:
+        int: Number of rows sent.
+    """
+    total = len(df)
+    start_time = time.perf_counter()
+    for offset in range(0, total, chunk_size):
+        chunk = df.iloc[offset:offset + chunk_size]
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, header=False, index=False, date_format='%Y-%m-%d')
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        report_progress(offset + len(chunk), total, start_time)
+    return total
+
+def insert_bookings(cursor, df):
+    """Insert the bookings one row at a time (legacy loader).
+
+    Args:
+        cursor: psycopg2 cursor (or DryRunCursor).
+        df (pd.DataFrame): Bookings returned by read_bookings.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    total = len(df)
+    start_time = time.perf_counter()
+    for loaded, (_, row) in enumerate(df.iterrows(), start=1):
+        cursor.execute("""
+            INSERT INTO bookings (
+                hotel_name, room_id, room_type, room_category,
+                check_in_date, check_out_date, total_nights, guest_first_name,
+                guest_last_name, guest_email, guest_phone,
+                guest_country, guest_city, guest_address,
+                guest_zip_code, meal_plan, total_price
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, (
+            row['Hotel Name'], row['Room ID'], row['Room Type'],
+            row['Room Category'], row['Check-in Date'], row['Check-out Date'],
+            row['Total Nights'], row['Guest First Name'], row['Guest Last Name'], row['Guest Email'],
+            row['Guest Phone'], row['Guest Country'], row['Guest City'],
+            row['Guest Address'], row['Guest Zip Code'], row['Meal Plan'],
+            row['Total Price']
+        ))
+        if loaded % DEFAULT_CHUNK_SIZE == 0 or loaded == total:
+            report_progress(loaded, total, start_time)
+    return total
+
+def read_hotel_rooms(hotels_file, df):
+    """List the hotels and rooms of the dimension tables.
+
+    Hotels and rooms come from hotels.json when it exists, so rooms without
+    bookings still count as available; anything only found in the bookings
+    is added after them.
+
+    Args:
+        hotels_file (str): Path to hotels.json (may not exist).
+        df (pd.DataFrame): Bookings returned by read_bookings.
+
+    Returns:
+        tuple: ({hotel name: (city, country)},
+                {(hotel name, room id): (room type, room category)})
+    """
+    hotels = {}
+    rooms = {}
+    if hotels_file and os.path.exists(hotels_file):
+        with open(hotels_file, 'r', encoding='utf-8') as file:
+            for hotel in json.load(file).get('Hotels', []):
+                address = hotel.get('Address', {})
+                hotels[hotel['Name']] = (address.get('City'), address.get('Country'))
+                for room in hotel.get('Rooms', []):
+                    rooms[(hotel['Name'], room['RoomId'])] = (room.get('Type'), room.get('Category'))
+
+    for hotel_name in df['Hotel Name'].unique():
+        hotels.setdefault(hotel_name, (None, None))
+    booked_rooms = df[['Hotel Name', 'Room ID', 'Room Type', 'Room Category']].drop_duplicates()
+    for hotel_name, room_id, room_type, category in booked_rooms.itertuples(index=False):
+        rooms.setdefault((hotel_name, room_id), (room_type, category))
+    return hotels, rooms
+
+def load_dimensions(cursor, hotels, rooms):
+    """Upsert the hotel and room dimension rows and return their keys.
+
+    Args:
+        cursor: psycopg2 cursor (or DryRunCursor).
+        hotels (dict): Hotels returned by read_hotel_rooms.
+        rooms (dict): Rooms returned by read_hotel_rooms.
+
+    Returns:
+        tuple: ({hotel name: hotel_id}, {(hotel name, room id): room_key})
+    """
+    hotel_ids = {}
+    for hotel_name, (city, country) in hotels.items():
+        cursor.execute("""
+            INSERT INTO hotels (hotel_name, city, country) VALUES (%s, %s, %s)
+            ON CONFLICT (hotel_name) DO UPDATE
+                SET city = EXCLUDED.city, country = EXCLUDED.country
+            RETURNING hotel_id
+        """, (hotel_name, city, country))
+        hotel_ids[hotel_name] = cursor.fetchone()[0]
+
+    room_keys = {}
+    for (hotel_name, room_id), (room_type, category) in rooms.items():
+        cursor.execute("""
+            INSERT INTO rooms (hotel_id, room_id, room_type, room_category)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (hotel_id, room_id) DO UPDATE
+                SET room_type = EXCLUDED.room_type, room_category = EXCLUDED.room_category
+            RETURNING room_key
+        """, (hotel_ids[hotel_name], room_id, room_type, category))
+        room_keys[(hotel_name, room_id)] = cursor.fetchone()[0]
+
+    print(f"Loaded {len(hotel_ids)} hotels and {len(room_keys)} rooms into the dimension tables")
+    return hotel_ids, room_keys
+
+def create_partitions(cursor, df):
+    """Create the monthly bookings partitions covering the check-in dates of df."""
+    if df.empty:
+        return
+    cursor.execute("SELECT create_booking_partitions(%s, %s)",
+                   (df['Check-in Date'].min().date(), df['Check-in Date'].max().date()))
+
+def copy_bookings_performance(cursor, df, hotels_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Load the bookings into the performance schema.
+
+    Args:
+        cursor: psycopg2 cursor (or DryRunCursor).
+        df (pd.DataFrame): Bookings returned by read_bookings.
+        hotels_file (str): Path to hotels.json used for the dimensions.
+        chunk_size (int): Number of rows per COPY statement.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    hotel_ids, room_keys = load_dimensions(cursor, *read_hotel_rooms(hotels_file, df))
+    create_partitions(cursor, df)
+
+    df = df.assign(**{
+        'Hotel ID': df['Hotel Name'].map(hotel_ids),
+        'Room Key': [room_keys[key] for key in zip(df['Hotel Name'], df['Room ID'])],
+    })
+    columns = {**DIMENSION_COLUMNS, **BOOKING_COLUMNS}
+    return copy_bookings(cursor, df[list(columns)], chunk_size, copy_sql(columns.values()))
+
+def load_bookings(cursor, bookings_file, mode="copy", chunk_size=DEFAULT_CHUNK_SIZE,
+                  schema="basic", hotels_file=DEFAULT_HOTELS_FILE):
+    """Read the bookings file and load it with the selected loader.
+
+    Args:
+        cursor: psycopg2 cursor (or DryRunCursor).
+        bookings_file (str): Path to all_bookings.parquet (or all_bookings.xlsx).
+        mode (str): "copy" (bulk COPY in chunks) or "insert" (row by row).
+        chunk_size (int): Number of rows per COPY statement.
+        schema (str): "basic" (init.sql) or "performance" (init_performance.sql).
+        hotels_file (str): Path to hotels.json (performance schema only).
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    read_start = time.perf_counter()
+    df = read_bookings(bookings_file)
+    print(f"Read {len(df)} rows from {bookings_file} in {time.perf_counter() - read_start:.2f}s")
+
+    load_start = time.perf_counter()
+    if schema == "performance":
+        loaded = copy_bookings_performance(cursor, df, hotels_file, chunk_size)
+    elif mode == "insert":
+        loaded = insert_bookings(cursor, df)
+    else:
+        loaded = copy_bookings(cursor, df, chunk_size)
+    elapsed = time.perf_counter() - load_start
+    rate = loaded / elapsed if elapsed > 0 else 0.0
+    print(f"Loaded {loaded} rows with {mode.upper()} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return loaded
+
+def load_bookings_to_postgres(bookings_file=DEFAULT_BOOKINGS_FILE, mode="copy",
+                              chunk_size=DEFAULT_CHUNK_SIZE, host=None, port=None,
+                              dry_run=False, schema="basic",
+                              hotels_file=DEFAULT_HOTELS_FILE):
+    """Load booking data from the bookings file into PostgreSQL database."""
+    if dry_run:
+        cursor = DryRunCursor()
+        load_bookings(cursor, bookings_file, mode, chunk_size, schema, hotels_file)
+        dimensions = f" + {cursor.dimension_rows} dimension rows" if cursor.dimension_rows else ""
+        print(f"Dry run: {cursor.rows} booking rows{dimensions}, {cursor.bytes} bytes "
+              f"in {cursor.statements} statements (nothing written).")
+        return
+
+    if psycopg2 is None:
+        print("psycopg2 is not installed; use --dry-run to load without a database.")
+        return
+
+    conn = None
+    cursor = None
     try:
         # Connect to PostgreSQL using environment variables
         conn = psycopg2.connect(
-            host="bookings-db",
+            host=host or os.getenv('POSTGRES_HOST', 'bookings-db'),
+            port=port or os.getenv('POSTGRES_PORT', '5432'),
             database=os.getenv('POSTGRES_DB'),
             user=os.getenv('POSTGRES_USER'),
             password=os.getenv('POSTGRES_PASSWORD')
@@ -39,38 +388,10 @@ def load_excel_to_postgres():
         # Check if table exists and create it if it doesn't
         if not check_table_exists(cursor, 'bookings'):
             print("Table 'bookings' does not exist. Creating it...")
-            execute_sql_file(cursor, '/app/db/init.sql')
+            execute_sql_file(cursor, SCHEMA_FILES[schema])
             conn.commit()
 
-        # Read the Excel file
-        excel_file = "/app/data/all_bookings.xlsx"
-        df = pd.read_excel(excel_file)
-
-        # Convert date columns to datetime
-        df['Check-in Date'] = pd.to_datetime(df['Check-in Date'])
-        df['Check-out Date'] = pd.to_datetime(df['Check-out Date'])
-        
-        # Calculate total nights
-        df['Total Nights'] = (df['Check-out Date'] - df['Check-in Date']).dt.days
-
-        # Insert data into the database
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO bookings (
-                    hotel_name, room_id, room_type, room_category,
-                    check_in_date, check_out_date, total_nights, guest_first_name,
-                    guest_last_name, guest_email, guest_phone,
-                    guest_country, guest_city, guest_address,
-                    guest_zip_code, meal_plan, total_price
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                row['Hotel Name'], row['Room ID'], row['Room Type'],
-                row['Room Category'], row['Check-in Date'], row['Check-out Date'],
-                row['Total Nights'], row['Guest First Name'], row['Guest Last Name'], row['Guest Email'],
-                row['Guest Phone'], row['Guest Country'], row['Guest City'],
-                row['Guest Address'], row['Guest Zip Code'], row['Meal Plan'],
-                row['Total Price']
-            ))
+        load_bookings(cursor, bookings_file, mode, chunk_size, schema, hotels_file)
 
         # Commit the transaction
         conn.commit()
@@ -80,9 +401,47 @@ def load_excel_to_postgres():
         print(f"Error while connecting to PostgreSQL: {error}")
     finally:
         if conn:
-            cursor.close()
+            if cursor:
+                cursor.close()
             conn.close()
             print("PostgreSQL connection is closed.")
 
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Load the bookings file into PostgreSQL.")
+    parser.add_argument("--file", default=DEFAULT_BOOKINGS_FILE,
+                        help=f"Bookings Parquet or Excel file (default: {DEFAULT_BOOKINGS_FILE})")
+    parser.add_argument("--mode", choices=["copy", "insert"], default="copy",
+                        help="Bulk COPY in chunks (default) or row-by-row INSERT")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per COPY statement (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--host", default=None,
+                        help="PostgreSQL host (default: $POSTGRES_HOST or bookings-db)")
+    parser.add_argument("--port", default=None,
+                        help="PostgreSQL port (default: $POSTGRES_PORT or 5432)")
+    parser.add_argument("--schema", choices=sorted(SCHEMA_FILES),
+                        default=os.getenv('DATABASE_SCHEMA', 'basic'),
+                        help="Table layout to load into (default: $DATABASE_SCHEMA or basic)")
+    parser.add_argument("--hotels-file", default=DEFAULT_HOTELS_FILE,
+                        help=f"hotels.json for the dimension tables (default: {DEFAULT_HOTELS_FILE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Stream the rows to a local stand-in instead of PostgreSQL")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.schema == "performance" and args.mode == "insert":
+        parser.error("the performance schema is only loaded with --mode copy")
+    return args
+
 if __name__ == "__main__":
-    load_excel_to_postgres()
+    arguments = parse_args()
+    load_bookings_to_postgres(
+        bookings_file=arguments.file,
+        mode=arguments.mode,
+        chunk_size=arguments.chunk_size,
+        host=arguments.host,
+        port=arguments.port,
+        schema=arguments.schema,
+        hotels_file=arguments.hotels_file,
+        dry_run=arguments.dry_run
+    )
@@ -1,19 +1,26 @@
 """Module for generating synthetic hotel and booking data."""
 
+import argparse
 import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import yaml
 
 # Add parent directory to path to allow running directly: python gen_synthetic_hotels.py
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.generator.hotel_generator import generate_hotels
-from src.generator.booking_generator import generate_hotel_bookings
+from src.generator.booking_generator import generate_hotel_bookings, derive_hotel_seed
 from src.generator.hotel_query_generator import HotelQueryGenerator
 from src.output.booking_output_writer import \
-    generate_file_md_hotel_bookings, \
-    generate_file_excel_all_bookings
+    write_hotel_bookings, \
+    MarkdownHotelBookingsWriter, \
+    ParquetAllBookingsWriter, \
+    ExcelAllBookingsWriter, \
+    DEFAULT_CHUNK_SIZE
+from src.output.booking_cube_writer import OccupancyRevenueCubeWriter
 from src.output.hotel_output_writer import \
     generate_file_json_for_hotels, \
     generate_file_excel_for_hotels, \
@@ -75,7 +82,98 @@ def load_config_queries(config_path="../config/hotel_queries.yaml"):
 
     return config
 
+def parse_args(argv=None):
+    """Parse the command line arguments.
+
+    Args:
+        argv (list): Arguments to parse (defaults to sys.argv).
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic hotel and booking data.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes generating hotel bookings (default: 1)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Master seed of the booking generation (default: 42)")
+    parser.add_argument("--excel", action="store_true",
+                        help="Also export all bookings to all_bookings.xlsx")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Bookings written per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+def _hotel_bookings_seed(hotel, master_seed):
+    return derive_hotel_seed(master_seed, hotel["hotelkey"])
+
+def _generate_bookings_for_hotel(task):
+    """Generate the bookings of one hotel (entry point of the worker processes).
+
+    Args:
+        task (tuple): (hotel, config, master seed).
+
+    Returns:
+        list: The hotel bookings.
+    """
+    hotel, config, master_seed = task
+    return list(generate_hotel_bookings(hotel, config,
+                                        seed=_hotel_bookings_seed(hotel, master_seed)))
+
+def iter_all_hotel_bookings(hotel_list, config, master_seed, workers=1):
+    """Generate the bookings of every hotel, optionally in a process pool.
+
+    Each hotel uses its own random streams derived from the master seed and
+    its hotel key, so the result does not depend on the number of workers.
+    In-process, the bookings of each hotel are a lazy generator. With a pool,
+    at most `workers` hotels are in flight at a time, so memory does not grow
+    with the number of hotels.
+
+    Args:
+        hotel_list (list): Hotels to generate bookings for.
+        config (dict): Hotel generation configuration.
+        master_seed (int): Master seed of the booking generation.
+        workers (int): Number of worker processes (1 generates in-process).
+
+    Yields:
+        dict: 'HotelKey', 'HotelName' and 'Bookings' of each hotel, in the
+            order of hotel_list.
+    """
+    if workers <= 1 or len(hotel_list) <= 1:
+        for hotel in hotel_list:
+            yield {
+                "HotelKey": hotel["hotelkey"],
+                "HotelName": hotel["Name"],
+                "Bookings": generate_hotel_bookings(hotel, config,
+                                                    seed=_hotel_bookings_seed(hotel, master_seed))
+            }
+        return
+
+    hotels = iter(hotel_list)
+    with ProcessPoolExecutor(max_workers=min(workers, len(hotel_list))) as executor:
+        pending = deque()
+        for hotel in hotels:
+            pending.append((hotel, executor.submit(_generate_bookings_for_hotel,
+                                                   (hotel, config, master_seed))))
+            if len(pending) >= workers:
+                break
+        while pending:
+            hotel, future = pending.popleft()
+            next_hotel = next(hotels, None)
+            if next_hotel is not None:
+                pending.append((next_hotel, executor.submit(_generate_bookings_for_hotel,
+                                                            (next_hotel, config, master_seed))))
+            yield {
+                "HotelKey": hotel["hotelkey"],
+                "HotelName": hotel["Name"],
+                "Bookings": future.result()
+            }
+
 if __name__ == "__main__":
+    args = parse_args()
     start_time = time.time()
     # Get absolute paths based on script location
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -88,9 +186,8 @@ if __name__ == "__main__":
                                          "../config/generate_hotels_param.yaml"))
     queries_config = load_config_queries(os.path.join(script_dir,
                                         "../config/hotel_queries.yaml"))
-    print(f"hotelGenerationConfig: {os.path.join(script_dir,
-                                        "../config/generate_hotels_param.yaml")}")
-    print(f"queries_config: {os.path.join(script_dir, "../config/hotel_queries.yaml")}")
+    print(f"hotelGenerationConfig: {os.path.join(script_dir, '../config/generate_hotels_param.yaml')}")
+    print(f"queries_config: {os.path.join(script_dir, '../config/hotel_queries.yaml')}")
     
     # Resolve output paths from config (relative paths are resolved from project_root)
     config_hotels_path = hotelGenerationConfig["process"]["output_path_hotels"]
@@ -118,19 +215,25 @@ if __name__ == "__main__":
     generate_file_md_hotel_rooms(hotel_list, OUTPUT_PATH_HOTELS)
 
 
-    hotel_booking_list = []
-
-    for hotel_to_book in hotel_list:
-        hotel_bookings = generate_hotel_bookings(hotel_to_book, hotelGenerationConfig)
-        # generate_file_json_for_bookings(hotel_bookings, hotel_to_book["hotelkey"],
-        #       hotel_to_book["Name"], OUTPUT_PATH_BOOKINGS)
-        # generate_file_excel_for_bookings(hotel_bookings, hotel_to_book["hotelkey"],
-        #           hotel_to_book["Name"], OUTPUT_PATH_BOOKINGS)
-        hotel_booking_list.append(hotel_bookings)
-
-    generate_file_md_hotel_bookings(hotel_booking_list, OUTPUT_PATH_HOTELS)
-    generate_file_excel_all_bookings(hotel_booking_list,
-                                     os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.xlsx"))
+    bookings_start_time = time.time()
+    booking_writers = [
+        MarkdownHotelBookingsWriter(OUTPUT_PATH_HOTELS),
+        ParquetAllBookingsWriter(os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.parquet")),
+        OccupancyRevenueCubeWriter(hotel_list, hotelGenerationConfig,
+                                   os.path.join(OUTPUT_PATH_BOOKINGS, "booking_cube.json"))
+    ]
+    if args.excel:
+        booking_writers.append(
+            ExcelAllBookingsWriter(os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.xlsx"))
+        )
+    # Bookings are generated and written chunk by chunk, never all at once
+    total_bookings = write_hotel_bookings(
+        iter_all_hotel_bookings(hotel_list, hotelGenerationConfig, args.seed, args.workers),
+        booking_writers,
+        args.chunk_size
+    )
+    print(f"{total_bookings} bookings generated for {len(hotel_list)} hotels with "
+          f"{args.workers} worker(s) in {time.time() - bookings_start_time:.2f} sg")
 
     end_time = time.time()
     elapsed_time = end_time - start_time
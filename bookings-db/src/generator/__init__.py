@@ -1,7 +1,11 @@
 """Generator package for creating synthetic hotel and booking data."""
 
 from .hotel_generator import generate_hotels
-from .booking_generator import generate_hotel_bookings, all_date_slots, adjust_slots_forecast
+from .booking_generator import (
+    generate_hotel_bookings,
+    derive_hotel_seed
+)
+from .booking_engine import generate_booking_arrays
 from .hotel_query_generator import HotelQueryGenerator
 from .hotel_name_location_generator import HotelNameLocationGenerator
 from .parametric_utils import *
@@ -39,8 +43,8 @@ __all__ = [
 
     # Booking generation
     'generate_hotel_bookings',
-    'all_date_slots',
-    'adjust_slots_forecast',
+    'derive_hotel_seed',
+    'generate_booking_arrays',
 
     # Query generation
     'HotelQueryGenerator',
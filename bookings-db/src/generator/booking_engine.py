@@ -0,0 +1,396 @@
+"""Vectorized engine for generating the synthetic bookings of a hotel.
+
+Generates slot boundaries, occupancy trimming, forecast reduction, booking
+attributes and prices as NumPy arrays for all rooms of a hotel at once, and
+draws every random value from a single numpy Generator, so a seed fully
+determines the output. It replaced the per-room, per-slot pipeline of the
+original generator and keeps its statistical rules.
+
+Dates are represented as day numbers (days since 1970-01-01) and months as
+month numbers (months since 1970-01).
+"""
+
+import calendar
+
+import numpy as np
+
+ROOM_CAPACITY = {"Single": 1, "Double": 2, "Triple": 3}
+
+# 1970-01-01 was a Thursday (weekday 3)
+EPOCH_WEEKDAY = 3
+
+
+def to_day_number(year: int, month: int, day: int) -> int:
+    """Convert a date to its day number."""
+    return int(np.datetime64(f"{year:04d}-{month:02d}-{day:02d}", "D").astype(np.int64))
+
+
+def weekday(days):
+    """Weekday of day numbers (Monday=0 ... Sunday=6)."""
+    return (days + EPOCH_WEEKDAY) % 7
+
+
+def month_number(days):
+    """Month numbers (months since 1970-01) of day numbers."""
+    return np.asarray(days, dtype="datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def days_in_month(months):
+    """Number of days of month numbers."""
+    first_day = np.asarray(months, dtype="datetime64[M]").astype("datetime64[D]")
+    next_first_day = (np.asarray(months) + 1).astype("datetime64[M]").astype("datetime64[D]")
+    return (next_first_day - first_day).astype(np.int64)
+
+
+def _cumsum_before_by_group(groups, values):
+    """
+    Running sum of values within each group, excluding the current element.
+
+    Args:
+        groups: Group of each element, with the elements of a group contiguous
+        values: Values to accumulate
+
+    Returns:
+        np.ndarray: Sum of the previous values of the same group
+    """
+    cumsum_before = np.cumsum(values) - values
+    is_first = np.ones(len(groups), dtype=bool)
+    is_first[1:] = groups[1:] != groups[:-1]
+    group_base = np.maximum.accumulate(np.where(is_first, cumsum_before, 0))
+    return cumsum_before - group_base
+
+
+def generate_slots(rng, first_day, last_day, num_rooms, min_slot=1, max_slot=13):
+    """
+    Generate the date slots of every room between two days.
+
+    All rooms advance one slot per step, each one with its own slot, week
+    and weekend counters. The first 6 slots (or the first week) and rooms
+    with more one-day Friday slots than weeks get a random duration; the
+    others last 1 to 4 days before Friday and 3 days from Friday on.
+
+    Parameters:
+    - rng (np.random.Generator): Random generator
+    - first_day (int): First day number of the range
+    - last_day (int): Last day number of the range (inclusive)
+    - num_rooms (int): Number of rooms
+    - min_slot (int): Minimum slot duration in days
+    - max_slot (int): Maximum slot duration in days
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray, np.ndarray]: room index, start day and end
+      day (inclusive) of each slot, sorted by room and start day
+    """
+    current = np.full(num_rooms, first_day, dtype=np.int64)
+    number_count = np.zeros(num_rooms, dtype=np.int64)
+    week_count = np.zeros(num_rooms, dtype=np.int64)
+    weekend_count = np.zeros(num_rooms, dtype=np.int64)
+
+    rooms, starts, ends = [], [], []
+    active = np.flatnonzero(current <= last_day)
+    while active.size:
+        slot_start = current[active]
+        slot_weekday = weekday(slot_start)
+        max_duration = np.minimum(max_slot, last_day - slot_start + 1)
+
+        # Random duration for the first slots or when weekends are over-represented,
+        # otherwise short stays on weekdays and 3 days from Friday on
+        random_rule = ((number_count[active] < 6) | (week_count[active] < 1)
+                       | (weekend_count[active] > week_count[active]))
+        duration = np.where(
+            random_rule,
+            rng.integers(min_slot, max_duration + 1),
+            np.where(slot_weekday < 4, rng.integers(1, 5, size=active.size), 3)
+        )
+        slot_end = np.minimum(slot_start + duration - 1, last_day)
+        weekend_count[active] += (slot_weekday == 4) & (duration == 1)
+
+        rooms.append(active)
+        starts.append(slot_start)
+        ends.append(slot_end)
+
+        current[active] = slot_end + 1
+        number_count[active] += 1
+        week_count[active] = (current[active] - first_day + 1) // 7
+        active = active[current[active] <= last_day]
+
+    if not rooms:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    rooms, starts, ends = np.concatenate(rooms), np.concatenate(starts), np.concatenate(ends)
+    order = np.lexsort((starts, rooms))
+    return rooms[order], starts[order], ends[order]
+
+
+def trim_slots_occupancy(rng, rooms, starts, ends, peak_months,
+                         occupancy_peak, occupancy_offseason):
+    """
+    Remove slots so each room matches the target occupancy of every month.
+
+    For each room and month above target, non-weekend slots are removed in
+    random order until the excess is gone and, off season, one random
+    weekend slot is removed too.
+
+    Parameters:
+    - rng (np.random.Generator): Random generator
+    - rooms, starts, ends (np.ndarray): Slots sorted by room and start day
+    - peak_months (np.ndarray): 12 booleans, True for peak season months
+    - occupancy_peak (int): Target occupancy percentage for peak season
+    - occupancy_offseason (int): Target occupancy percentage for off-season
+
+    Returns:
+    - np.ndarray: Boolean mask of the slots to keep
+    """
+    if not rooms.size:
+        return np.zeros(0, dtype=bool)
+    lengths = ends - starts + 1
+    months = month_number(starts)
+
+    # One group per room and month, in slot order
+    group_keys = rooms * (months.max() - months.min() + 1) + (months - months.min())
+    _, first_index, groups = np.unique(group_keys, return_index=True, return_inverse=True)
+    group_months = months[first_index]
+    group_is_peak = peak_months[group_months % 12]
+    target_occupancy = np.where(group_is_peak, occupancy_peak, occupancy_offseason)
+    target_days = ((target_occupancy / 100) * days_in_month(group_months)).astype(np.int64)
+    excess = np.bincount(groups, weights=lengths).astype(np.int64) - target_days
+    over_target = excess > 0
+
+    slot_weekday = weekday(starts)
+    weekend_slot = (slot_weekday >= 4) & (slot_weekday + lengths - 1 <= 6)
+    random_keys = rng.random(rooms.size)
+    keep = np.ones(rooms.size, dtype=bool)
+
+    # Non-weekend slots in random order until the excess days are removed
+    candidates = np.flatnonzero(~weekend_slot & over_target[groups])
+    order = candidates[np.lexsort((random_keys[candidates], groups[candidates]))]
+    removed_before = _cumsum_before_by_group(groups[order], lengths[order])
+    keep[order[removed_before < excess[groups[order]]]] = False
+
+    # One random weekend slot per off-season month above target
+    candidates = np.flatnonzero(weekend_slot & over_target[groups] & ~group_is_peak[groups])
+    order = candidates[np.lexsort((random_keys[candidates], groups[candidates]))]
+    first_of_group = np.ones(order.size, dtype=bool)
+    first_of_group[1:] = groups[order][1:] != groups[order][:-1]
+    keep[order[first_of_group]] = False
+
+    return keep
+
+
+def trim_slots_forecast(rooms, starts, ends, current_month, reduce_booking_list):
+    """
+    Reduce the occupancy of the months after the current one.
+
+    Slots up to the current month are kept; for each month listed in
+    reduce_booking_list only the first slots covering (100 - reduction)% of
+    the booked days are kept, truncating the last one; later months are
+    dropped.
+
+    Parameters:
+    - rooms, starts, ends (np.ndarray): Slots sorted by room and start day
+    - current_month (str): The current month in "YYYY-MM" format
+    - reduce_booking_list (List[int]): Reduction percentages for the following months
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray]: Mask of the slots to keep and their new end days
+    """
+    if not rooms.size:
+        return np.zeros(0, dtype=bool), ends
+    current_year, current_month_num = map(int, current_month.split('-'))
+    current = (current_year - 1970) * 12 + current_month_num - 1
+
+    # Month arithmetic of the original generator. It maps the January after
+    # the current month to January of the current year, whose slots the
+    # original generator then added a second time; months up to the current
+    # one are kept as they are instead.
+    reductions = {}
+    for i, reduction in enumerate(reduce_booking_list):
+        year_to_adjust = current_year + (current_month_num + i - 1) // 12
+        month_to_adjust = (current_month_num + i) % 12 + 1
+        month = (year_to_adjust - 1970) * 12 + month_to_adjust - 1
+        if month > current:
+            reductions.setdefault(month, reduction)
+
+    lengths = ends - starts + 1
+    months = month_number(starts)
+    reduction = np.array([reductions.get(month, np.nan) for month in months.tolist()])
+    keep = months <= current
+    new_ends = ends.copy()
+
+    listed = np.flatnonzero(~keep & ~np.isnan(reduction))
+    if listed.size:
+        group_keys = rooms[listed] * (months.max() + 1) + months[listed]
+        _, groups = np.unique(group_keys, return_inverse=True)
+        total_days = np.bincount(groups, weights=lengths[listed]).astype(np.int64)
+        group_reduction = np.zeros(total_days.size)
+        group_reduction[groups] = reduction[listed]
+        target_days = (total_days * (1 - (group_reduction / 100))).astype(np.int64)
+
+        kept_before = _cumsum_before_by_group(groups, lengths[listed])
+        slot_target = target_days[groups]
+        keep[listed] = kept_before < slot_target
+        new_ends[listed] = starts[listed] + np.minimum(lengths[listed], slot_target - kept_before) - 1
+
+    return keep, new_ends
+
+
+def choose(rng, size, values, weights):
+    """
+    Draw values with the given weights (as random.choices does).
+
+    Parameters:
+    - rng (np.random.Generator): Random generator
+    - size (int): Number of values to draw
+    - values (list): Values to choose from
+    - weights (list): Relative weights of the values
+
+    Returns:
+    - np.ndarray: Drawn values
+    """
+    probabilities = np.asarray(weights, dtype=float)
+    return np.asarray(values)[rng.choice(len(values), size=size, p=probabilities / probabilities.sum())]
+
+
+def choose_meal_plans(rng, size, meal_plan_weights):
+    """
+    Draw meal plans with the hotel weights (as get_meal_plan does).
+
+    Falls back to the first meal plan when the weights don't add up to 1
+    and the draw lands past the last cumulative weight.
+    """
+    names = [data['name'] for data in meal_plan_weights.values()]
+    cumulative = np.cumsum([data['weight'] for data in meal_plan_weights.values()])
+    choice = np.searchsorted(cumulative, rng.random(size), side='right')
+    choice[choice >= len(names)] = 0
+    return np.asarray(names)[choice]
+
+
+def compute_total_prices(starts, ends, capacity, number_of_guests, extra_bed,
+                         meal_plan_multiplier, promotion, price_off, price_peak,
+                         peak_months, synthetic_params):
+    """
+    Calculate the total price of many bookings at once.
+
+    This is the single implementation of the pricing rules:
+    parametric_utils.get_total_price calls it for one booking. Each night
+    from check-in to check-out (exclusive) is charged at the peak or off
+    season price depending on its month.
+
+    Returns:
+    - np.ndarray: Total price of each booking rounded to 2 decimals
+    """
+    if not starts.size:
+        return np.zeros(0)
+    factor = meal_plan_multiplier.astype(float)
+    factor = np.where(number_of_guests < capacity,
+                      factor * (1 - synthetic_params["OccupancyBaseDiscountPercentage"] / 100),
+                      factor)
+    factor = np.where(extra_bed,
+                      factor * (1 + synthetic_params["ExtraBedChargePercentage"] / 100),
+                      factor)
+
+    first_day = starts.min()
+    days = np.arange(first_day, max(ends.max(), first_day) + 1)
+    cumulative_peak = np.concatenate(([0], np.cumsum(peak_months[month_number(days) % 12])))
+    nights = np.maximum(ends - starts, 0)
+    peak_nights = cumulative_peak[starts + nights - first_day] - cumulative_peak[starts - first_day]
+
+    total = (price_off * (nights - peak_nights) + price_peak * peak_nights) * factor
+    total = np.where(promotion,
+                     total * (1 - (synthetic_params["PromotionPriceDiscount"] / 100)),
+                     total)
+    return np.round(total, 2)
+
+
+def generate_booking_arrays(rng, hotel, config, guest_locations):
+    """
+    Generate all the bookings of a hotel as arrays.
+
+    Parameters:
+    - rng (np.random.Generator): Random generator
+    - hotel (dict): Hotel information
+    - config (dict): Configuration
+    - guest_locations (Dict[str, List[str]]): Guest cities by country
+
+    Returns:
+    - dict: One array per booking attribute, in room and check-in order
+    """
+    synthetic_params = hotel["SyntheticParams"]
+    occupancy = config["hotel_occupancy"]
+    peak_months = np.array([calendar.month_name[month] in config["peak_season_months"]
+                            for month in range(1, 13)])
+    first_day = to_day_number(occupancy["booking_year"]["start"], 1, 1)
+    last_day = to_day_number(occupancy["booking_year"]["end"], 12, 31)
+
+    # Slots of every room
+    rooms_info = hotel["Rooms"]
+    rooms, starts, ends = generate_slots(rng, first_day, last_day, len(rooms_info))
+    keep = trim_slots_occupancy(rng, rooms, starts, ends, peak_months,
+                                synthetic_params["OccupancyPeakSeasonWeight"],
+                                synthetic_params["OccupancyOffSeasonWeight"])
+    rooms, starts, ends = rooms[keep], starts[keep], ends[keep]
+    keep, ends = trim_slots_forecast(rooms, starts, ends,
+                                     occupancy["current_month"],
+                                     occupancy["forecast_reduction_percentage"])
+    rooms, starts, ends = rooms[keep], starts[keep], ends[keep]
+    size = rooms.size
+
+    # Room attributes
+    room_type = np.array([room["Type"] for room in rooms_info] or [""])[rooms]
+    capacity = np.array([room["Guests"] for room in rooms_info] or [0], dtype=np.int64)[rooms]
+    type_capacity = np.array([ROOM_CAPACITY.get(room["Type"], 0) for room in rooms_info] or [0],
+                             dtype=np.int64)[rooms]
+
+    # Booking parameters
+    non_refundable = choose(rng, size, ["Yes", "No"], [30, 70])
+    extra_bed = np.where(capacity == 1, "N/A", choose(rng, size, ["Yes", "No"], [5, 95]))
+    number_of_guests = np.select(
+        [capacity == 1, capacity == 2, capacity == 3],
+        [1, choose(rng, size, [1, 2], [10, 90]), choose(rng, size, [2, 3], [10, 70])],
+        default=1
+    ) + (extra_bed == "Yes")
+
+    # Booking attributes
+    country_names = list(guest_locations)
+    country = rng.integers(0, len(country_names), size=size)
+    city_count = np.array([len(guest_locations[name]) for name in country_names])[country]
+    city = (rng.random(size) * city_count).astype(np.int64)
+    meal_plan = choose_meal_plans(rng, size, synthetic_params["MealPlanWeights"])
+    promotion = choose(rng, size, ["Yes", "No"], [20, 80])
+    cancellation_fee = np.where(non_refundable == "Yes", "N/A",
+                                choose(rng, size, ["15%", "25%", "35%"], [20, 50, 30]))
+    six_months = 6 * 30 * 86400
+    reservation_day = starts - 6 * 30 + rng.integers(0, six_months + 1, size=size) // 86400
+
+    meal_plan_prices = synthetic_params["MealPlanPrices"]
+    total_price = compute_total_prices(
+        starts, ends, type_capacity, number_of_guests, extra_bed == "Yes",
+        np.array([meal_plan_prices[name] for name in meal_plan.tolist()], dtype=float),
+        promotion == "Yes",
+        np.array([room["PriceOffSeason"] for room in rooms_info] or [0.0])[rooms],
+        np.array([room["PricePeakSeason"] for room in rooms_info] or [0.0])[rooms],
+        peak_months,
+        synthetic_params
+    )
+
+    return {
+        "room": rooms,
+        "check_in_day": starts,
+        "check_out_day": ends,
+        "reservation_day": reservation_day,
+        "reservation_id": rng.integers(1, 1000000, size=size),
+        "room_type": room_type,
+        "number_of_guests": number_of_guests,
+        "extra_bed": extra_bed,
+        "work_travel": choose(rng, size, ["Yes", "No"], [30, 70]),
+        "guest_country": np.array(country_names)[country],
+        "guest_city": np.array([guest_locations[country_names[c]][i]
+                                for c, i in zip(country.tolist(), city.tolist())], dtype=object),
+        "meal_plan": meal_plan,
+        "free_cancellation": choose(rng, size, ["Yes", "No"], [40, 60]),
+        "promotion": promotion,
+        "non_refundable": non_refundable,
+        "cancellation_fee": cancellation_fee,
+        "cancellation_status": choose(rng, size, ["Cancelled", "Active"], [5, 95]),
+        "total_price": total_price,
+    }
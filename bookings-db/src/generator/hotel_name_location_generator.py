@@ -2,7 +2,7 @@
 
 import os
 import random
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import yaml
 from faker import Faker
@@ -133,6 +133,15 @@ class HotelNameLocationGenerator:
         city = random.choice(self._hotel_locations[country])
         return country, city
 
+    def get_guest_locations(self) -> Dict[str, List[str]]:
+        """
+        Get the configured guest locations.
+
+        Returns:
+            Dict[str, List[str]]: Guest cities by country
+        """
+        return self._guest_locations
+
     def generate_guest_location(self) -> Tuple[str, str]:
         """
         Generate a guest location.
@@ -4,7 +4,16 @@ from .booking_output_writer import (
     generate_file_json_for_bookings,
     generate_file_excel_for_bookings,
     generate_file_md_hotel_bookings,
-    generate_file_excel_all_bookings
+    generate_file_excel_all_bookings,
+    generate_file_parquet_all_bookings,
+    write_hotel_bookings,
+    ParquetAllBookingsWriter,
+    ExcelAllBookingsWriter,
+    MarkdownHotelBookingsWriter
+)
+from .booking_cube_writer import (
+    generate_file_json_booking_cube,
+    OccupancyRevenueCubeWriter
 )
 from .hotel_output_writer import (
     generate_file_json_for_hotels,
@@ -22,6 +31,13 @@ __all__ = [
     'generate_file_excel_for_bookings',
     'generate_file_md_hotel_bookings',
     'generate_file_excel_all_bookings',
+    'generate_file_parquet_all_bookings',
+    'write_hotel_bookings',
+    'ParquetAllBookingsWriter',
+    'ExcelAllBookingsWriter',
+    'MarkdownHotelBookingsWriter',
+    'generate_file_json_booking_cube',
+    'OccupancyRevenueCubeWriter',
 
     # Hotel output functions
     'generate_file_json_for_hotels',
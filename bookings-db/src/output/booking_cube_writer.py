@@ -0,0 +1,134 @@
+"""Module for writing the occupancy/revenue cube of the generated bookings.
+
+The cube aggregates the bookings by hotel, room type, room category, meal
+plan and month. It is small enough for the API to load in memory and answer
+occupancy and revenue questions with dictionary lookups.
+
+Attribution rules:
+- NightsSold counts every night in the month it is spent (a stay over the
+  end of a month is split between both months).
+- Bookings and Revenue are counted in the month of the check-in date, the
+  date the price is computed from.
+- AvailableRoomNights (in Capacity, as it does not depend on the meal plan)
+  is the number of rooms times the days of the month, for every month of
+  the configured booking years.
+"""
+
+import calendar
+import json
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from io import TextIOWrapper
+from typing import cast, Any, Dict, Iterable, List, Tuple
+
+from .booking_output_writer import BookingChunkWriter, write_hotel_bookings
+
+CUBE_DIMENSIONS = ["Hotel", "RoomType", "RoomCategory", "MealPlan", "Month"]
+CUBE_MEASURES = ["NightsSold", "Bookings", "Revenue"]
+CAPACITY_DIMENSIONS = ["Hotel", "RoomType", "RoomCategory", "Month"]
+CAPACITY_MEASURES = ["AvailableRoomNights"]
+
+
+def _month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def split_nights_by_month(check_in: date, check_out: date) -> List[Tuple[str, int]]:
+    """Split the nights of a stay by the month they are spent in.
+
+    Args:
+        check_in: Check-in date
+        check_out: Check-out date (the night before it is the last one)
+
+    Returns:
+        List of (YYYY-MM, nights) tuples
+    """
+    nights = []
+    current = check_in
+    while current < check_out:
+        next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = min(next_month, check_out)
+        nights.append((_month_key(current), (end - current).days))
+        current = end
+    return nights
+
+
+def build_capacity(hotel_list: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[tuple, int]:
+    """Compute the available room-nights per hotel, room type, category and month.
+
+    Args:
+        hotel_list: Generated hotels (with their 'Rooms')
+        config: Hotel generation configuration (hotel_occupancy.booking_year)
+
+    Returns:
+        Dict of (hotel, room type, category, YYYY-MM) -> available room-nights
+    """
+    booking_year = config["hotel_occupancy"]["booking_year"]
+    months = [
+        (year, month)
+        for year in range(booking_year["start"], booking_year["end"] + 1)
+        for month in range(1, 13)
+    ]
+    capacity = {}
+    for hotel in hotel_list:
+        rooms = Counter((room["Type"], room["Category"]) for room in hotel["Rooms"])
+        for (room_type, category), count in rooms.items():
+            for year, month in months:
+                key = (hotel["Name"], room_type, category, f"{year:04d}-{month:02d}")
+                capacity[key] = count * calendar.monthrange(year, month)[1]
+    return capacity
+
+
+class OccupancyRevenueCubeWriter(BookingChunkWriter):
+    """Aggregate the bookings into the occupancy/revenue cube (JSON file)."""
+
+    def __init__(self, hotel_list: List[Dict[str, Any]], config: Dict[str, Any], output_path: str):
+        self.output_path = output_path
+        self._capacity = build_capacity(hotel_list, config)
+        # (hotel, type, category, meal plan, month) -> [nights, bookings, revenue]
+        self._cells = defaultdict(lambda: [0, 0, 0.0])
+
+    def write_chunk(self, hotel_name: str, bookings: List[Dict[str, Any]]) -> None:
+        for booking in bookings:
+            room = (hotel_name, booking["RoomType"], booking["RoomCategory"], booking["MealPlan"])
+            check_in = date.fromisoformat(booking["CheckInDate"])
+            check_out = date.fromisoformat(booking["CheckOutDate"])
+            for month, nights in split_nights_by_month(check_in, check_out):
+                self._cells[room + (month,)][0] += nights
+            cell = self._cells[room + (_month_key(check_in),)]
+            cell[1] += 1
+            cell[2] += booking["TotalPrice"]
+
+    def close(self) -> None:
+        cube = {
+            "Dimensions": CUBE_DIMENSIONS,
+            "Measures": CUBE_MEASURES,
+            "Cells": [
+                list(key) + [nights, bookings, round(revenue, 2)]
+                for key, (nights, bookings, revenue) in sorted(self._cells.items())
+            ],
+            "CapacityDimensions": CAPACITY_DIMENSIONS,
+            "CapacityMeasures": CAPACITY_MEASURES,
+            "Capacity": [list(key) + [value] for key, value in sorted(self._capacity.items())],
+        }
+        with open(self.output_path, "w", encoding="utf-8") as file:
+            json.dump(cube, cast(TextIOWrapper, file), ensure_ascii=False)
+        print(f"Occupancy/revenue cube written to: {self.output_path}")
+
+
+def generate_file_json_booking_cube(
+    booking_list: Iterable[Dict[str, Any]],
+    hotel_list: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    output_path: str
+) -> None:
+    """Generate the occupancy/revenue cube JSON file.
+
+    Args:
+        booking_list: Hotel booking dictionaries ('Bookings' may be generators)
+        hotel_list: Generated hotels (with their 'Rooms')
+        config: Hotel generation configuration
+        output_path: Path to write the JSON file
+    """
+    write_hotel_bookings(booking_list,
+                         [OccupancyRevenueCubeWriter(hotel_list, config, output_path)])
@@ -1,161 +1,351 @@
-"""Module for writing booking data to output files in various formats (JSON, Excel, MD)."""
-
-import json
-import re
-from io import TextIOWrapper
-from typing import cast, Dict, List, Any
-import pandas as pd
-
-def generate_file_json_for_bookings(
-    bookings: Dict[str, Any],
-    hotel_key: str,
-    hotel_name: str,
-    output_path: str
-) -> None:
-    """Generate a JSON file containing booking data for a specific hotel.
-
-    Args:
-        bookings: Dictionary containing booking data with 'Bookings' key
-        hotel_key: Unique identifier for the hotel
-        hotel_name: Name of the hotel
-        output_path: Directory path where the file will be saved
-
-    Returns:
-        None
-    """
-    filename = (
-        f"{output_path}"
-        f"{generate_hotel_bookings_filename(hotel_key, hotel_name)}.json"
-    )
-    print(f"filename JSON bookings: {filename}")
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(bookings, cast(TextIOWrapper, file), indent=4, ensure_ascii=False)
-
-def generate_file_excel_for_bookings(
-    bookings: Dict[str, Any],
-    hotel_key: str,
-    hotel_name: str,
-    output_path: str
-) -> None:
-    """Generate an Excel file containing booking data for a specific hotel.
-
-    Args:
-        bookings: Dictionary containing booking data with 'Bookings' key
-        hotel_key: Unique identifier for the hotel
-        hotel_name: Name of the hotel
-        output_path: Directory path where the file will be saved
-
-    Returns:
-        None
-    """
-    df = pd.DataFrame(bookings["Bookings"])
-    filename = (
-        f"{output_path}"
-        f"{generate_hotel_bookings_filename(hotel_key, hotel_name)}.xlsx"
-    )
-    df.to_excel(filename, index=False)
-
-def generate_file_excel_all_bookings(booking_list, output_path):
-    """Generate an Excel file with all booking data.
-    
-    Args:
-        booking_list (list): List of booking dictionaries
-        output_path (str): Path to write the Excel file
-    """
-    # Create a list to store all booking data
-    all_bookings = []
-
-    # Extract data from each booking
-    for hotel_bookings in booking_list:
-        hotel_name = hotel_bookings["HotelName"]
-        for booking in hotel_bookings["Bookings"]:
-            booking_data = {
-                'Hotel Name': hotel_name,
-                'Room ID': booking['RoomAssigned'],
-                'Room Type': booking['RoomType'],
-                'Room Category': booking['RoomCategory'],
-                'Check-in Date': booking['CheckInDate'],
-                'Check-out Date': booking['CheckOutDate'],
-                'Guest First Name': booking['Guest']['FirstName'],
-                'Guest Last Name': booking['Guest']['LastName'],
-                'Guest Email': booking['Guest']['Email'],
-                'Guest Phone': booking['Guest']['Phone'],
-                'Guest Country': booking['Guest']['Country'],
-                'Guest City': booking['Guest']['City'],
-                'Guest Address': booking['Guest']['Address'],
-                'Guest Zip Code': booking['Guest']['ZipCode'],
-                'Meal Plan': booking['MealPlan'],
-                'Total Price': booking['TotalPrice']
-            }
-            all_bookings.append(booking_data)
-
-    # Create DataFrame and write to Excel
-    df = pd.DataFrame(all_bookings)
-    df.to_excel(output_path, index=False)
-    print(f"Excel file with all bookings written to: {output_path}")
-
-def generate_hotel_bookings_filename(hotel_key: str, hotel_name: str) -> str:
-    """Generate a standardized filename for hotel booking data.
-
-    Args:
-        hotel_key: Unique identifier for the hotel
-        hotel_name: Name of the hotel
-
-    Returns:
-        Formatted filename in the format 'hotel_{key}_{camelCaseName}_bookings'
-    """
-    # Convert hotel name to CamelCase and remove special characters
-    camel_case_name = ''.join(
-        word.capitalize() for word in re.findall(r'\w+', hotel_name)
-    )
-    # Generate the filename
-    filename = f"hotel_{hotel_key}_{camel_case_name}_bookings"
-    return filename
-
-def generate_file_md_hotel_bookings(
-    hotel_bookings_list: List[Dict[str, Any]],
-    output_path: str
-) -> None:
-    """Generate a Markdown file containing booking data for multiple hotels.
-
-    Creates a markdown table with booking details including guest information,
-    check-in/out dates, room details, and pricing.
-
-    Args:
-        hotel_bookings_list: List of dictionaries containing booking data for
-            multiple hotels. Each dict must have 'HotelName' and 'Bookings' keys
-        output_path: Directory path where the file will be saved
-
-    Returns:
-        None
-    """
-    filename = f"{output_path}hotel_bookings.md"
-
-    with open(filename, "w", encoding="utf-8") as file:
-        for hotel_bookings in hotel_bookings_list:
-            hotel_name = hotel_bookings["HotelName"]
-
-            file.write(f"# HOTEL - Name: {hotel_name}\n\n")
-            file.write("## Bookings\n\n")
-            file.write(
-                "| Country of Guest | City of Guest | Check-In Date | "
-                "Check-Out Date | Room Assigned | Room Category | Room Type | "
-                "Meal Plan | Total Price |\n"
-            )
-            file.write(
-                "|------------------|---------------|---------------|"
-                "----------------|---------------|---------------|-----------|"
-                "-----------|-------------|\n"
-            )
-
-            for booking in hotel_bookings["Bookings"]:
-                guest_country = booking["Guest"]["Country"]
-                guest_city = booking["Guest"]["City"]
-                file.write(
-                    f"| {guest_country} | {guest_city} | "
-                    f"{booking['CheckInDate']} | {booking['CheckOutDate']} | "
-                    f"{booking['RoomAssigned']} | {booking['RoomCategory']} | "
-                    f"{booking['RoomType']} | {booking['MealPlan']} | "
-                    f"{booking['TotalPrice']} |\n"
-                )
-            file.write("\n---\n\n")
+"""Module for writing booking data to output files in various formats (JSON, Parquet, Excel, MD)."""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal
+from io import TextIOWrapper
+from itertools import islice
+from typing import cast, Dict, Iterable, Iterator, List, Any, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# Typed schema of the all-bookings handoff file (columns as in the Excel export)
+ALL_BOOKINGS_SCHEMA = pa.schema([
+    ('Hotel Name', pa.string()),
+    ('Room ID', pa.string()),
+    ('Room Type', pa.string()),
+    ('Room Category', pa.string()),
+    ('Check-in Date', pa.date32()),
+    ('Check-out Date', pa.date32()),
+    ('Guest First Name', pa.string()),
+    ('Guest Last Name', pa.string()),
+    ('Guest Email', pa.string()),
+    ('Guest Phone', pa.string()),
+    ('Guest Country', pa.string()),
+    ('Guest City', pa.string()),
+    ('Guest Address', pa.string()),
+    ('Guest Zip Code', pa.string()),
+    ('Meal Plan', pa.string()),
+    ('Total Price', pa.decimal128(10, 2)),
+])
+
+_CENTS = Decimal('0.01')
+
+# Number of bookings held in memory at a time by the streaming writers
+DEFAULT_CHUNK_SIZE = 10000
+
+def generate_file_json_for_bookings(
+    bookings: Dict[str, Any],
+    hotel_key: str,
+    hotel_name: str,
+    output_path: str
+) -> None:
+    """Generate a JSON file containing booking data for a specific hotel.
+
+    Args:
+        bookings: Dictionary containing booking data with 'Bookings' key
+        hotel_key: Unique identifier for the hotel
+        hotel_name: Name of the hotel
+        output_path: Directory path where the file will be saved
+
+    Returns:
+        None
+    """
+    filename = (
+        f"{output_path}"
+        f"{generate_hotel_bookings_filename(hotel_key, hotel_name)}.json"
+    )
+    print(f"filename JSON bookings: {filename}")
+    with open(filename, "w", encoding="utf-8") as file:
+        # 'Bookings' may be a generator
+        bookings = dict(bookings, Bookings=list(bookings["Bookings"]))
+        json.dump(bookings, cast(TextIOWrapper, file), indent=4, ensure_ascii=False)
+
+def generate_file_excel_for_bookings(
+    bookings: Dict[str, Any],
+    hotel_key: str,
+    hotel_name: str,
+    output_path: str
+) -> None:
+    """Generate an Excel file containing booking data for a specific hotel.
+
+    Args:
+        bookings: Dictionary containing booking data with 'Bookings' key
+        hotel_key: Unique identifier for the hotel
+        hotel_name: Name of the hotel
+        output_path: Directory path where the file will be saved
+
+    Returns:
+        None
+    """
+    df = pd.DataFrame(list(bookings["Bookings"]))
+    filename = (
+        f"{output_path}"
+        f"{generate_hotel_bookings_filename(hotel_key, hotel_name)}.xlsx"
+    )
+    df.to_excel(filename, index=False)
+
+def flatten_booking(hotel_name: str, booking: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a booking into one row of the all-bookings files.
+
+    Args:
+        hotel_name: Name of the hotel the booking belongs to
+        booking: Booking dictionary as produced by generate_hotel_bookings
+
+    Returns:
+        Row keyed by the all-bookings column names
+    """
+    guest = booking['Guest']
+    return {
+        'Hotel Name': hotel_name,
+        'Room ID': booking['RoomAssigned'],
+        'Room Type': booking['RoomType'],
+        'Room Category': booking['RoomCategory'],
+        'Check-in Date': booking['CheckInDate'],
+        'Check-out Date': booking['CheckOutDate'],
+        'Guest First Name': guest['FirstName'],
+        'Guest Last Name': guest['LastName'],
+        'Guest Email': guest['Email'],
+        'Guest Phone': guest['Phone'],
+        'Guest Country': guest['Country'],
+        'Guest City': guest['City'],
+        'Guest Address': guest['Address'],
+        'Guest Zip Code': guest['ZipCode'],
+        'Meal Plan': booking['MealPlan'],
+        'Total Price': booking['TotalPrice']
+    }
+
+def iter_booking_chunks(
+    hotel_bookings_list: Iterable[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Split a stream of hotel bookings into fixed-size chunks.
+
+    The 'Bookings' of each hotel may be a list or a generator; it is consumed
+    lazily, so at most `chunk_size` bookings are materialized at a time. Every
+    hotel yields at least one (possibly empty) chunk.
+
+    Args:
+        hotel_bookings_list: Iterable of dicts with 'HotelName' and 'Bookings' keys
+        chunk_size: Maximum number of bookings per chunk
+
+    Yields:
+        Tuples of (hotel name, list of bookings)
+    """
+    for hotel_bookings in hotel_bookings_list:
+        hotel_name = hotel_bookings["HotelName"]
+        bookings = iter(hotel_bookings["Bookings"])
+        chunk = list(islice(bookings, chunk_size))
+        yield hotel_name, chunk
+        while len(chunk) == chunk_size:
+            chunk = list(islice(bookings, chunk_size))
+            if chunk:
+                yield hotel_name, chunk
+
+def build_bookings_table(rows: List[Dict[str, Any]]) -> pa.Table:
+    """Build the typed Arrow table of flattened booking rows.
+
+    Dates become date32 values and prices decimal(10, 2), matching the
+    bookings table of the database.
+
+    Args:
+        rows: Rows returned by flatten_booking
+
+    Returns:
+        Arrow table with the ALL_BOOKINGS_SCHEMA schema
+    """
+    columns = {name: [row[name] for row in rows] for name in ALL_BOOKINGS_SCHEMA.names}
+    columns['Check-in Date'] = [date.fromisoformat(value) for value in columns['Check-in Date']]
+    columns['Check-out Date'] = [date.fromisoformat(value) for value in columns['Check-out Date']]
+    columns['Guest Zip Code'] = [str(value) for value in columns['Guest Zip Code']]
+    columns['Total Price'] = [Decimal(str(value)).quantize(_CENTS) for value in columns['Total Price']]
+    return pa.Table.from_pydict(columns, schema=ALL_BOOKINGS_SCHEMA)
+
+class BookingChunkWriter(ABC):
+    """Base class of the writers fed chunk by chunk by write_hotel_bookings."""
+
+    @abstractmethod
+    def write_chunk(self, hotel_name: str, bookings: List[Dict[str, Any]]) -> None:
+        """Write a chunk of bookings of a hotel.
+
+        Args:
+            hotel_name: Name of the hotel the bookings belong to
+            bookings: Bookings of the chunk
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ParquetAllBookingsWriter(BookingChunkWriter):
+    """Write all bookings to a Parquet file, one row group per chunk."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._writer = pq.ParquetWriter(output_path, ALL_BOOKINGS_SCHEMA)
+
+    def write_chunk(self, hotel_name: str, bookings: List[Dict[str, Any]]) -> None:
+        if bookings:
+            rows = [flatten_booking(hotel_name, booking) for booking in bookings]
+            self._writer.write_table(build_bookings_table(rows))
+
+    def close(self) -> None:
+        self._writer.close()
+        print(f"Parquet file with all bookings written to: {self.output_path}")
+
+class ExcelAllBookingsWriter(BookingChunkWriter):
+    """Write all bookings to an Excel file with a write-only (streaming) workbook."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(ALL_BOOKINGS_SCHEMA.names)
+
+    def write_chunk(self, hotel_name: str, bookings: List[Dict[str, Any]]) -> None:
+        for booking in bookings:
+            self._sheet.append(list(flatten_booking(hotel_name, booking).values()))
+
+    def close(self) -> None:
+        self._workbook.save(self.output_path)
+        print(f"Excel file with all bookings written to: {self.output_path}")
+
+class MarkdownHotelBookingsWriter(BookingChunkWriter):
+    """Write the hotel_bookings.md tables, one section per hotel."""
+
+    def __init__(self, output_path: str):
+        self.filename = f"{output_path}hotel_bookings.md"
+        self._file = open(self.filename, "w", encoding="utf-8")
+        self._hotel_name = None
+
+    def _end_section(self) -> None:
+        if self._hotel_name is not None:
+            self._file.write("\n---\n\n")
+
+    def write_chunk(self, hotel_name: str, bookings: List[Dict[str, Any]]) -> None:
+        if hotel_name != self._hotel_name:
+            self._end_section()
+            self._hotel_name = hotel_name
+            self._file.write(f"# HOTEL - Name: {hotel_name}\n\n")
+            self._file.write("## Bookings\n\n")
+            self._file.write(
+                "| Country of Guest | City of Guest | Check-In Date | "
+                "Check-Out Date | Room Assigned | Room Category | Room Type | "
+                "Meal Plan | Total Price |\n"
+            )
+            self._file.write(
+                "|------------------|---------------|---------------|"
+                "----------------|---------------|---------------|-----------|"
+                "-----------|-------------|\n"
+            )
+
+        for booking in bookings:
+            guest_country = booking["Guest"]["Country"]
+            guest_city = booking["Guest"]["City"]
+            self._file.write(
+                f"| {guest_country} | {guest_city} | "
+                f"{booking['CheckInDate']} | {booking['CheckOutDate']} | "
+                f"{booking['RoomAssigned']} | {booking['RoomCategory']} | "
+                f"{booking['RoomType']} | {booking['MealPlan']} | "
+                f"{booking['TotalPrice']} |\n"
+            )
+
+    def close(self) -> None:
+        self._end_section()
+        self._file.close()
+
+def write_hotel_bookings(
+    hotel_bookings_list: Iterable[Dict[str, Any]],
+    writers: List[BookingChunkWriter],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Stream hotel bookings to several writers in a single pass.
+
+    Each chunk is handed to every writer before the next one is generated,
+    so peak memory is bounded by the chunk size, not by the number of
+    bookings. The writers are closed at the end.
+
+    Args:
+        hotel_bookings_list: Iterable of dicts with 'HotelName' and 'Bookings' keys
+        writers: Writers receiving every chunk
+        chunk_size: Maximum number of bookings per chunk
+
+    Returns:
+        Number of bookings written
+    """
+    total = 0
+    try:
+        for hotel_name, bookings in iter_booking_chunks(hotel_bookings_list, chunk_size):
+            for writer in writers:
+                writer.write_chunk(hotel_name, bookings)
+            total += len(bookings)
+    finally:
+        for writer in writers:
+            writer.close()
+    return total
+
+def generate_file_parquet_all_bookings(booking_list, output_path):
+    """Generate the Parquet file with all booking data (database handoff artifact).
+
+    Args:
+        booking_list (iterable): Hotel booking dictionaries ('Bookings' may be generators)
+        output_path (str): Path to write the Parquet file
+    """
+    write_hotel_bookings(booking_list, [ParquetAllBookingsWriter(output_path)])
+
+def generate_file_excel_all_bookings(booking_list, output_path):
+    """Generate an Excel file with all booking data.
+    
+    Args:
+        booking_list (iterable): Hotel booking dictionaries ('Bookings' may be generators)
+        output_path (str): Path to write the Excel file
+    """
+    write_hotel_bookings(booking_list, [ExcelAllBookingsWriter(output_path)])
+
+def generate_hotel_bookings_filename(hotel_key: str, hotel_name: str) -> str:
+    """Generate a standardized filename for hotel booking data.
+
+    Args:
+        hotel_key: Unique identifier for the hotel
+        hotel_name: Name of the hotel
+
+    Returns:
+        Formatted filename in the format 'hotel_{key}_{camelCaseName}_bookings'
+    """
+    # Convert hotel name to CamelCase and remove special characters
+    camel_case_name = ''.join(
+        word.capitalize() for word in re.findall(r'\w+', hotel_name)
+    )
+    # Generate the filename
+    filename = f"hotel_{hotel_key}_{camel_case_name}_bookings"
+    return filename
+
+def generate_file_md_hotel_bookings(
+    hotel_bookings_list: Iterable[Dict[str, Any]],
+    output_path: str
+) -> None:
+    """Generate a Markdown file containing booking data for multiple hotels.
+
+    Creates a markdown table with booking details including guest information,
+    check-in/out dates, room details, and pricing.
+
+    Args:
+        hotel_bookings_list: Iterable of dictionaries containing booking data for
+            multiple hotels. Each dict must have 'HotelName' and 'Bookings' keys
+            ('Bookings' may be a generator)
+        output_path: Directory path where the file will be saved
+
+    Returns:
+        None
+    """
+    write_hotel_bookings(hotel_bookings_list, [MarkdownHotelBookingsWriter(output_path)])
@@ -0,0 +1,194 @@
+"""
+Checks for the vectorized booking engine: slot generation, occupancy and
+forecast trimming, attribute distributions, prices and reproducibility.
+
+Usage:
+    python -m pytest test_booking_engine.py
+"""
+
+import calendar
+import sys
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.generator import booking_engine as engine
+
+PEAK_SEASON_MONTHS = ["January", "April", "May", "June", "July", "August", "September", "December"]
+PEAK_MONTHS = np.array([calendar.month_name[month] in PEAK_SEASON_MONTHS for month in range(1, 13)])
+FIRST_DAY = engine.to_day_number(2025, 1, 1)
+LAST_DAY = engine.to_day_number(2025, 12, 31)
+NUM_ROOMS = 400
+
+SYNTHETIC_PARAMS = {
+    "OccupancyPeakSeasonWeight": 80,
+    "OccupancyOffSeasonWeight": 40,
+    "OccupancyBaseDiscountPercentage": 25,
+    "ExtraBedChargePercentage": 21,
+    "PromotionPriceDiscount": 30,
+    "MealPlanWeights": {
+        "room_only": {"name": "Room Only", "weight": 0.2},
+        "room_and_breakfast": {"name": "Room and Breakfast", "weight": 0.5},
+        "all_inclusive": {"name": "All Inclusive", "weight": 0.0},
+        "half_board": {"name": "Half Board", "weight": 0.3},
+    },
+    "MealPlanPrices": {"Room Only": 1.0, "Room and Breakfast": 1.18, "All Inclusive": 2.03,
+                       "Half Board": 1.5},
+}
+HOTEL = {
+    "Name": "Grand Victoria",
+    "SyntheticParams": SYNTHETIC_PARAMS,
+    "Rooms": [
+        {"RoomId": f"01-{number:03d}", "Type": room_type, "Category": "Standard", "Guests": guests,
+         "PriceOffSeason": 100.0 + number, "PricePeakSeason": 150.0 + number}
+        for number, (room_type, guests) in enumerate(
+            [("Single", 1), ("Double", 2), ("Triple", 3)] * 20, start=1)
+    ],
+}
+CONFIG = {
+    "peak_season_months": PEAK_SEASON_MONTHS,
+    "hotel_occupancy": {
+        "booking_year": {"start": 2025, "end": 2025},
+        "current_month": "2025-04",
+        "forecast_reduction_percentage": [15, 30, 45, 60, 75, 90, 100],
+    },
+}
+GUEST_LOCATIONS = {"France": ["Paris", "Nice"], "Spain": ["Madrid"]}
+
+
+def _booked_days_by_month(starts, ends):
+    """Booked room-days per month number, attributed to the month of the slot start."""
+    days = Counter()
+    for start, length in zip(engine.month_number(starts).tolist(), (ends - starts + 1).tolist()):
+        days[start] += length
+    return days
+
+
+@pytest.fixture(scope="module")
+def slots():
+    """Slots of many rooms over one year."""
+    return engine.generate_slots(np.random.default_rng(1), FIRST_DAY, LAST_DAY, NUM_ROOMS)
+
+
+def test_slots_cover_every_day_once(slots):
+    """Each room's slots are contiguous, within 1 to 13 days and cover the whole range."""
+    rooms, starts, ends = slots
+    lengths = ends - starts + 1
+    assert lengths.min() >= 1 and lengths.max() <= 13
+    for room in range(NUM_ROOMS):
+        room_starts, room_ends = starts[rooms == room], ends[rooms == room]
+        assert room_starts[0] == FIRST_DAY and room_ends[-1] == LAST_DAY
+        assert np.array_equal(room_starts[1:], room_ends[:-1] + 1)
+
+
+def test_occupancy_trimming_meets_the_season_targets(slots):
+    """Rooms above the season target of a month are trimmed down to it, one slot at a time."""
+    rooms, starts, ends = slots
+    keep = engine.trim_slots_occupancy(np.random.default_rng(2), rooms, starts, ends, PEAK_MONTHS,
+                                       SYNTHETIC_PARAMS["OccupancyPeakSeasonWeight"],
+                                       SYNTHETIC_PARAMS["OccupancyOffSeasonWeight"])
+    lengths = ends - starts + 1
+    months = engine.month_number(starts)
+    slot_weekday = engine.weekday(starts)
+    weekend_slot = (slot_weekday >= 4) & (slot_weekday + lengths - 1 <= 6)
+    for room in range(0, NUM_ROOMS, 10):
+        for month in np.unique(months).tolist():
+            in_group = (rooms == room) & (months == month)
+            is_peak = PEAK_MONTHS[month % 12]
+            target = int((SYNTHETIC_PARAMS["OccupancyPeakSeasonWeight"] if is_peak
+                          else SYNTHETIC_PARAMS["OccupancyOffSeasonWeight"]) / 100
+                         * engine.days_in_month(np.array([month]))[0])
+            before = lengths[in_group].sum()
+            after = lengths[in_group & keep].sum()
+            if before <= target:
+                assert after == before
+                continue
+            # Only non-weekend slots count towards the target; the last one removed
+            # (up to 13 days) and, off season, one weekend slot may go below it
+            assert after <= max(target, lengths[in_group & keep & weekend_slot].sum())
+            assert after >= target - 13 - (0 if is_peak else 3)
+
+
+def test_forecast_trimming_reduces_the_following_months(slots):
+    """Months up to the current one are kept, the next ones reduced, later ones dropped."""
+    rooms, starts, ends = slots
+    hotel_occupancy = CONFIG["hotel_occupancy"]
+    keep, new_ends = engine.trim_slots_forecast(rooms, starts, ends, hotel_occupancy["current_month"],
+                                                hotel_occupancy["forecast_reduction_percentage"])
+    before = _booked_days_by_month(starts, ends)
+    after = _booked_days_by_month(starts[keep], new_ends[keep])
+    current = engine.month_number(np.array([engine.to_day_number(2025, 4, 1)]))[0]
+    for offset, reduction in enumerate(hotel_occupancy["forecast_reduction_percentage"], start=1):
+        month = current + offset
+        expected = before[month] * (1 - reduction / 100)
+        assert expected - NUM_ROOMS <= after[month] <= expected, month
+    for month in before:
+        if month <= current:
+            assert after[month] == before[month]
+    # Months after the listed ones are dropped, the January wrap-around included
+    assert max(after) <= current + len(hotel_occupancy["forecast_reduction_percentage"]) - 1
+    kept_rooms, kept_starts, kept_ends = rooms[keep], starts[keep], new_ends[keep]
+    for room in range(NUM_ROOMS):
+        room_starts, room_ends = kept_starts[kept_rooms == room], kept_ends[kept_rooms == room]
+        assert np.all(room_starts[1:] > room_ends[:-1])
+
+
+def test_meal_plans_follow_the_hotel_weights():
+    """Meal plans are drawn with the hotel weights."""
+    meal_plans = engine.choose_meal_plans(np.random.default_rng(3), 100000, SYNTHETIC_PARAMS["MealPlanWeights"])
+    counts = Counter(meal_plans.tolist())
+    for data in SYNTHETIC_PARAMS["MealPlanWeights"].values():
+        assert counts[data["name"]] / meal_plans.size == pytest.approx(data["weight"], abs=0.01)
+
+
+def test_total_prices_charge_each_night_by_season():
+    """Prices match a night-by-night computation of the pricing rules."""
+    starts = np.array([engine.to_day_number(2025, 3, 28), engine.to_day_number(2025, 12, 30),
+                       engine.to_day_number(2025, 2, 10)])
+    ends = starts + np.array([7, 4, 1])
+    capacity = np.array([2, 3, 1])
+    guests = np.array([1, 4, 1])
+    extra_bed = np.array([False, True, False])
+    multiplier = np.array([1.18, 1.5, 1.0])
+    promotion = np.array([False, True, False])
+    price_off = np.array([100.0, 150.0, 80.0])
+    price_peak = np.array([160.0, 210.0, 120.0])
+    totals = engine.compute_total_prices(starts, ends, capacity, guests, extra_bed, multiplier, promotion,
+                                         price_off, price_peak, PEAK_MONTHS, SYNTHETIC_PARAMS)
+    epoch = date(1970, 1, 1)
+    for i, total in enumerate(totals):
+        factor = multiplier[i]
+        if guests[i] < capacity[i]:
+            factor *= 1 - SYNTHETIC_PARAMS["OccupancyBaseDiscountPercentage"] / 100
+        if extra_bed[i]:
+            factor *= 1 + SYNTHETIC_PARAMS["ExtraBedChargePercentage"] / 100
+        expected = sum(
+            (price_peak[i] if PEAK_MONTHS[(epoch + timedelta(days=day)).month - 1] else price_off[i]) * factor
+            for day in range(starts[i], ends[i])
+        )
+        if promotion[i]:
+            expected *= 1 - SYNTHETIC_PARAMS["PromotionPriceDiscount"] / 100
+        assert total == pytest.approx(expected, abs=0.011)
+
+
+def test_bookings_are_reproducible_and_consistent():
+    """The same seed gives the same bookings, with guests and extra beds matching the rooms."""
+    first = engine.generate_booking_arrays(np.random.default_rng(7), HOTEL, CONFIG, GUEST_LOCATIONS)
+    second = engine.generate_booking_arrays(np.random.default_rng(7), HOTEL, CONFIG, GUEST_LOCATIONS)
+    for key, values in first.items():
+        assert np.array_equal(values, second[key]), key
+
+    capacity = np.array([room["Guests"] for room in HOTEL["Rooms"]])[first["room"]]
+    # A one-day slot checks out the day it checks in, as in the original generator
+    assert np.all(first["check_out_day"] >= first["check_in_day"])
+    assert np.all((first["extra_bed"] == "N/A") == (capacity == 1))
+    assert np.all(first["number_of_guests"] <= capacity + (first["extra_bed"] == "Yes"))
+    assert "All Inclusive" not in set(first["meal_plan"].tolist())
+    stays = first["check_out_day"] > first["check_in_day"]
+    assert np.all(first["total_price"][stays] > 0) and np.all(first["total_price"][~stays] == 0)